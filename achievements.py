@@ -0,0 +1,134 @@
+from typing import Callable, Dict, List, Optional
+
+# Eventos do jogo que as conquistas podem assinar
+SHOT = "shot"  # Tiro disparado
+DUEL_WON = "duel_won"  # ctx: mode, duel_ms, shots_fired, shots_hit
+ROUND_REACHED = "round_reached"  # Rodada do arcade vencida; ctx: round, wins
+PVP_MATCH_WON = "pvp_match_won"  # Partida PvP (melhor de 5) vencida
+DAY_ROLLOVER = "day_rollover"  # Primeiro evento de um novo dia
+
+# Contadores mantidos de forma incremental: nome -> (evento que soma 1, zera todo dia?)
+COUNTERS = {
+    "daily_wins": (DUEL_WON, True),
+    "daily_shots": (SHOT, True)
+}
+
+
+class Achievement:
+    """Regra declarativa: assina um evento e desbloqueia com meta de contador e/ou condição"""
+
+    def __init__(self, key: str, name: str, desc: str, event: str, counter: Optional[str] = None,
+                 goal: int = 1, check: Optional[Callable[[Dict], bool]] = None, daily: bool = False):
+        self.key = key
+        self.name = name
+        self.desc = desc
+        self.event = event
+        self.counter = counter
+        self.goal = goal
+        self.check = check  # Recebe o contexto do evento
+        self.daily = daily  # Volta a ficar bloqueada na virada do dia
+
+    def met(self, counters: Dict[str, int], ctx: Dict) -> bool:
+        if self.counter is not None and counters[self.counter] < self.goal:
+            return False
+        return self.check is None or self.check(ctx)
+
+
+# Registro único (ordem de exibição na tela de conquistas)
+ACHIEVEMENTS = [
+    Achievement("first_blood", "Primeiro Sangue", "Primeira vitória", DUEL_WON,
+                check=lambda ctx: ctx["mode"] == "arcade"),
+    Achievement("round_5", "Rodada 5", "Chegue à 5ª rodada", ROUND_REACHED,
+                check=lambda ctx: ctx["round"] >= 5),
+    Achievement("round_10", "Rodada 10", "Complete todas as rodadas", ROUND_REACHED,
+                check=lambda ctx: ctx["round"] >= 10),
+    Achievement("fast_winner", "Gatilho Rápido", "Vença em <1 segundo", DUEL_WON,
+                check=lambda ctx: ctx["mode"] == "arcade" and ctx["duel_ms"] < 1000),
+    Achievement("no_miss", "Precisão", "Vença sem errar tiros", DUEL_WON,
+                check=lambda ctx: ctx["mode"] == "arcade" and 0 < ctx["shots_fired"] == ctx["shots_hit"]),
+    Achievement("perfect_10", "Perfeição", "Vença todas as rodadas", ROUND_REACHED,
+                check=lambda ctx: ctx["wins"] >= 10),
+    Achievement("pvp_winner", "Campeão PvP", "Vença uma partida PvP", PVP_MATCH_WON),
+    Achievement("daily_win", "Vitória Diária", "Vença 1 duelo hoje", DUEL_WON,
+                counter="daily_wins", goal=1, daily=True),
+    Achievement("daily_5wins", "5 Vitórias Diárias", "Vença 5 duelos hoje", DUEL_WON,
+                counter="daily_wins", goal=5, daily=True),
+    Achievement("daily_10shots", "10 Tiros Diários", "Dispare 10 tiros hoje", SHOT,
+                counter="daily_shots", goal=10, daily=True)
+]
+
+
+class AchievementTracker:
+    """Avalia só as regras assinadas pelo evento; regra desbloqueada sai da lista
+
+    Um evento soma seus contadores e testa as regras ainda bloqueadas que o assinam,
+    então o custo de um tiro não cresce com o número de conquistas de outros eventos.
+    O estado salvo mantém o formato antigo ("achievements" e "daily_achievements").
+    """
+
+    def __init__(self, rules: List[Achievement] = ACHIEVEMENTS, counters: Dict = COUNTERS):
+        self.rules = list(rules)
+        self.unlocked: Dict[str, bool] = {rule.key: False for rule in self.rules}
+        self.counters: Dict[str, int] = {name: 0 for name in counters}
+        self.daily_counters = [name for name, (_, daily) in counters.items() if daily]
+        self.last_play_date = None
+
+        self._counted: Dict[str, List[str]] = {}  # Evento -> contadores que ele soma
+        for name, (event, _) in counters.items():
+            self._counted.setdefault(event, []).append(name)
+        self._subscribers: Dict[str, List[Achievement]] = {}  # Evento -> regras ainda bloqueadas
+        self._subscribe()
+
+    def _subscribe(self):
+        self._subscribers = {}
+        for rule in self.rules:
+            if not self.unlocked[rule.key]:
+                self._subscribers.setdefault(rule.event, []).append(rule)
+
+    def load(self, data: Dict):
+        """Aplica o estado salvo (chaves desconhecidas são ignoradas)"""
+        for key, value in data.get("achievements", {}).items():
+            if key in self.unlocked:
+                self.unlocked[key] = bool(value)
+        daily = data.get("daily_achievements", {})
+        for name in self.counters:
+            self.counters[name] = int(daily.get(name, 0))
+        self.last_play_date = daily.get("last_play_date")
+        self._subscribe()
+
+    def state(self) -> Dict:
+        return {"achievements": self.unlocked,
+                "daily_achievements": dict(self.counters, last_play_date=self.last_play_date)}
+
+    def emit(self, event: str, **ctx) -> List[str]:
+        """Processa um evento e retorna as conquistas desbloqueadas por ele"""
+        for name in self._counted.get(event, ()):
+            self.counters[name] += 1
+
+        rules = self._subscribers.get(event)
+        if not rules:
+            return []
+        unlocked = [rule for rule in rules if rule.met(self.counters, ctx)]
+        for rule in unlocked:
+            self.unlocked[rule.key] = True
+            rules.remove(rule)
+        return [rule.key for rule in unlocked]
+
+    def roll_day(self, today: str) -> List[str]:
+        """Virada do dia (data ISO): zera contadores e conquistas diárias e emite DAY_ROLLOVER"""
+        if self.last_play_date is not None and self.last_play_date >= today:
+            return []
+        self.last_play_date = today
+        for name in self.daily_counters:
+            self.counters[name] = 0
+        for rule in self.rules:
+            if rule.daily:
+                self.unlocked[rule.key] = False
+        self._subscribe()
+        return self.emit(DAY_ROLLOVER, today=today)
+
+    def progress(self, rule: Achievement) -> Optional[str]:
+        """Progresso "n/meta" de uma regra de contador ainda bloqueada"""
+        if rule.counter is None or rule.goal <= 1 or self.unlocked[rule.key]:
+            return None
+        return f"{min(rule.goal, self.counters[rule.counter])}/{rule.goal}"
@@ -0,0 +1,486 @@
+import io
+import os
+import time
+import hashlib
+import threading
+import pygame
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+from duel_engine import SPRITE_SIZE
+from profiler import allocated
+
+ASSETS_DIR = "assets"
+CACHE_DIR = os.environ.get("DUELO_CACHE_DIR", ".asset_cache")
+CACHE_VERSION = 2  # Mude quando o formato do cache mudar
+BULLET_SIZE = (30, 10)
+OPAQUE_FOLDERS = ("backgrounds",)  # Sem transparência: convert() e blit sem alpha por pixel
+ATLAS_FOLDERS = ("sprites", "ui")  # Empacotadas numa única textura (subsurfaces)
+ATLAS_MAX_WIDTH = 1024
+LOW_MEMORY_DEPTH = 16  # Bits por pixel dos fundos opacos no modo de pouca memória
+
+# Cores dos substitutos quando a imagem não existe
+FALLBACK_COLORS = {"cowboy": (200, 50, 50), "enemy": (50, 50, 200)}
+
+
+def pack_shelves(sizes: Dict[str, tuple], max_width: int = ATLAS_MAX_WIDTH, padding: int = 1):
+    """Empacota retângulos em prateleiras (mais altos primeiro); retorna (posições, tamanho total)"""
+    rects: Dict[str, pygame.Rect] = {}
+    x = y = shelf_h = width = 0
+    for key, (w, h) in sorted(sizes.items(), key=lambda item: (-item[1][1], item[0])):
+        if x and x + w > max_width:
+            x, y, shelf_h = 0, y + shelf_h + padding, 0
+        rects[key] = pygame.Rect(x, y, w, h)
+        x += w + padding
+        shelf_h = max(shelf_h, h)
+        width = max(width, x - padding)
+    return rects, (max(1, width), max(1, y + shelf_h))
+
+
+def surface_bytes(surf: pygame.Surface) -> int:
+    """Bytes de pixels de uma superfície (subsurface não tem pixels próprios)"""
+    if surf is None or surf.get_parent() is not None:
+        return 0
+    return surf.get_pitch() * surf.get_height()
+
+
+def sound_bytes(sound) -> int:
+    """Bytes de PCM de um Sound no formato do mixer (0 sem mixer)"""
+    init = pygame.mixer.get_init()
+    if not sound or not init:
+        return 0
+    freq, size, channels = init
+    return int(sound.get_length() * freq) * channels * (abs(size) // 8)
+
+
+class AssetManager:
+    """Carrega assets em paralelo e sob demanda, com cache em disco das imagens já escaladas"""
+
+    IMAGES = {
+        "bg_menu": ("menu_bg.jpg", "backgrounds"),
+        "bg_game": ("game_bg.jpg", "backgrounds"),
+        "player1.idle": ("cowboy_idle.png", "sprites"),
+        "player1.shoot": ("cowboy_shoot.png", "sprites"),
+        "player1.dead": ("cowboy_dead.png", "sprites"),
+        "player2.idle": ("enemy_idle.png", "sprites"),
+        "player2.shoot": ("enemy_shoot.png", "sprites"),
+        "player2.dead": ("enemy_dead.png", "sprites"),
+        "bullet": ("bullet.png", "ui")
+    }
+    SOUNDS = {
+        "shot": "shot.wav",
+        "win": "win.wav",
+        "lose": "lose.wav",
+        "click": "click.wav",
+        "achievement": "achievement.wav"
+    }
+    MUSIC = {
+        "duel": "duel.mp3",
+        "achievements": "achievements.mp3"
+    }
+
+    # Música de cada tela (decodificada em segundo plano quando a tela é pedida)
+    SCREEN_MUSIC = {
+        "duel": "duel",
+        "achievements": "achievements"
+    }
+
+    # Imagens de cada tela (carregadas quando a tela é pedida)
+    SCREENS = {
+        "menu": ["bg_menu"],
+        "duel": ["bg_game", "player1.idle", "player1.shoot", "player1.dead",
+                 "player2.idle", "player2.shoot", "player2.dead", "bullet"],
+        "achievements": ["bg_game"]
+    }
+
+    def __init__(self, screen_size, audio=None, assets_dir: str = ASSETS_DIR, cache_dir: str = CACHE_DIR,
+                 workers: int = 4, low_memory: bool = False, budget_bytes: int = None):
+        self.screen_size = tuple(screen_size)
+        self.audio = audio  # Função que espera o mixer e diz se há áudio
+        self.assets_dir = assets_dir
+        self.cache_dir = cache_dir
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="assets")
+
+        self._futures = {}
+        self._images: Dict[str, pygame.Surface] = {}
+        self.atlas = None  # Textura com sprites e UI (ver build_atlas)
+        self.atlas_rects: Dict[str, pygame.Rect] = {}
+        self._fallbacks = {}  # Substitutos compartilhados por (cor, tamanho, opaco)
+        self._fallback_lock = threading.Lock()
+        self._converted = {}  # Substituto já convertido para o formato da tela
+        self._sounds_future = None
+        self._music_futures = {}
+        self._groups = {}  # Dicionários já montados (poses, sons, músicas)
+
+        # Memória: modo econômico (fundos em 16 bits, tela deixada é descarregada) e orçamento
+        self.low_memory = low_memory
+        self.budget_bytes = budget_bytes  # Total do jogo; None = sem limite
+        self.reserved_bytes = 0  # Superfícies do jogo fora do AssetManager (tela, overlays, UI...)
+        self.screen = None  # Tela atual (ver enter)
+        self._last_used: Dict[str, int] = {}  # Asset -> número da última entrada em tela que o usou
+        self._entries = 0
+        self.evictions = 0
+
+        # Medições de inicialização
+        self.started = time.perf_counter()
+        self.timings: Dict[str, float] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    @classmethod
+    def from_env(cls, screen_size, **kwargs) -> "AssetManager":
+        """DUELO_LOW_MEMORY=1 liga o modo econômico; DUELO_MEMORY_MB define o orçamento"""
+        budget = os.environ.get("DUELO_MEMORY_MB")
+        return cls(screen_size, low_memory=os.environ.get("DUELO_LOW_MEMORY") == "1",
+                   budget_bytes=int(float(budget) * 1024 * 1024) if budget else None, **kwargs)
+
+    def is_opaque(self, key: str) -> bool:
+        return self.IMAGES[key][1] in OPAQUE_FOLDERS
+
+    def in_atlas(self, key: str) -> bool:
+        return self.IMAGES[key][1] in ATLAS_FOLDERS
+
+    def target_size(self, filename: str, subfolder: str):
+        """Tamanho final da imagem na tela"""
+        if subfolder == "sprites":
+            return SPRITE_SIZE
+        if filename == "bullet.png":
+            return BULLET_SIZE
+        return self.screen_size
+
+    # --- Carregamento ---
+    def request(self, screen: str):
+        """Começa a carregar (em segundo plano) os assets de uma tela"""
+        for key in self.SCREENS[screen]:
+            self._submit(key)
+        if self._sounds_future is None:
+            self._sounds_future = self.pool.submit(self._load_sounds)
+        if screen in self.SCREEN_MUSIC:
+            self._submit_music(self.SCREEN_MUSIC[screen])
+
+    def wait(self, screen: str):
+        """Espera os assets de uma tela ficarem prontos"""
+        self.request(screen)
+        for key in self.SCREENS[screen]:
+            self.image(key)
+        if screen not in self.timings:
+            self.timings[screen] = (time.perf_counter() - self.started) * 1000
+
+    def ready(self, screen: str) -> bool:
+        """Verifica, sem bloquear, se a tela já pode ser desenhada"""
+        return all(key in self._images or (key in self._futures and self._futures[key].done())
+                   for key in self.SCREENS[screen])
+
+    def _submit(self, key: str):
+        if key not in self._futures and key not in self._images:
+            filename, subfolder = self.IMAGES[key]
+            size = self.target_size(filename, subfolder)
+            self._futures[key] = self.pool.submit(self._load_image, filename, subfolder, size,
+                                                  self.is_opaque(key))
+
+    def image(self, key: str) -> pygame.Surface:
+        """Imagem pronta para blit (bloqueia se ainda estiver carregando)"""
+        surf = self._images.get(key)
+        if surf is None:
+            if self.in_atlas(key):
+                self.build_atlas()
+                return self._images[key]
+            raw, hit = self._result(key)
+            # Conversão para o formato da tela fica na thread principal; a decodificada é solta
+            surf = self._images[key] = self._convert(raw, self.is_opaque(key), shared=hit is None)
+            del self._futures[key]
+        return surf
+
+    def _result(self, key: str):
+        """(superfície decodificada ainda sem converter, veio do cache?), contando acertos"""
+        self._submit(key)
+        surf, hit = self._futures[key].result()
+        if hit is not None:
+            if hit:
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
+        return surf, hit
+
+    def _convert(self, raw: pygame.Surface, opaque: bool, shared: bool = False) -> pygame.Surface:
+        """convert() para opacos (blit sem alpha por pixel), convert_alpha() para o resto
+
+        No modo econômico os opacos ficam em LOW_MEMORY_DEPTH bits (metade da memória,
+        ao custo de um blit com conversão de formato).
+        """
+        if not shared:
+            return self._convert_one(raw, opaque)
+        # Substitutos são compartilhados: convertidos uma vez só
+        converted = self._converted.get(id(raw))
+        if converted is None:
+            converted = self._converted[id(raw)] = self._convert_one(raw, opaque)
+        return converted
+
+    def _convert_one(self, raw: pygame.Surface, opaque: bool) -> pygame.Surface:
+        if not opaque:
+            return allocated(raw.convert_alpha())
+        return allocated(raw.convert(LOW_MEMORY_DEPTH) if self.low_memory else raw.convert())
+
+    def build_atlas(self):
+        """Empacota sprites e UI numa textura só; cada imagem vira uma subsurface dela"""
+        if self.atlas is not None:
+            return
+        keys = [key for key in self.IMAGES if self.in_atlas(key)]
+        for key in keys:
+            self._submit(key)
+        raws = {key: self._result(key)[0] for key in keys}
+
+        self.atlas_rects, size = pack_shelves({key: surf.get_size() for key, surf in raws.items()})
+        atlas = pygame.Surface(size, pygame.SRCALPHA)
+        for key, surf in raws.items():
+            atlas.blit(surf, self.atlas_rects[key])  # Destino transparente: cópia exata dos pixels
+        self.atlas = allocated(atlas.convert_alpha())
+        for key in keys:
+            self._images[key] = self.atlas.subsurface(self.atlas_rects[key])
+            del self._futures[key]
+
+    def _load_image(self, filename: str, subfolder: str, size, opaque: bool = False):
+        """Lê a imagem já escalada do cache; se não houver, decodifica, escala e grava no cache"""
+        path = os.path.join(self.assets_dir, "images", subfolder, filename)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return self._fallback(filename, size, opaque), None
+
+        fmt = "RGB" if opaque else "RGBA"
+        digest = hashlib.sha1(data).hexdigest()
+        cache_path = os.path.join(self.cache_dir,
+                                  f"{digest}_{size[0]}x{size[1]}_v{CACHE_VERSION}.{fmt.lower()}")
+        try:
+            with open(cache_path, "rb") as f:
+                return pygame.image.frombytes(f.read(), size, fmt), True
+        except (OSError, ValueError):
+            pass
+
+        try:
+            img = pygame.image.load(io.BytesIO(data), filename)
+        except pygame.error:
+            return self._fallback(filename, size, opaque), None
+        img = allocated(pygame.transform.scale(img, size))
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = cache_path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(pygame.image.tobytes(img, fmt))
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass  # Sem cache, mas o jogo continua
+        return img, False
+
+    def _fallback(self, filename: str, size, opaque: bool = False) -> pygame.Surface:
+        """Superfície colorida no lugar de imagem que não existe (uma por cor e tamanho)"""
+        color = (FALLBACK_COLORS["cowboy"] if "cowboy" in filename
+                 else FALLBACK_COLORS["enemy"] if "enemy" in filename
+                 else (255, 255, 255))
+        key = (color, tuple(size), opaque)
+        with self._fallback_lock:
+            surf = self._fallbacks.get(key)
+            if surf is None:
+                surf = self._fallbacks[key] = allocated(pygame.Surface(size, 0 if opaque else pygame.SRCALPHA))
+                surf.fill(color)
+            return surf
+
+    # --- Memória ---
+    def enter(self, screen: str):
+        """Troca de tela: no modo econômico descarrega o que só a tela deixada usava
+
+        Depois aplica o orçamento, descarregando os assets usados há mais tempo que
+        não sejam da tela atual. A tela nova é pedida em segundo plano.
+        """
+        if screen == self.screen:
+            return
+        left, self.screen = self.screen, screen
+        self._entries += 1
+        for key in self.SCREENS[screen]:
+            self._last_used[key] = self._entries
+        music = self.SCREEN_MUSIC.get(screen)
+        if music is not None:
+            self._last_used["music." + music] = self._entries
+
+        if self.low_memory and left is not None:
+            for key in self.SCREENS[left]:
+                if key not in self.SCREENS[screen]:
+                    self.release(key)
+            if self.SCREEN_MUSIC.get(left) not in (None, music):
+                self.release("music." + self.SCREEN_MUSIC[left])
+        self.trim()
+        self.request(screen)
+
+    def release(self, key: str) -> bool:
+        """Descarrega uma imagem ou música ("music.<faixa>"); volta a carregar quando pedida
+
+        Imagens do atlas, sons e substitutos não saem (são pequenos e compartilhados).
+        """
+        if key.startswith("music."):
+            future = self._music_futures.pop(key[6:], None)
+            if future is None:
+                return False
+            future.cancel()
+        else:
+            if key not in self.IMAGES or self.in_atlas(key) or (key not in self._images and key not in self._futures):
+                return False
+            self._images.pop(key, None)
+            future = self._futures.pop(key, None)
+            if future is not None:
+                future.cancel()
+        self.evictions += 1
+        return True
+
+    def trim(self):
+        """Descarrega os assets menos usados (fora da tela atual) até caber no orçamento"""
+        if self.budget_bytes is None:
+            return
+        current = set(self.SCREENS.get(self.screen, ()))
+        if self.screen in self.SCREEN_MUSIC:
+            current.add("music." + self.SCREEN_MUSIC[self.screen])
+        usage = self.memory()
+        total = sum(usage.values()) + self.reserved_bytes
+        for key in sorted(usage, key=lambda k: self._last_used.get(k, 0)):
+            if total <= self.budget_bytes:
+                break
+            if key not in current and usage[key] and self.release(key):
+                total -= usage[key]
+
+    def memory(self) -> Dict[str, int]:
+        """Bytes mantidos por asset (imagem, "atlas", "sounds", "music.<faixa>")
+
+        Superfícies compartilhadas (substitutos) contam uma vez só; imagens ainda
+        não convertidas contam pelo tamanho decodificado.
+        """
+        usage: Dict[str, int] = {}
+        seen = set()
+
+        def add(name: str, surf):
+            if surf is not None and id(surf) not in seen:
+                seen.add(id(surf))
+                usage[name] = usage.get(name, 0) + surface_bytes(surf)
+
+        if self.atlas is not None:
+            add("atlas", self.atlas)
+        for key, surf in self._images.items():
+            if not self.in_atlas(key):
+                add(key, surf)
+        for key, future in self._futures.items():
+            if future.done() and not future.cancelled() and future.exception() is None:
+                add(key, future.result()[0])
+        for surf in self._converted.values():
+            add("fallbacks", surf)  # Substitutos convertidos que nenhuma imagem carregada usa mais
+
+        if self._sounds_future is not None and self._sounds_future.done():
+            sounds = self._sounds_future.result()
+            usage["sounds"] = sum(sound_bytes(sound) for sound in sounds.values())
+        for track, future in self._music_futures.items():
+            if future.done() and not future.cancelled():
+                usage["music." + track] = sound_bytes(future.result())
+        return usage
+
+    # --- Áudio ---
+    def sounds(self, block: bool = True) -> Optional[Dict[str, pygame.mixer.Sound]]:
+        """Efeitos prontos; com block=False, None enquanto ainda carregam"""
+        if self._sounds_future is None:
+            self._sounds_future = self.pool.submit(self._load_sounds)
+        if not block and not self._sounds_future.done():
+            return None
+        return self._sounds_future.result()
+
+    def music(self, track: str, block: bool = True):
+        """Música decodificada (Sound); False se não existir, None se ainda decodificando"""
+        future = self._submit_music(track)
+        if not block and not future.done():
+            return None
+        return future.result()
+
+    def _submit_music(self, track: str):
+        if track not in self._music_futures:
+            self._music_futures[track] = self.pool.submit(self._decode_music, self.MUSIC[track])
+        return self._music_futures[track]
+
+    def _load_sounds(self) -> Dict[str, pygame.mixer.Sound]:
+        if self.audio is not None and not self.audio():
+            return {}  # Sem mixer: play_sound vira no-op
+        return {name: self._load_sound(filename) for name, filename in self.SOUNDS.items()}
+
+    def _load_sound(self, filename: str) -> pygame.mixer.Sound:
+        """Carrega efeitos sonoros com fallback silencioso
+
+        O PCM já convertido para o formato do mixer fica no cache em disco: nas
+        próximas aberturas não há decodificação nem reamostragem.
+        """
+        try:
+            path = os.path.join(self.assets_dir, "sounds", filename)
+            with open(path, "rb") as f:
+                data = f.read()
+            freq, size, channels = pygame.mixer.get_init()
+            digest = hashlib.sha1(data).hexdigest()
+            cache_path = os.path.join(self.cache_dir, f"{digest}_{freq}_{size}_{channels}_v{CACHE_VERSION}.pcm")
+            try:
+                with open(cache_path, "rb") as f:
+                    sound = pygame.mixer.Sound(buffer=f.read())
+            except OSError:
+                sound = pygame.mixer.Sound(io.BytesIO(data))
+                try:
+                    os.makedirs(self.cache_dir, exist_ok=True)
+                    with open(cache_path + ".tmp", "wb") as f:
+                        f.write(sound.get_raw())
+                    os.replace(cache_path + ".tmp", cache_path)
+                except OSError:
+                    pass
+            sound.set_volume(0.7)
+            return sound
+        except:
+            return pygame.mixer.Sound(buffer=bytes([0]*1000))
+
+    def _decode_music(self, filename: str):
+        """Decodifica a música inteira (loop sem emenda e troca sem load() no jogo)"""
+        if self.audio is not None and not self.audio():
+            return False
+        path = self._load_music(filename)
+        if not path:
+            return False
+        try:
+            return pygame.mixer.Sound(path)
+        except pygame.error:
+            return False
+
+    def _load_music(self, filename: str) -> str:
+        """Retorna caminho da música"""
+        path = os.path.join(self.assets_dir, "music", filename)
+        return path if os.path.exists(path) else ""
+
+    # --- Acesso no estilo dicionário (self.assets["player1"]["idle"]) ---
+    def __getitem__(self, key: str):
+        group = self._groups.get(key)
+        if group is not None:
+            return group
+
+        if key in ("player1", "player2"):
+            group = {pose: self.image(f"{key}.{pose}") for pose in ("idle", "shoot", "dead")}
+        elif key == "sounds":
+            group = self.sounds()
+        elif key == "music":
+            group = {name: self._load_music(filename) for name, filename in self.MUSIC.items()}
+        else:
+            return self.image(key)
+
+        self._groups[key] = group
+        return group
+
+    def report(self) -> Dict:
+        """Tempos de inicialização (frio = cache vazio, quente = tudo veio do cache)"""
+        return {
+            "start": "warm" if self.cache_hits and not self.cache_misses else "cold",
+            "timings_ms": dict(self.timings),
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "memory_bytes": sum(self.memory().values()),
+            "evictions": self.evictions
+        }
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,128 @@
+import time
+import pygame
+from typing import Dict, List, Optional
+
+# Grupos de canais reservados: (quantidade, prioridade). Um grupo cheio pega canal livre
+# de grupo com prioridade menor; se não houver, interrompe o som mais antigo do próprio grupo.
+CHANNEL_GROUPS = {
+    "stinger": (2, 3),  # Vitória, derrota, conquista: nunca podem sumir
+    "shot": (4, 2),  # Tiros rápidos em sequência
+    "ui": (2, 1)  # Cliques
+}
+SOUND_GROUPS = {
+    "shot": "shot",
+    "win": "stinger",
+    "lose": "stinger",
+    "achievement": "stinger",
+    "click": "ui"
+}
+MUSIC_CHANNELS = 2  # Dois canais para trocar de música com crossfade
+MUSIC_FADE_MS = 300
+
+
+class AudioEngine:
+    """Efeitos em grupos de canais com prioridade e músicas já decodificadas (troca sem travar)
+
+    Todos os canais são reservados (set_reserved), então Sound.play() automático nunca
+    rouba um canal do jogo. As músicas tocam como Sound em loop nos canais de música:
+    decodificadas em segundo plano pelo AssetManager, a troca é um crossfade sem load()
+    na thread do jogo. Música pedida antes de terminar de decodificar (ou do mixer abrir)
+    começa em update().
+
+    Custo: a faixa inteira fica em PCM (44,1 kHz, estéreo, 16 bits: ~10 MB por minuto).
+    Por isso o AssetManager conta a música no orçamento de memória e, no modo de pouca
+    memória, descarrega a faixa da tela que ficou para trás.
+    """
+
+    def __init__(self, assets, enabled, music_volume: float = 0.5):
+        self.assets = assets
+        self.enabled = enabled  # Função: o mixer já abriu? (não bloqueia)
+        self.music_volume = music_volume
+        self.current_music = ""
+        self.pending_music = ""
+
+        self.groups: Dict[str, List[pygame.mixer.Channel]] = {}
+        self.music_channels: List[pygame.mixer.Channel] = []
+        self._started: Dict[int, float] = {}  # Canal -> instante em que o som começou
+        self._ready = False
+
+    def _setup(self) -> bool:
+        """Reserva os canais na primeira vez que o mixer estiver pronto"""
+        if self._ready:
+            return True
+        if not self.enabled():
+            return False
+        total = sum(count for count, _ in CHANNEL_GROUPS.values()) + MUSIC_CHANNELS
+        pygame.mixer.set_num_channels(total)
+        pygame.mixer.set_reserved(total)
+        index = 0
+        for name, (count, _) in CHANNEL_GROUPS.items():
+            self.groups[name] = [pygame.mixer.Channel(i) for i in range(index, index + count)]
+            index += count
+        self.music_channels = [pygame.mixer.Channel(i) for i in range(index, index + MUSIC_CHANNELS)]
+        self._ready = True
+        return True
+
+    def _channel(self, group: str) -> Optional[pygame.mixer.Channel]:
+        """Canal livre do grupo, de um grupo menos prioritário ou o mais antigo do grupo"""
+        own = self.groups[group]
+        for channel in own:
+            if not channel.get_busy():
+                return channel
+
+        priority = CHANNEL_GROUPS[group][1]
+        for name, (_, other) in sorted(CHANNEL_GROUPS.items(), key=lambda item: item[1][1]):
+            if other < priority:
+                for channel in self.groups[name]:
+                    if not channel.get_busy():
+                        return channel
+
+        return min(own, key=lambda channel: self._started.get(id(channel), 0.0))
+
+    def play(self, sound: str):
+        """Toca um efeito no grupo dele (sem esperar os sons carregarem)"""
+        if not self._setup():
+            return
+        sounds = self.assets.sounds(block=False)
+        if sounds is None or sound not in sounds:
+            return
+        channel = self._channel(SOUND_GROUPS.get(sound, "ui"))
+        channel.play(sounds[sound])
+        self._started[id(channel)] = time.perf_counter()
+
+    def play_music(self, track: str, fade_ms: int = MUSIC_FADE_MS):
+        """Troca para a música (crossfade); se ainda estiver decodificando, começa em update()"""
+        if track == self.current_music:
+            return
+        if not self._setup():
+            self.pending_music = track  # Mixer ainda não abriu (ou falhou ao reabrir): tenta em update()
+            return
+        music = self.assets.music(track, block=False)
+        if music is None:
+            self.pending_music = track
+            return
+        self.pending_music = ""
+        if not music:
+            return  # Arquivo não existe: segue sem música
+
+        for channel in self.music_channels:
+            if channel.get_busy():
+                channel.fadeout(fade_ms)
+        channel = next((c for c in self.music_channels if not c.get_busy()),
+                       min(self.music_channels, key=lambda c: self._started.get(id(c), 0.0)))
+        channel.set_volume(self.music_volume)
+        channel.play(music, loops=-1, fade_ms=fade_ms)
+        self._started[id(channel)] = time.perf_counter()
+        self.current_music = track
+
+    def stop_music(self, fade_ms: int = MUSIC_FADE_MS):
+        self.pending_music = ""
+        self.current_music = ""
+        if self._ready:
+            for channel in self.music_channels:
+                channel.fadeout(fade_ms)
+
+    def update(self):
+        """Começa a música pedida assim que ela terminar de decodificar"""
+        if self.pending_music and self.assets.music(self.pending_music, block=False) is not None:
+            self.play_music(self.pending_music)
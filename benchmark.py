@@ -0,0 +1,321 @@
+import os
+import gc
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import platform
+import tracemalloc
+
+# Benchmark determinístico: roda o Game sem janela (drivers "dummy" do SDL) com
+# entradas roteirizadas, RNG com semente e relógio simulado (frames de duração fixa).
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+os.environ.setdefault("DUELO_RENDER_SCALE", "1")  # Escala fixa: resultados comparáveis entre execuções
+
+import pygame
+from runtime import Runtime
+from main import Game
+from assets import AssetManager
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+METRICS = ("p50", "p95", "p99")  # Percentis comparados com a linha de base
+
+
+def key(k: int) -> pygame.event.Event:
+    return pygame.event.Event(pygame.KEYDOWN, key=k)
+
+
+class Script:
+    """Entrada roteirizada: decide os eventos de cada frame a partir do estado do jogo"""
+
+    max_frames = 20000
+
+    def __init__(self):
+        self.frame = 0
+        self.done = False
+
+    def events(self, game) -> list:
+        return []
+
+
+class MenuScript(Script):
+    """Navega menu -> conquistas -> menu algumas vezes"""
+
+    def __init__(self, cycles: int = 5, idle_frames: int = 60):
+        super().__init__()
+        self.cycles = cycles
+        self.idle_frames = idle_frames
+
+    def events(self, game):
+        cycle, t = divmod(self.frame, self.idle_frames * 2)
+        if cycle >= self.cycles:
+            self.done = True
+            return []
+        if t == self.idle_frames - 1:
+            return [key(pygame.K_3)]
+        if t == self.idle_frames * 2 - 1:
+            return [key(pygame.K_ESCAPE)]
+        return []
+
+
+class DuelScript(Script):
+    """Joga partidas completas: atira assim que o duelo começa e continua após o resultado"""
+
+    def __init__(self, mode_key: int, shooter, result_frames: int = 30):
+        super().__init__()
+        self.mode_key = mode_key
+        self.shooter = shooter  # Função (número do duelo) -> tecla de tiro
+        self.result_frames = result_frames
+        self.duels = 0
+        self.fired = False
+        self.result_wait = 0
+        self.started = False
+
+    def events(self, game):
+        if not self.started:
+            self.started = True
+            return [key(self.mode_key)]
+        if game.game_state == "menu":
+            self.done = True
+            return []
+        if game.game_state == "duel" and not self.fired:
+            self.fired = True
+            return [key(self.shooter(self.duels))]
+        if game.game_state == "result":
+            self.result_wait += 1
+            if self.result_wait >= self.result_frames:
+                self.result_wait = 0
+                self.fired = False
+                self.duels += 1
+                return [key(pygame.K_RETURN)]
+        return []
+
+
+class AchievementsScript(Script):
+    """Fica parado na tela de conquistas"""
+
+    def __init__(self, idle_frames: int = 600):
+        super().__init__()
+        self.idle_frames = idle_frames
+
+    def events(self, game):
+        if self.frame == 0:
+            return [key(pygame.K_3)]
+        if self.frame >= self.idle_frames:
+            self.done = True
+        return []
+
+
+SCENARIOS = {
+    "menu": lambda: MenuScript(),
+    "arcade": lambda: DuelScript(pygame.K_1, lambda duel: pygame.K_f),
+    # Melhor de 5 alternando quem atira primeiro (termina 5 x 4)
+    "pvp": lambda: DuelScript(pygame.K_2, lambda duel: pygame.K_f if duel % 2 == 0 else pygame.K_j),
+    "achievements": lambda: AchievementsScript()
+}
+
+
+def percentile(values, p: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    k = (len(ordered) - 1) * p / 100
+    lo, hi = int(k), min(int(k) + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def run_scenario(name: str, runtime: Runtime, seed: int, fps: int, dirty: bool, track_alloc: bool) -> dict:
+    """Roda um cenário do começo ao fim e devolve as medições por frame"""
+    game = Game(runtime, seed=seed)
+    game.renderer.set_mode(dirty)
+    game.assets.wait("duel")
+    script = SCENARIOS[name]()
+    frame_ms = 1000 / fps
+
+    frame_times, alloc_peaks, alloc_net = [], [], []
+    collections = [0]
+
+    def on_gc(phase, info):
+        if phase == "start":
+            collections[0] += 1
+
+    gc.collect()
+    gc.callbacks.append(on_gc)
+    if track_alloc:
+        tracemalloc.start()
+
+    wall_start = time.perf_counter()
+    try:
+        while not script.done and script.frame < script.max_frames:
+            for event in script.events(game):
+                pygame.event.post(event)
+
+            if track_alloc:
+                tracemalloc.reset_peak()
+                before = tracemalloc.get_traced_memory()[0]
+
+            start = time.perf_counter()
+            game.step_frame(frame_ms)
+            frame_times.append((time.perf_counter() - start) * 1000)
+
+            if track_alloc:
+                current, peak = tracemalloc.get_traced_memory()
+                alloc_peaks.append(peak - before)
+                alloc_net.append(current - before)
+            script.frame += 1
+    finally:
+        wall_ms = (time.perf_counter() - wall_start) * 1000
+        gc.callbacks.remove(on_gc)
+        if track_alloc:
+            tracemalloc.stop()
+        game.shutdown()
+
+    result = {
+        "frames": len(frame_times),
+        "completed": script.done,
+        "wall_ms": round(wall_ms, 3),
+        "frame_ms": {
+            "p50": round(percentile(frame_times, 50), 4),
+            "p95": round(percentile(frame_times, 95), 4),
+            "p99": round(percentile(frame_times, 99), 4),
+            "mean": round(sum(frame_times) / max(1, len(frame_times)), 4),
+            "max": round(max(frame_times, default=0.0), 4)
+        },
+        "gc_collections": collections[0],
+        "text_cache": game.text.stats()
+    }
+    if track_alloc:
+        result["alloc_bytes_per_frame"] = {
+            "transient_mean": round(sum(alloc_peaks) / max(1, len(alloc_peaks)), 1),
+            "transient_p95": round(percentile(alloc_peaks, 95), 1),
+            "retained_mean": round(sum(alloc_net) / max(1, len(alloc_net)), 1)
+        }
+    if isinstance(script, DuelScript):
+        result["duels"] = script.duels
+    return result
+
+
+def blit_report(runtime: Runtime, frames: int = 300, bullets: int = 4) -> dict:
+    """Custo dos blits de um frame de duelo: formato antigo (tudo convert_alpha, superfícies
+    soltas) contra o atual (fundo opaco com convert, sprites em subsurfaces do atlas)"""
+    assets = AssetManager(runtime.size)
+    assets.wait("duel")
+    screen = runtime.screen
+    w, h = runtime.size
+
+    after = {key: assets.image(key) for key in AssetManager.SCREENS["duel"]}
+    before = {key: surf.convert_alpha() for key, surf in after.items()}  # Cópias soltas com alpha
+
+    def frame_ops(images):
+        ops = [(images["bg_game"], (0, 0)),
+               (images["player1.idle"], (w * 0.2, h * 0.6)),
+               (images["player2.shoot"], (w * 0.6, h * 0.6))]
+        ops += [(images["bullet"], (w * 0.3 + i * 80, h * 0.7)) for i in range(bullets)]
+        return ops
+
+    result = {}
+    for name, images in (("before", before), ("after", after)):
+        ops = frame_ops(images)
+        screen.blits(ops, doreturn=False)  # Aquecimento
+        start = time.perf_counter()
+        for _ in range(frames):
+            screen.blits(ops, doreturn=False)
+        result[name + "_us"] = round((time.perf_counter() - start) / frames * 1e6, 1)
+    result["speedup"] = round(result["before_us"] / max(result["after_us"], 1e-9), 2)
+    result["atlas_size"] = list(assets.atlas.get_size())
+    assets.shutdown()
+    return result
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    """Lista de regressões: percentis que pioraram mais que threshold (fração)"""
+    regressions = []
+    for name, result in current["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if not base:
+            continue
+        for metric in METRICS:
+            old, new = base["frame_ms"][metric], result["frame_ms"][metric]
+            if old > 0 and new > old * (1 + threshold):
+                regressions.append({"scenario": name, "metric": metric, "baseline": old,
+                                    "current": new, "change": round(new / old - 1, 4)})
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de tempo de frame do Duelo no Oeste")
+    parser.add_argument("scenarios", nargs="*", help=f"Cenários ({', '.join(SCENARIOS)}); padrão: todos")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--fps", type=int, default=60, help="Duração simulada de cada frame (1000/fps ms)")
+    parser.add_argument("--size", default="1920x1080")
+    parser.add_argument("--dirty", action="store_true", help="Usa o modo de retângulos sujos")
+    parser.add_argument("--no-alloc", action="store_true", help="Não mede alocações (tracemalloc)")
+    parser.add_argument("--out", help="Grava o JSON neste arquivo (além da saída padrão)")
+    parser.add_argument("--compare", help="JSON de linha de base para detectar regressões")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Piora tolerada (0.10 = 10%%)")
+    parser.add_argument("--blit-report", action="store_true", help="Inclui o custo de blit antes/depois do atlas")
+    args = parser.parse_args(argv)
+
+    scenarios = args.scenarios or list(SCENARIOS)
+    unknown = [name for name in scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"cenário desconhecido: {', '.join(unknown)}")
+    size = tuple(int(v) for v in args.size.lower().split("x"))
+
+    # Roda num diretório temporário para não mexer nas conquistas do jogador
+    workdir = tempfile.mkdtemp(prefix="duelo-bench-")
+    cwd = os.getcwd()
+    if os.path.isdir(os.path.join(REPO_DIR, "assets")):
+        os.symlink(os.path.join(REPO_DIR, "assets"), os.path.join(workdir, "assets"))
+    os.chdir(workdir)
+
+    try:
+        runtime = Runtime(size=size, headless=True, audio=False, fps=args.fps)
+        report = {
+            "meta": {
+                "python": platform.python_version(),
+                "pygame": pygame.version.ver,
+                "platform": platform.platform(),
+                "size": list(size),
+                "fps": args.fps,
+                "seed": args.seed,
+                "dirty_rects": args.dirty
+            },
+            "scenarios": {}
+        }
+        for name in scenarios:
+            # Alocações numa segunda passada para não distorcer os tempos
+            result = run_scenario(name, runtime, args.seed, args.fps, args.dirty, track_alloc=False)
+            if not args.no_alloc:
+                alloc = run_scenario(name, runtime, args.seed, args.fps, args.dirty, track_alloc=True)
+                result["alloc_bytes_per_frame"] = alloc["alloc_bytes_per_frame"]
+            report["scenarios"][name] = result
+        if args.blit_report:
+            report["blit_us_per_frame"] = blit_report(runtime)
+        runtime.shutdown()
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    status = 0
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        report["regressions"] = compare(report, baseline, args.threshold)
+        status = 1 if report["regressions"] else 0
+
+    output = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(output + "\n")
+    print(output)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,38 @@
+# Ajuste automático de qualidade pelo tempo de trabalho do frame (partículas, escala da cena)
+
+
+class FrameBudget:
+    """Nível de qualidade (0 = melhor) pela média do tempo de trabalho contra o orçamento
+
+    Acima do orçamento por down_frames frames seguidos desce um nível; abaixo da metade
+    por up_frames sobe um. Cada dono escolhe os seus (quem cede primeiro baixa mais rápido).
+    """
+
+    def __init__(self, budget_ms: float, levels: int, down_frames: int, up_frames: int, level: int = 0):
+        self.budget_ms = budget_ms
+        self.levels = levels
+        self.down_frames = down_frames
+        self.up_frames = up_frames
+        self.level = level
+        self._ema_ms = 0.0
+        self._over = 0
+        self._under = 0
+
+    def note(self, work_ms: float) -> int:
+        """Registra um frame e retorna o nível atual"""
+        self._ema_ms += (work_ms - self._ema_ms) * 0.1
+        if self._ema_ms > self.budget_ms:
+            self._over += 1
+            self._under = 0
+            if self._over >= self.down_frames and self.level < self.levels - 1:
+                self.level += 1
+                self._over = 0
+        elif self._ema_ms < self.budget_ms * 0.5:
+            self._under += 1
+            self._over = 0
+            if self._under >= self.up_frames and self.level > 0:
+                self.level -= 1
+                self._under = 0
+        else:
+            self._over = self._under = 0
+        return self.level
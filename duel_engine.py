@@ -0,0 +1,522 @@
+import json
+import numpy as np
+
+# Regras do duelo sem pygame: o mesmo código roda o jogo (N=1) e simulações em lote
+
+SPRITE_SIZE = (200, 250)
+BASE_BULLET_SPEED = 25  # px por passo de lógica
+MAX_ROUNDS = 10
+
+TICK_RATE = 60  # Passos de lógica por segundo (velocidades e chances são por passo de 60 Hz)
+TICK_MS = 1000 / TICK_RATE
+
+SHOT_COOLDOWN_MS = 300  # Cooldown entre tiros (compartilhado pelos dois jogadores)
+SHOOT_POSE_MS = 200  # Tempo da pose de tiro
+AI_MIN_DELAY_MS = 100  # Espera mínima da IA depois do "ATIRE!"
+
+# Poses dos jogadores
+IDLE, SHOOT, DEAD = 0, 1, 2
+POSES = ("idle", "shoot", "dead")
+
+# Armas: cooldown, projéteis por tiro e abertura vertical (fração da velocidade)
+WEAPONS = {
+    "revolver": {"cooldown_ms": SHOT_COOLDOWN_MS, "pellets": 1, "spread": 0.0}
+}
+
+
+def calculate_difficulty(arcade_round, arcade=True):
+    """Multiplicador de dificuldade (1.0 a 10.0); aceita escalar ou array"""
+    difficulty = np.where(arcade, np.minimum(10.0, 1.0 + np.asarray(arcade_round) * 0.9), 1.0)
+    return difficulty if difficulty.ndim else float(difficulty)
+
+
+def calculate_ai_reaction_time(arcade_round, arcade=True):
+    """Tempo de reação da IA em ms (round 1: 460ms ... round 10: 100ms)"""
+    reaction = np.where(arcade, np.maximum(100, 500 - np.asarray(arcade_round) * 40), 1000)
+    return reaction if reaction.ndim else int(reaction)
+
+
+def ai_fire_rate(difficulty):
+    """Taxa de disparo da IA (tiros por ms) para o multiplicador de dificuldade
+
+    O tempo até o tiro da IA é exponencial com esta taxa, contado a partir de
+    AI_MIN_DELAY_MS depois do "ATIRE!" (ou do fim de um bloqueio: cooldown ou
+    reação ao tiro do jogador). É o limite contínuo do antigo sorteio de
+    0.03 * dificuldade a cada frame de 60 Hz, agora sem depender do FPS:
+    dificuldade 1.9 ~ 280 ms de espera média, dificuldade 10 ~ 47 ms.
+    """
+    p = 0.03 * np.asarray(difficulty)
+    return -np.log1p(-p) / TICK_MS
+
+
+class DifficultyTable:
+    """Parâmetros da IA por rodada em arrays: consulta O(1) por índice, sem fórmulas
+
+    A linha 0 vale fora do arcade (PvP); as linhas 1..N são as rodadas. O arquivo é
+    gerado pelo tuner.py; sem ele, a tabela sai das fórmulas originais.
+    """
+
+    def __init__(self, difficulty, reaction_ms):
+        self.difficulty = np.asarray(difficulty, dtype=np.float64)
+        self.reaction_ms = np.asarray(reaction_ms, dtype=np.float64)
+        self.ai_rate = ai_fire_rate(self.difficulty)
+        self.rounds = len(self.difficulty) - 1
+        self._rows = list(zip(self.difficulty.tolist(), self.reaction_ms.tolist()))  # Consulta escalar
+
+    @classmethod
+    def from_formulas(cls, rounds: int = MAX_ROUNDS) -> "DifficultyTable":
+        arcade_round = np.arange(rounds + 1)
+        return cls(calculate_difficulty(arcade_round, arcade_round > 0),
+                   calculate_ai_reaction_time(arcade_round, arcade_round > 0))
+
+    @classmethod
+    def load(cls, path: str) -> "DifficultyTable":
+        """Lê a tabela do tuner (rodadas 1..N); sem arquivo válido, usa as fórmulas"""
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+            return cls([calculate_difficulty(0, False)] + list(data["difficulty"]),
+                       [calculate_ai_reaction_time(0, False)] + list(data["reaction_ms"]))
+        except (OSError, ValueError, KeyError, TypeError):
+            return cls.from_formulas()
+
+    def save(self, path: str, **meta):
+        data = dict(meta, difficulty=[round(v, 3) for v in self.difficulty[1:].tolist()],
+                    reaction_ms=[round(v, 1) for v in self.reaction_ms[1:].tolist()])
+        with open(path, "w") as f:
+            json.dump(data, f, separators=(",", ":"))
+
+    def index(self, arcade_round, arcade=True) -> np.ndarray:
+        """Linha da tabela para rodada/modo (arrays por duelo)"""
+        return np.where(arcade, np.clip(arcade_round, 1, self.rounds), 0)
+
+    def lookup(self, arcade_round: int, arcade: bool = True) -> tuple:
+        """(dificuldade, reação da IA em ms) de uma rodada"""
+        return self._rows[min(max(arcade_round, 1), self.rounds) if arcade else 0]
+
+
+def _splitmix64(x: np.ndarray) -> np.ndarray:
+    """Hash SplitMix64 (uint64): sorteio sem estado, vetorizado entre duelos"""
+    x = x + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def sample_human_reaction(rng: np.random.Generator, n: int, median_ms: float = 250, sigma: float = 0.25) -> np.ndarray:
+    """Tempo de reação humano (log-normal) a partir do "ATIRE!", em ms"""
+    return median_ms * np.exp(sigma * rng.standard_normal(n))
+
+
+class BulletPool:
+    """Balas pré-alocadas em arrays (struct-of-arrays) com pilha de slots livres"""
+
+    STATE = ("x", "y", "prev_x", "prev_y", "vx", "vy", "owner", "duel", "seq", "active", "fresh", "_free")
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.prev_x = np.zeros(capacity)
+        self.prev_y = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        self.owner = np.zeros(capacity, dtype=np.int8)
+        self.duel = np.zeros(capacity, dtype=np.int32)
+        self.seq = np.zeros(capacity, dtype=np.int64)  # Ordem de disparo
+        self.active = np.zeros(capacity, dtype=bool)
+        self.fresh = np.zeros(capacity, dtype=bool)  # Nascida desde o último move(): prev_x/prev_y = boca do cano
+
+        self._free = np.arange(capacity - 1, -1, -1)
+        self._free_top = capacity
+        self._next_seq = 0
+
+    def __len__(self) -> int:
+        return self.capacity - self._free_top
+
+    def get_state(self) -> dict:
+        """Cópia do estado (para voltar no tempo com set_state)"""
+        state = {name: getattr(self, name).copy() for name in self.STATE}
+        state["_free_top"], state["_next_seq"] = self._free_top, self._next_seq
+        return state
+
+    def set_state(self, state: dict):
+        for name in self.STATE:
+            getattr(self, name)[:] = state[name]
+        self._free_top, self._next_seq = state["_free_top"], state["_next_seq"]
+
+    def spawn(self, duel, owner: int, x, y, vx, vy=0.0, origin_x=None, origin_y=None) -> np.ndarray:
+        """Cria balas (uma por elemento de duel); se o pool lotar, as excedentes são descartadas
+
+        x/y é a posição no instante atual do motor; origin_x/origin_y (boca do cano no
+        instante do tiro) vira o começo do primeiro trecho testado na colisão.
+        """
+        duel = np.atleast_1d(duel)
+        k = min(len(duel), self._free_top)
+        idx = self._free[self._free_top - k:self._free_top]
+        self._free_top -= k
+
+        shape = (len(duel),)
+        self.duel[idx] = duel[:k]
+        self.owner[idx] = owner
+        self.x[idx] = np.broadcast_to(x, shape)[:k]
+        self.y[idx] = np.broadcast_to(y, shape)[:k]
+        self.prev_x[idx] = np.broadcast_to(x if origin_x is None else origin_x, shape)[:k]
+        self.prev_y[idx] = np.broadcast_to(y if origin_y is None else origin_y, shape)[:k]
+        self.fresh[idx] = True
+        self.vx[idx] = np.broadcast_to(vx, shape)[:k]
+        self.vy[idx] = np.broadcast_to(vy, shape)[:k]
+        self.seq[idx] = np.arange(self._next_seq, self._next_seq + k)
+        self.active[idx] = True
+        self._next_seq += k
+        return idx
+
+    def release(self, idx: np.ndarray):
+        """Devolve balas para a pilha de slots livres"""
+        idx = idx[self.active[idx]]
+        k = len(idx)
+        self.active[idx] = False
+        self.fresh[idx] = False
+        self._free[self._free_top:self._free_top + k] = idx
+        self._free_top += k
+
+    def release_duels(self, duels: np.ndarray):
+        """Remove todas as balas dos duelos indicados (máscara por duelo)"""
+        self.release(np.nonzero(self.active & duels[self.duel])[0])
+
+    def move(self):
+        """Avança todas as balas (slots livres também andam, mas são ignorados)
+
+        Bala recém-disparada guarda a boca do cano em prev_x/prev_y: o trecho desde
+        o tiro também passa pelo teste de colisão.
+        """
+        if self.fresh.any():
+            settled = ~self.fresh
+            np.copyto(self.prev_x, self.x, where=settled)
+            np.copyto(self.prev_y, self.y, where=settled)
+            self.fresh[:] = False
+        else:
+            self.prev_x[:] = self.x
+            self.prev_y[:] = self.y
+        self.x += self.vx
+        self.y += self.vy
+
+
+def player_positions(screen_width: float, ground_y: float = 972) -> tuple:
+    """(x do jogador 1, x do jogador 2, y dos jogadores, y das balas) numa tela"""
+    player_y = ground_y - SPRITE_SIZE[1]
+    return screen_width * 0.2, screen_width * 0.8 - SPRITE_SIZE[0], player_y, player_y + SPRITE_SIZE[1] // 2
+
+
+class DuelEngine:
+    """Estado e regras de N duelos simultâneos em arrays NumPy"""
+
+    # Arrays por duelo que formam o estado (get_state/set_state)
+    STATE = ("time", "arcade_round", "arcade", "bullet_speed", "reaction_time", "ai_rate", "ai_fire_time",
+             "duel_start", "last_shot", "last_shot_time", "player1_state", "player2_state", "winner",
+             "impact_time", "first_shot1", "first_shot2", "shots_fired", "shots_hit", "stream_key", "stream_pos", "ended", "ai_fired", "ai_fired_early")
+
+    def __init__(self, n: int = 1, screen_width: float = 1920, ground_y: float = 972,
+                 max_bullets: int = 16, weapon: str = "revolver", tick_ms: float = TICK_MS, seed=None,
+                 table: DifficultyTable = None):
+        self.n = n
+        self.table = table or DifficultyTable.from_formulas()
+        self.tick_ms = tick_ms  # Passos maiores (aparelhos fracos) não mudam o resultado
+        self.weapon = WEAPONS[weapon]
+        self.rng = np.random.default_rng(seed)
+        self.set_geometry(screen_width, ground_y)
+
+        # Relógio de cada duelo (ms)
+        self.time = np.zeros(n)
+
+        # Estado por duelo
+        self.arcade_round = np.ones(n, dtype=np.int32)
+        self.arcade = np.zeros(n, dtype=bool)
+        self.bullet_speed = np.zeros(n)
+        self.reaction_time = np.zeros(n)
+        self.ai_rate = np.zeros(n)  # Taxa de disparo da IA (ai_fire_rate)
+        self.ai_fire_time = np.full(n, np.inf)  # Próximo tiro agendado da IA (ms)
+        self.duel_start = np.zeros(n)
+        self.last_shot = np.zeros(n)
+        self.last_shot_time = np.zeros(n)  # Último tiro do jogador 1 (usado pela IA)
+        self.player1_state = np.zeros(n, dtype=np.int8)
+        self.player2_state = np.zeros(n, dtype=np.int8)
+        self.winner = np.zeros(n, dtype=np.int8)  # 0 = duelo em andamento
+        self.impact_time = np.zeros(n)  # Instante exato (ms) do tiro que decidiu o duelo
+        self.first_shot1 = np.full(n, np.nan)  # Primeiro tiro de cada jogador (ms desde o ATIRE!)
+        self.first_shot2 = np.full(n, np.nan)
+        self.shots_fired = np.zeros(n, dtype=np.int32)
+        self.shots_hit = np.zeros(n, dtype=np.int32)
+
+        # Fluxo aleatório próprio de cada duelo: (chave, contador) -> SplitMix64
+        self.stream_key = np.zeros(n, dtype=np.uint64)
+        self.stream_pos = np.zeros(n, dtype=np.uint64)
+
+        # Balas de todos os duelos num único pool (max_bullets por duelo, em média)
+        self.bullets = BulletPool(n * max_bullets)
+
+        # Eventos do último passo
+        self.ended = np.zeros(n, dtype=bool)
+        self.ai_fired = np.zeros(n, dtype=bool)
+        self.ai_fired_early = np.zeros(n, dtype=bool)  # Tiros da IA resolvidos antes do passo (ver fire)
+
+        self.reset()
+
+    def set_geometry(self, screen_width: float, ground_y: float = 972):
+        """Posições fixas dos jogadores (entre duelos; no PvP em rede vêm da referência do host)"""
+        self.screen_width = screen_width
+        self.ground_y = ground_y
+        self.player1_x, self.player2_x, self.player_y, self.bullet_y = player_positions(screen_width, ground_y)
+
+    def _mask(self, which) -> np.ndarray:
+        """Converte índice/máscara/None em máscara booleana de duelos"""
+        if which is None:
+            return np.ones(self.n, dtype=bool)
+        mask = np.zeros(self.n, dtype=bool)
+        mask[which] = True
+        return mask
+
+    def reset(self, which=None, arcade_round=None, arcade=None, seed=None):
+        """Começa um duelo novo nos duelos indicados
+
+        seed (int ou array por duelo) fixa o fluxo aleatório do duelo: o mesmo seed
+        reproduz o mesmo duelo em qualquer aparelho e taxa de frames. Sem seed, a
+        chave vem do gerador do motor.
+        """
+        m = self._mask(which)
+        if arcade_round is not None:
+            self.arcade_round[m] = arcade_round
+        if arcade is not None:
+            self.arcade[m] = arcade
+        if seed is None:
+            self.stream_key[m] = self.rng.integers(0, 2 ** 63, int(m.sum()), dtype=np.uint64)
+        else:
+            self.stream_key[m] = _splitmix64(np.asarray(seed, dtype=np.uint64))
+        self.stream_pos[m] = 0
+
+        # Parâmetros da rodada ficam fixos durante o duelo, convertidos para o passo atual
+        scale = self.tick_ms / TICK_MS
+        row = self.table.index(self.arcade_round[m], self.arcade[m])
+        self.bullet_speed[m] = BASE_BULLET_SPEED * self.table.difficulty[row] * scale
+        self.reaction_time[m] = self.table.reaction_ms[row]
+        self.ai_rate[m] = self.table.ai_rate[row]
+
+        self.duel_start[m] = self.time[m]
+        self.last_shot[m] = -np.inf
+        self.last_shot_time[m] = -np.inf
+        self.player1_state[m] = IDLE
+        self.player2_state[m] = IDLE
+        self.winner[m] = 0
+        self.impact_time[m] = 0.0
+        self.first_shot1[m] = np.nan
+        self.first_shot2[m] = np.nan
+        self.shots_fired[m] = 0
+        self.shots_hit[m] = 0
+        self.bullets.release_duels(m)
+        self.ended[m] = False
+        self.ai_fired[m] = False
+        self.ai_fired_early[m] = False
+
+        # Tiro da IA sorteado uma vez por duelo (só no arcade)
+        rows = np.nonzero(m & self.arcade)[0]
+        self.ai_fire_time[m] = np.inf
+        self.ai_fire_time[rows] = self.time[rows] + AI_MIN_DELAY_MS + self._ai_wait(rows)
+
+    def get_state(self) -> dict:
+        """Cópia de todo o estado mutável, balas incluídas"""
+        state = {name: getattr(self, name).copy() for name in self.STATE}
+        state["bullets"] = self.bullets.get_state()
+        return state
+
+    def set_state(self, state: dict):
+        """Volta ao estado salvo por get_state"""
+        for name in self.STATE:
+            setattr(self, name, state[name].copy())
+        self.bullets.set_state(state["bullets"])
+
+    def _uniform(self, rows: np.ndarray) -> np.ndarray:
+        """Próximo número em (0, 1] do fluxo de cada duelo indicado"""
+        bits = _splitmix64(self.stream_key[rows] ^ _splitmix64(self.stream_pos[rows]))
+        self.stream_pos[rows] += np.uint64(1)
+        return ((bits >> np.uint64(11)).astype(np.float64) + 1.0) * 2.0 ** -53
+
+    def _ai_wait(self, rows: np.ndarray) -> np.ndarray:
+        """Espera exponencial (ms) até o tiro da IA, depois de liberada"""
+        return -np.log(self._uniform(rows)) / self.ai_rate[rows]
+
+    def fire(self, player: int, which=None, at=None) -> np.ndarray:
+        """Dispara nos duelos indicados respeitando o cooldown; retorna quem atirou
+
+        at (array por duelo) é o instante real do tiro, que pode cair dentro do
+        último passo ou do próximo; a bala nasce na posição daquele instante. Tiros
+        da IA agendados até esse instante são resolvidos antes, para que os tiros
+        entrem no cooldown compartilhado em ordem de tempo.
+        """
+        when = np.broadcast_to(self.time if at is None else at, (self.n,))
+        self._fire_ai(np.where(self._mask(which), when, -np.inf), self.ai_fired_early)
+        return self._fire(player, which, when)
+
+    def _fire(self, player: int, which, when: np.ndarray) -> np.ndarray:
+        # Tiro com instante anterior ao último registrado também cai no cooldown (é recusado)
+        fired = (self._mask(which) & (self.winner == 0) &
+                 (when - self.last_shot >= self.weapon["cooldown_ms"]))
+        rows = np.nonzero(fired)[0]
+        if not len(rows):
+            return fired
+
+        # Um projétil por "pellet", abertos em leque vertical
+        pellets = self.weapon["pellets"]
+        duels = np.repeat(rows, pellets)
+        speed = self.bullet_speed[duels]
+        spread = np.tile(np.linspace(-1.0, 1.0, pellets) if pellets > 1 else np.zeros(1), len(rows))
+        vy = speed * self.weapon["spread"] * spread
+        lead = (self.time[duels] - when[duels]) / self.tick_ms  # Fração de passo já percorrida (ou a percorrer)
+
+        if player == 1:
+            muzzle = self.player1_x + SPRITE_SIZE[0]
+            self.bullets.spawn(duels, 1, muzzle + speed * lead, self.bullet_y + vy * lead, speed, vy,
+                               muzzle, self.bullet_y)
+            self.player1_state[rows] = SHOOT
+            self.last_shot_time[rows] = np.maximum(self.last_shot_time[rows], when[rows])
+        else:
+            self.bullets.spawn(duels, 2, self.player2_x - speed * lead, self.bullet_y + vy * lead, -speed, vy,
+                               self.player2_x, self.bullet_y)
+            self.player2_state[rows] = SHOOT
+
+        self.last_shot[rows] = np.maximum(self.last_shot[rows], when[rows])
+        first = self.first_shot1 if player == 1 else self.first_shot2
+        new = rows[np.isnan(first[rows])]
+        first[new] = when[new] - self.duel_start[new]
+        self.shots_fired[rows] += 1
+        return fired
+
+    def step(self):
+        """Avança todos os duelos em um passo fixo (tick_ms)"""
+        step_start = self.time.copy()
+        self.time += self.tick_ms
+        live = self.winner == 0
+
+        # Movimento das balas em lote
+        pool = self.bullets
+        pool.move()
+        idx = np.nonzero(pool.active)[0]
+        x, y = pool.x[idx], pool.y[idx]
+        prev_x = pool.prev_x[idx]
+        owner, duel = pool.owner[idx], pool.duel[idx]
+
+        # Colisão contínua: o trecho testado vai de prev_x (boca do cano, se a bala acabou de
+        # nascer) até x; o instante vem da trajetória (x - vx no começo do passo), então um
+        # tiro de antes do passo pode acertar antes dele começar (toi < 0)
+        target = np.where(owner == 1, self.player2_x, self.player1_x + SPRITE_SIZE[0])
+        crossed = np.where(owner == 1, (prev_x <= target) & (x > target), (prev_x >= target) & (x < target))
+        vx, vy = pool.vx[idx], pool.vy[idx]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            toi = np.clip((target - (x - vx)) / vx, -1.0, 1.0)
+        hit_y = y - vy + vy * toi
+        hit = (crossed & (hit_y >= self.player_y) & (hit_y <= self.player_y + SPRITE_SIZE[1]) &
+               live[duel])
+
+        # Vence a bala que chega primeiro dentro do passo; empate exato: a disparada primeiro
+        self.ended = np.zeros(self.n, dtype=bool)
+        if hit.any():
+            hit_duel, hit_owner = duel[hit], owner[hit]
+            hit_time = step_start[hit_duel] + toi[hit] * self.tick_ms
+            order = np.lexsort((pool.seq[idx][hit], hit_time, hit_duel))
+            hit_duel, hit_owner, hit_time = hit_duel[order], hit_owner[order], hit_time[order]
+            first = np.ones(len(hit_duel), dtype=bool)
+            first[1:] = hit_duel[1:] != hit_duel[:-1]
+            hit_duel, hit_owner = hit_duel[first], hit_owner[first]
+
+            self.ended[hit_duel] = True
+            self.impact_time[hit_duel] = hit_time[first]
+            p1_wins = hit_duel[hit_owner == 1]
+            p2_wins = hit_duel[hit_owner == 2]
+            self.winner[p1_wins] = 1
+            self.player2_state[p1_wins] = DEAD
+            self.shots_hit[p1_wins] += 1
+            self.winner[p2_wins] = 2
+            self.player1_state[p2_wins] = DEAD
+
+        # Remove balas fora da tela
+        gone = (x < 0) | (x > self.screen_width) | (y < 0) | (y > self.player_y + SPRITE_SIZE[1] * 2)
+        if gone.any():
+            pool.release(idx[gone])
+
+        # IA no modo arcade: só compara o relógio com o tiro agendado
+        live &= ~self.ended
+        self.ai_fired = self.ai_fired_early.copy()
+        self.ai_fired_early[:] = False
+        self._fire_ai(np.where(live, self.time, -np.inf), self.ai_fired)
+
+        # Volta para a pose parada depois do tiro
+        idle = live & (self.time - self.last_shot > SHOOT_POSE_MS)
+        self.player1_state[idle & (self.player1_state == SHOOT)] = IDLE
+        self.player2_state[idle & (self.player2_state == SHOOT)] = IDLE
+
+    def _fire_ai(self, until: np.ndarray, fired: np.ndarray):
+        """Resolve os tiros da IA agendados até until (por duelo); marca quem atirou em fired"""
+        due = (self.winner == 0) & (self.ai_fire_time <= until)
+        if not due.any():
+            return
+        # Bloqueada pela reação ao tiro do jogador: não atira agora
+        at = np.where(due, self.ai_fire_time, self.time)
+        reacted = (at - self.last_shot_time > self.reaction_time) | (at < self.last_shot_time)
+        fired |= self._fire(2, due & reacted, at)
+
+        # Atirou ou foi bloqueada: novo sorteio a partir do fim do bloqueio
+        # (a espera é exponencial, então recomeçar não muda a distribuição)
+        rows = np.nonzero(due)[0]
+        unblocked = np.maximum(self.last_shot[rows] + self.weapon["cooldown_ms"],
+                               self.last_shot_time[rows] + self.reaction_time[rows])
+        self.ai_fire_time[rows] = np.maximum(at[rows], unblocked) + self._ai_wait(rows)
+
+    def bullet_positions(self, i: int = 0, alpha: float = 1.0) -> list:
+        """Posições das balas do duelo i, interpoladas entre o passo anterior e o atual"""
+        pool = self.bullets
+        idx = np.nonzero(pool.active & (pool.duel == i))[0]
+        x = pool.prev_x[idx] + (pool.x[idx] - pool.prev_x[idx]) * alpha
+        y = pool.prev_y[idx] + (pool.y[idx] - pool.prev_y[idx]) * alpha
+        return list(zip(x.tolist(), y.tolist()))
+
+    def run(self, human_fire_ms: np.ndarray, max_ticks: int = 600) -> np.ndarray:
+        """Roda todos os duelos até o fim; o jogador 1 atira a partir de human_fire_ms"""
+        next_shot = self.duel_start + human_fire_ms
+        for _ in range(max_ticks):
+            # Tiros do jogador que caem no próximo passo entram no instante exato,
+            # antes da IA decidir; assim o resultado não depende de tick_ms
+            ready = (self.winner == 0) & (next_shot <= self.time + self.tick_ms)
+            if ready.any():
+                self.fire(1, ready, next_shot)
+                next_shot[ready] = self.last_shot[ready] + self.weapon["cooldown_ms"]
+            self.step()
+            if self.winner.all():
+                break
+        return self.winner.copy()
+
+
+def simulate_rounds(n: int, rounds=range(1, MAX_ROUNDS + 1), median_ms: float = 250,
+                    sigma: float = 0.25, seed=None, screen_width: float = 1920,
+                    table: DifficultyTable = None) -> dict:
+    """Taxa de vitória do jogador por rodada do arcade, com N duelos por rodada"""
+    rng = np.random.default_rng(seed)
+    engine = DuelEngine(n, screen_width=screen_width, max_bullets=4, seed=rng.integers(1 << 63), table=table)
+    win_rates = {}
+    for arcade_round in rounds:
+        engine.reset(arcade_round=arcade_round, arcade=True)
+        winners = engine.run(sample_human_reaction(rng, n, median_ms, sigma))
+        win_rates[arcade_round] = float(np.mean(winners == 1))
+    return win_rates
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    table = DifficultyTable.load(sys.argv[2]) if len(sys.argv) > 2 else None
+    start = time.perf_counter()
+    rates = simulate_rounds(n, seed=0, table=table)
+    elapsed = time.perf_counter() - start
+    for arcade_round, rate in rates.items():
+        print(f"Rodada {arcade_round:2d}: {rate * 100:5.1f}% de vitórias")
+    print(f"{n * len(rates) / elapsed:,.0f} duelos/s")
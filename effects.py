@@ -0,0 +1,242 @@
+import os
+import math
+import pygame
+import numpy as np
+from itertools import repeat
+from typing import List
+from budget import FrameBudget
+
+# Tipos de partícula
+FLASH, SMOKE, SPARK, BLOOD, DUST, TUMBLEWEED = range(6)
+
+# Por tipo: quadros pré-renderizados, vida (ms), gravidade (px/s²), amortecimento da
+# velocidade (fração que sobra por segundo), quique no chão, cor, raio inicial/final e
+# opacidade inicial/final. Os quadros vão do começo ao fim da vida (a bola de feno
+# usa os quadros como rotação).
+KINDS = {
+    FLASH: (3, 90, 0, 0.05, 0.0, (255, 230, 140), (16, 6), (255, 0)),
+    SMOKE: (6, 700, -60, 0.3, 0.0, (170, 160, 150), (8, 26), (150, 0)),
+    SPARK: (3, 320, 900, 0.4, 0.3, (255, 190, 60), (4, 2), (255, 60)),
+    BLOOD: (4, 550, 1200, 0.5, 0.0, (150, 10, 10), (6, 3), (230, 80)),
+    DUST: (5, 800, -20, 0.2, 0.0, (190, 150, 100), (10, 30), (140, 0)),
+    TUMBLEWEED: (8, 15000, 1400, 1.0, 0.55, (150, 110, 60), (32, 32), (255, 255))
+}
+
+# Níveis de qualidade: fração das partículas emitidas (a bola de feno some abaixo de "medium")
+QUALITY_TIERS = (("high", 1.0), ("medium", 0.5), ("low", 0.25), ("off", 0.0))
+TUMBLEWEED_EVERY_MS = 8000  # Intervalo médio entre bolas de feno no cenário
+DOWNGRADE_FRAMES = 30  # Frames acima do orçamento (média) antes de baixar a qualidade
+UPGRADE_FRAMES = 300  # Frames bem abaixo do orçamento antes de subir de novo
+
+
+def _particle_frames(kind: int) -> List[pygame.Surface]:
+    """Quadros pré-renderizados de um tipo (todos do mesmo tamanho, centrados)"""
+    frames, _, _, _, _, color, (r0, r1), (a0, a1) = KINDS[kind]
+    size = 2 * max(r0, r1) + 2
+    center = size // 2
+    surfaces = []
+    for i in range(frames):
+        surf = pygame.Surface((size, size), pygame.SRCALPHA)
+        if kind == TUMBLEWEED:
+            # Bola de feno: aro e galhos girando
+            angle = i * math.pi / frames
+            pygame.draw.circle(surf, color, (center, center), r0, 3)
+            for k in range(4):
+                a = angle + k * math.pi / 4
+                dx, dy = math.cos(a) * (r0 - 2), math.sin(a) * (r0 - 2)
+                pygame.draw.line(surf, color, (center - dx, center - dy), (center + dx, center + dy), 2)
+        else:
+            t = i / max(1, frames - 1)
+            radius = round(r0 + (r1 - r0) * t)
+            alpha = round(a0 + (a1 - a0) * t)
+            pygame.draw.circle(surf, (*color, alpha), (center, center), max(1, radius))
+        surfaces.append(surf.convert_alpha() if pygame.display.get_surface() else surf)
+    return surfaces
+
+
+class ParticleSystem:
+    """Partículas em pool de capacidade fixa (arrays NumPy), integradas em lote
+
+    Nada é alocado por partícula: emitir ocupa slots livres (como o BulletPool) e
+    os quadros de cada tipo são renderizados uma vez na criação. O desenho entra
+    no mesmo Surface.blits do Renderer. A qualidade cai sozinha quando o tempo de
+    trabalho do frame passa do orçamento e volta quando sobra folga.
+    """
+
+    def __init__(self, capacity: int = 512, ground_y: float = 972, width: float = 1920,
+                 budget_ms: float = 1000 / 60, tier: str = None, seed=None):
+        self.capacity = capacity
+        self.ground_y = ground_y
+        self.width = width
+        self.auto = tier is None  # Nível fixo (DUELO_EFFECTS) desliga o ajuste automático
+        self.budget = FrameBudget(budget_ms, len(QUALITY_TIERS), DOWNGRADE_FRAMES, UPGRADE_FRAMES,
+                                  [name for name, _ in QUALITY_TIERS].index(tier) if tier else 0)
+        self.rng = np.random.default_rng(seed)
+        self.ambient = False  # Bola de feno no cenário (telas de duelo)
+
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        self.age = np.zeros(capacity)
+        self.life = np.ones(capacity)
+        self.kind = np.zeros(capacity, dtype=np.int8)
+        self.active = np.zeros(capacity, dtype=bool)
+        self._free = np.arange(capacity - 1, -1, -1)
+        self._free_top = capacity
+
+        # Constantes por tipo em arrays (indexadas por self.kind)
+        order = sorted(KINDS)
+        self.gravity = np.array([KINDS[k][2] for k in order], dtype=np.float64)
+        self.drag = np.array([KINDS[k][3] for k in order], dtype=np.float64)
+        self.bounce = np.array([KINDS[k][4] for k in order], dtype=np.float64)
+        self.frames = np.array([KINDS[k][0] for k in order])
+
+        # Quadros de todos os tipos numa lista só: quadro = base[tipo] + fase
+        self.sprites: List[pygame.Surface] = []
+        self.base = np.zeros(len(order), dtype=np.int64)
+        self.half = np.zeros(len(order), dtype=np.int64)
+        for k in order:
+            self.base[k] = len(self.sprites)
+            frames = _particle_frames(k)
+            self.half[k] = frames[0].get_width() // 2
+            self.sprites.extend(frames)
+
+    @classmethod
+    def from_env(cls, **kwargs) -> "ParticleSystem":
+        """DUELO_EFFECTS=high|medium|low|off fixa o nível (padrão: automático)"""
+        tier = os.environ.get("DUELO_EFFECTS")
+        return cls(tier=tier if tier in dict(QUALITY_TIERS) else None, **kwargs)
+
+    def __len__(self) -> int:
+        return self.capacity - self._free_top
+
+    @property
+    def tier(self) -> int:
+        return self.budget.level
+
+    @property
+    def tier_name(self) -> str:
+        return QUALITY_TIERS[self.tier][0]
+
+    def emit(self, kind: int, x: float, y: float, count: int, speed: float, angle: float = 0.0,
+             spread: float = math.pi, life_jitter: float = 0.3) -> np.ndarray:
+        """Emite até count partículas (escalado pela qualidade) num leque em volta de angle; retorna os slots"""
+        scale = QUALITY_TIERS[self.tier][1]
+        n = math.ceil(count * scale) if scale else 0
+        k = min(n, self._free_top)
+        if not k:
+            return self._free[:0].copy()
+        idx = self._free[self._free_top - k:self._free_top].copy()  # A pilha livre é reescrita ao liberar
+        self._free_top -= k
+
+        rng = self.rng
+        theta = angle + rng.uniform(-spread, spread, k)
+        v = speed * rng.uniform(0.4, 1.0, k)
+        self.x[idx] = x
+        self.y[idx] = y
+        self.vx[idx] = np.cos(theta) * v
+        self.vy[idx] = np.sin(theta) * v
+        self.age[idx] = 0.0
+        self.life[idx] = KINDS[kind][1] * rng.uniform(1.0 - life_jitter, 1.0, k)
+        self.kind[idx] = kind
+        self.active[idx] = True
+        return idx
+
+    # --- Efeitos prontos ---
+    def muzzle(self, x: float, y: float, direction: int):
+        """Clarão e fumaça na boca do cano (direction: +1 para a direita, -1 para a esquerda)"""
+        angle = 0.0 if direction > 0 else math.pi
+        self.emit(FLASH, x, y, 3, 120, angle, 0.3, 0.0)
+        self.emit(SMOKE, x, y, 6, 90, angle, 0.6)
+
+    def impact(self, x: float, y: float, ground_y: float, direction: int):
+        """Sangue e faíscas no ponto do tiro, poeira no chão onde o pistoleiro cai"""
+        angle = 0.0 if direction > 0 else math.pi
+        self.emit(BLOOD, x, y, 18, 420, angle, 0.8)
+        self.emit(SPARK, x, y, 10, 600, angle, 1.2)
+        self.emit(DUST, x, ground_y, 10, 160, -math.pi / 2, 1.2)
+
+    def _ambient(self, dt_ms: float):
+        """Bola de feno de vez em quando (sorteio exponencial por frame)"""
+        if QUALITY_TIERS[self.tier][1] < 0.5 or (self.active & (self.kind == TUMBLEWEED)).any():
+            return
+        if self.rng.random() < dt_ms / TUMBLEWEED_EVERY_MS:
+            left = self.rng.random() < 0.5
+            r = KINDS[TUMBLEWEED][6][0]
+            x = -r if left else self.width + r
+            idx = self.emit(TUMBLEWEED, x, self.ground_y - r, 1, 1, 0.0, 0.0, 0.0)
+            if not idx.size:
+                return  # Sem slot livre (ou qualidade sem partículas)
+            self.vx[idx] = self.rng.uniform(150, 260) * (1 if left else -1)
+            self.vy[idx] = -self.rng.uniform(100, 300)
+
+    # --- Simulação e desenho ---
+    def update(self, dt_ms: float):
+        """Integra todas as partículas vivas em lote (vetorizado, em arrays fixos)"""
+        if self.ambient:
+            self._ambient(dt_ms)
+        if self._free_top == self.capacity:
+            return
+        dt = dt_ms / 1000
+        kind = self.kind
+        self.age += dt_ms
+
+        # Mortas por idade ou (bola de feno) fora da tela voltam para a pilha livre
+        dead = self.active & ((self.age >= self.life) | (self.x < -100) | (self.x > self.width + 100))
+        if dead.any():
+            idx = np.nonzero(dead)[0]
+            self.active[idx] = False
+            self._free[self._free_top:self._free_top + len(idx)] = idx
+            self._free_top += len(idx)
+
+        self.vy += self.gravity[kind] * dt
+        damp = self.drag[kind] ** dt
+        self.vx *= damp
+        self.vy *= damp
+        self.x += self.vx * dt
+        self.y += self.vy * dt
+
+        # Quique no chão (centro da partícula a um raio do chão)
+        floor = self.ground_y - self.half[kind]
+        landed = self.active & (self.y > floor) & (self.vy > 0) & (self.bounce[kind] > 0)
+        if landed.any():
+            self.y[landed] = floor[landed]
+            self.vy[landed] *= -self.bounce[kind[landed]]
+
+    def draw(self, renderer):
+        """Agenda as partículas vivas no Renderer (um Surface.blits junto com o resto do frame)"""
+        if self._free_top == self.capacity:
+            return
+        idx = np.nonzero(self.active)[0]
+        kind = self.kind[idx]
+        frames = self.frames[kind]
+        phase = np.minimum(frames - 1, (self.age[idx] * frames / self.life[idx]).astype(np.int64))
+        rolling = kind == TUMBLEWEED
+        if rolling.any():
+            # Rotação pela distância percorrida (meia volta entre quadros repetidos)
+            turn = self.x[idx][rolling] / (math.pi * KINDS[TUMBLEWEED][6][0])
+            phase[rolling] = (turn * frames[rolling]).astype(np.int64) % frames[rolling]
+
+        half = self.half[kind]
+        sprites = self.sprites
+        renderer.blits(zip(map(sprites.__getitem__, (self.base[kind] + phase).tolist()),
+                           zip((self.x[idx] - half).astype(np.int64).tolist(),
+                               (self.y[idx] - half).astype(np.int64).tolist()),
+                           repeat(None)))
+
+    def memory(self) -> int:
+        """Bytes dos quadros pré-renderizados e dos arrays do pool"""
+        arrays = (self.x, self.y, self.vx, self.vy, self.age, self.life, self.kind, self.active, self._free)
+        return (sum(surf.get_pitch() * surf.get_height() for surf in self.sprites) +
+                sum(a.nbytes for a in arrays))
+
+    def clear(self):
+        self.active[:] = False
+        self._free = np.arange(self.capacity - 1, -1, -1)
+        self._free_top = self.capacity
+
+    def note_frame(self, work_ms: float):
+        """Ajuste automático: média do tempo de trabalho do frame contra o orçamento"""
+        if self.auto:
+            self.budget.note(work_ms)
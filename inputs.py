@@ -0,0 +1,76 @@
+import time
+import pygame
+from collections import deque
+from typing import List, Tuple
+
+# Tipos de evento que o jogo trata; o SDL descarta o resto antes de chegar na fila
+# (movimento de mouse/dedo, texto, teclas soltas...), então a fila fica curta e o
+# pacer não acorda à toa em telas paradas. Os eventos de ida para segundo plano
+# passam para o Game gravar o snapshot do duelo.
+ALLOWED_EVENTS = (pygame.QUIT, pygame.KEYDOWN, pygame.FINGERDOWN, pygame.MOUSEBUTTONDOWN, pygame.WINDOWEXPOSED,
+                  pygame.APP_WILLENTERBACKGROUND, pygame.APP_TERMINATING, pygame.WINDOWFOCUSLOST,
+                  pygame.WINDOWMINIMIZED)
+MOUSE_TOUCH_ID = -1  # touch_id de toques que o SDL cria a partir do mouse
+
+
+def now_ms() -> float:
+    return time.perf_counter() * 1000
+
+
+class InputQueue:
+    """Fila de entrada filtrada, sem toques duplicados e com o instante de chegada de cada evento
+
+    pump() pode ser chamado durante a espera do frame (FramePacer) para carimbar cada
+    evento assim que ele chega; o Game converte esse instante para o relógio da
+    simulação e resolve o tiro no momento do toque, não no do frame. Um toque também
+    gera um MOUSEBUTTONDOWN sintético (event.touch) e o mouse pode gerar um
+    FINGERDOWN sintético: só o evento original é mantido.
+    """
+
+    def __init__(self, history: int = 60):
+        self.pending: List[Tuple[float, pygame.event.Event]] = []  # (chegada em ms, evento)
+        self.latency = deque(maxlen=history)  # Chegada do toque -> frame com o tiro na tela (ms)
+        self._shots: List[float] = []  # Chegada dos tiros já aplicados, esperando o present
+
+    def install(self):
+        """Deixa passar só os tipos de evento usados pelo jogo"""
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(ALLOWED_EVENTS)
+
+    def push(self, event: pygame.event.Event, stamp: float = None):
+        """Carimba e enfileira um evento (descarta as duplicatas de toque/mouse)"""
+        if event.type == pygame.MOUSEBUTTONDOWN and (getattr(event, "touch", False) or event.button != 1):
+            return  # Sintético de um toque ou outro botão/roda
+        if event.type == pygame.FINGERDOWN and getattr(event, "touch_id", 0) == MOUSE_TOUCH_ID:
+            return
+        self.pending.append((now_ms() if stamp is None else stamp, event))
+
+    def pump(self):
+        """Puxa o que chegou no SDL, carimbando com o instante atual"""
+        stamp = now_ms()
+        for event in pygame.event.get():
+            self.push(event, stamp)
+
+    def poll(self) -> List[Tuple[float, pygame.event.Event]]:
+        """Eventos pendentes, em ordem de chegada"""
+        self.pump()
+        events, self.pending = self.pending, []
+        return events
+
+    def shot_applied(self, stamp: float):
+        """Um tiro vindo da entrada entrou na simulação"""
+        if stamp is not None:
+            self._shots.append(stamp)
+
+    def frame_presented(self):
+        """Fecha a medição dos tiros que apareceram neste frame"""
+        if self._shots:
+            now = now_ms()
+            self.latency.extend(now - stamp for stamp in self._shots)
+            self._shots = []
+
+    def latency_stats(self) -> Tuple[float, float]:
+        """(média, máximo) da latência entrada -> tela dos últimos tiros, em ms"""
+        if not self.latency:
+            return 0.0, 0.0
+        return sum(self.latency) / len(self.latency), max(self.latency)
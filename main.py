@@ -1,30 +1,41 @@
 import os
+import math
+import numpy as np
 import pygame
-import random
-import json
 import sys
+import time
 from typing import Dict
 from datetime import datetime, timedelta
-
-# Inicialização
-pygame.init()
-pygame.mixer.init()
-
-# Configurações de tela (fullscreen para celular)
-SCREEN_INFO = pygame.display.Info()
-SCREEN_WIDTH, SCREEN_HEIGHT = SCREEN_INFO.current_w, SCREEN_INFO.current_h
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.FULLSCREEN | pygame.SCALED)
-pygame.display.set_caption("Duelo no Oeste: Showdown Extremo")
-clock = pygame.time.Clock()
-FPS = 60
-
-# Constantes
-ASSETS_DIR = "assets"
-SPRITE_SIZE = (200, 250)
-BULLET_SIZE = (30, 10)
-BASE_BULLET_SPEED = 25
-CHAO_Y = SCREEN_HEIGHT * 0.90  # 90% da tela
-MAX_ROUNDS = 10
+from text_cache import TextCache
+from renderer import Renderer, ResolutionScaler
+from persistence import AchievementStore
+from achievements import AchievementTracker, ACHIEVEMENTS, SHOT, DUEL_WON, ROUND_REACHED, PVP_MATCH_WON
+from stats import StatsStore
+from assets import AssetManager, surface_bytes
+from runtime import Runtime
+from profiler import FrameProfiler, profiled
+from pacing import FramePacer, IDLE, ACTIVE, DUEL
+from inputs import InputQueue, now_ms
+from effects import ParticleSystem
+from ui import UILayer, Button, Label
+from network import NetSession, RollbackDuel
+import snapshot
+from audio import AudioEngine
+from duel_engine import DuelEngine, DifficultyTable, POSES, IDLE as POSE_IDLE, DEAD, SPRITE_SIZE, MAX_ROUNDS, player_positions
+
+# Tela, relógio e subsistemas do SDL ficam no Runtime, criado em main()
+# (importar este módulo não inicializa nada)
+
+# Simulação em passo fixo (Runtime.tick_rate, padrão duel_engine.TICK_RATE), independente da renderização
+MAX_FRAME_MS = 250  # Evita espiral de atraso depois de travadas longas
+
+# Curva do arcade gerada pelo tuner.py (sem o arquivo, valem as fórmulas do duel_engine)
+DIFFICULTY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "difficulty.json")
+
+# Duelo salvo quando o app vai para segundo plano (retomado, pausado, na próxima abertura)
+SNAPSHOT_PATH = "duelo.snapshot"
+SUSPEND_EVENTS = (pygame.APP_WILLENTERBACKGROUND, pygame.APP_TERMINATING, pygame.WINDOWFOCUSLOST,
+                  pygame.WINDOWMINIMIZED)
 
 # Cores
 WHITE = (255, 255, 255)
@@ -35,116 +46,82 @@ GREEN = (50, 200, 50)
 BROWN = (139, 69, 19)
 BLACK_ALPHA = (0, 0, 0, 180)  # Preto com transparência
 
-class AssetManager:
-    @staticmethod
-    def load_assets() -> Dict[str, any]:
-        """Carrega todos os assets organizados por pastas"""
-        assets = {
-            # Imagens
-            "bg_menu": AssetManager._load_image("menu_bg.jpg", "backgrounds"),
-            "bg_game": AssetManager._load_image("game_bg.jpg", "backgrounds"),
-
-            # Sprites
-            "player1": {
-                "idle": AssetManager._load_image("cowboy_idle.png", "sprites"),
-                "shoot": AssetManager._load_image("cowboy_shoot.png", "sprites"),
-                "dead": AssetManager._load_image("cowboy_dead.png", "sprites")
-            },
-            "player2": {
-                "idle": AssetManager._load_image("enemy_idle.png", "sprites"),
-                "shoot": AssetManager._load_image("enemy_shoot.png", "sprites"),
-                "dead": AssetManager._load_image("enemy_dead.png", "sprites")
-            },
-
-            # Sons
-            "sounds": {
-                "shot": AssetManager._load_sound("shot.wav"),
-                "win": AssetManager._load_sound("win.wav"),
-                "lose": AssetManager._load_sound("lose.wav"),
-                "click": AssetManager._load_sound("click.wav"),
-                "achievement": AssetManager._load_sound("achievement.wav")
-            },
-            "music": {
-                "duel": AssetManager._load_music("duel.mp3"),
-                "achievements": AssetManager._load_music("achievements.mp3")
-            },
-
-            # UI
-            "bullet": AssetManager._load_image("bullet.png", "ui")
-        }
-        return assets
-
-    @staticmethod
-    def _load_image(filename: str, subfolder: str) -> pygame.Surface:
-        """Carrega imagem com fallback"""
-        try:
-            path = os.path.join(ASSETS_DIR, "images", subfolder, filename)
-            img = pygame.image.load(path).convert_alpha()
-            return pygame.transform.scale(img, (SPRITE_SIZE if subfolder == "sprites" 
-                                         else BULLET_SIZE if filename == "bullet.png"
-                                         else (SCREEN_WIDTH, SCREEN_HEIGHT)))
-        except:
-            surf = pygame.Surface((SPRITE_SIZE if subfolder == "sprites" 
-                                 else BULLET_SIZE if filename == "bullet.png"
-                                 else (SCREEN_WIDTH, SCREEN_HEIGHT)), pygame.SRCALPHA)
-            surf.fill(RED if "cowboy" in filename else BLUE if "enemy" in filename else WHITE)
-            return surf
-
-    @staticmethod
-    def _load_sound(filename: str) -> pygame.mixer.Sound:
-        """Carrega efeitos sonoros com fallback silencioso"""
-        try:
-            path = os.path.join(ASSETS_DIR, "sounds", filename)
-            sound = pygame.mixer.Sound(path)
-            sound.set_volume(0.7)
-            return sound
-        except:
-            return pygame.mixer.Sound(buffer=bytes([0]*1000))
-
-    @staticmethod
-    def _load_music(filename: str) -> str:
-        """Retorna caminho da música"""
-        path = os.path.join(ASSETS_DIR, "music", filename)
-        return path if os.path.exists(path) else ""
-
 class Game:
-    def __init__(self):
-        self.assets = AssetManager.load_assets()
+    def __init__(self, runtime: Runtime, seed=None):
+        self.runtime = runtime
+        self.width, self.height = runtime.size
+
+        # Assets: o menu aparece assim que o fundo dele fica pronto; o duelo carrega em paralelo
+        # (DUELO_LOW_MEMORY=1 / DUELO_MEMORY_MB: modo econômico e orçamento de memória)
+        self.assets = AssetManager.from_env(runtime.size, audio=runtime.wait_audio)
+        self.assets.request("menu")
+        self.assets.request("duel")
         self.font_large = pygame.font.Font(None, 72)
         self.font_medium = pygame.font.Font(None, 48)
         self.font_small = pygame.font.Font(None, 36)
+        self.text = TextCache()
+
+        # Profiler de fases do frame (DUELO_PROFILE=1 ou F3)
+        self.profiler = FrameProfiler.from_env()
+        self.profiler.watch("font_renders", lambda: self.text.misses + self.text.glyph_misses)
+
+        # Entrada filtrada e carimbada na chegada; o pacer puxa eventos durante a espera do duelo
+        self.input = InputQueue()
+        self.input.install()
+        self.shot_queue = []  # (instante no relógio da simulação, jogador, chegada do evento)
+        self.frame_wall = now_ms()
+
+        # Ritmo do loop: taxa cheia em movimento, quase parado em telas estáticas
+        self.pacer = FramePacer.from_env(runtime, self.input)
+
+        # Renderização: DUELO_DIRTY_RECTS=1 liga o modo de retângulos sujos (F2 alterna); a cena
+        # pode ser desenhada em resolução menor e ampliada (DUELO_RENDER_SCALE, padrão automático)
+        self.renderer = Renderer(runtime.screen, dirty_mode=os.environ.get("DUELO_DIRTY_RECTS") == "1",
+                                 scaler=ResolutionScaler.from_env(budget_ms=1000 / (self.pacer.fps or 60)))
+
+        # Relógio da simulação (ms), avança tick_ms a cada passo de lógica
+        # (DUELO_TICK_RATE < 60 alivia aparelhos fracos sem mudar as regras)
+        self.tick_ms = 1000 / runtime.tick_rate
+        self.sim_time = 0.0
+        self.accumulator = 0.0
+        self.render_alpha = 1.0
+
+        # Regras do duelo (mesmo motor usado nas simulações em lote)
+        self.difficulty = DifficultyTable.load(DIFFICULTY_PATH)
+        self.engine = DuelEngine(1, screen_width=self.width, ground_y=runtime.ground_y,
+                                 tick_ms=self.tick_ms, seed=seed, table=self.difficulty)
+
+        # PvP em rede (DUELO_NET): sessão aberta no primeiro PvP; o duelo local é previsto
+        # e refeito (rollback) quando chega um tiro atrasado do oponente
+        self.net = None
+        self.net_duel = 0
+        self.net_pending = []
+        self.rollback = RollbackDuel(self.engine)
 
         # Estado do jogo
         self.reset_game_state()
+        self.was_resumable = False  # Para apagar o snapshot quando o duelo deixa de poder ser retomado
         self.setup_controls()
+        self.bake_ui()
 
-        # Conquistas
-        self.achievements = {
-            "round_5": False,
-            "round_10": False,
-            "fast_winner": False,
-            "perfect_10": False,
-            "no_miss": False,
-            "first_blood": False,
-            "pvp_winner": False,
-            "daily_win": False,
-            "daily_5wins": False,
-            "daily_10shots": False
-        }
-
-        # Conquistas diárias
-        self.daily_achievements = {
-            "last_play_date": None,
-            "daily_wins": 0,
-            "daily_shots": 0
-        }
+        # Conquistas (regras declarativas em achievements.py, avaliadas por evento)
+        self.tracker = AchievementTracker()
 
+        # Gravação em segundo plano (nada de I/O de disco durante o frame)
+        self.store = AchievementStore("achievements.json")
         self.load_achievements()
         self.check_daily_reset()
 
-        # Música
-        self.music_volume = 0.5
-        self.current_music = ""
+        # Estatísticas por duelo (SQLite, gravadas em lote numa thread)
+        self.stats = StatsStore("stats.db")
+        self.stats.start()
+
+        # Áudio: grupos de canais e músicas decodificadas (não bloqueia enquanto o mixer abre)
+        self.audio = AudioEngine(self.assets, lambda: self.runtime.audio, music_volume=0.5)
+
+        # Partículas (clarão, fumaça, sangue, poeira, bola de feno) com qualidade automática
+        self.effects = ParticleSystem.from_env(ground_y=runtime.ground_y, width=self.width,
+                                               budget_ms=1000 / (self.pacer.fps or 60))
 
     def reset_game_state(self):
         """Reseta todo o estado do jogo"""
@@ -154,88 +131,147 @@ class Game:
         self.arcade_round = 1
         self.arcade_wins = 0
         self.pvp_score = [0, 0]  # [player1, player2]
+        self.paused = False  # Duelo congelado (app em segundo plano ou retomado de um snapshot)
         self.reset_duel_state()
 
     def reset_duel_state(self):
         """Reseta o estado do duelo atual"""
-        self.player1_state = "idle"
-        self.player2_state = "idle"
-        self.player1_pos = [SCREEN_WIDTH*0.2, CHAO_Y - SPRITE_SIZE[1]]
-        self.player2_pos = [SCREEN_WIDTH*0.8 - SPRITE_SIZE[0], CHAO_Y - SPRITE_SIZE[1]]
-        self.bullets = []
-        self.last_shot = 0
-        self.winner = None
-        self.duel_start_time = 0
-        self.shots_fired = 0
-        self.shots_hit = 0
-        self.last_shot_time = 0
+        engine = self.engine
+        if self.online:
+            engine.set_geometry(self.net.host_width)  # Mesma geometria nos dois aparelhos
+        else:
+            engine.set_geometry(self.width, self.runtime.ground_y)
+        engine.reset(arcade_round=self.arcade_round, arcade=self.game_mode == "arcade")
+        self.rollback.reset()
+        self.shot_queue = []
+
+        # Pistoleiros nas posições desta tela; balas e efeitos saem do motor e só são
+        # escalados ao desenhar (cano a cano, então a bala sai e chega no lugar certo)
+        player1_x, player2_x, player_y, bullet_y = player_positions(self.width, self.runtime.ground_y)
+        muzzle = engine.player1_x + SPRITE_SIZE[0]
+        self.field_scale = (player2_x - player1_x - SPRITE_SIZE[0]) / (engine.player2_x - muzzle)
+        self.field_offset = (player1_x + SPRITE_SIZE[0] - muzzle * self.field_scale, bullet_y - engine.bullet_y)
+        self.player1_pos = [player1_x, player_y]
+        self.player2_pos = [player2_x, player_y]
+        self.player1_prev_pos = list(self.player1_pos)
+        self.player2_prev_pos = list(self.player2_pos)
+
+    def to_screen(self, x: float, y: float) -> tuple:
+        """Coordenadas do motor -> tela (identidade fora do PvP em rede)"""
+        return self.field_offset[0] + x * self.field_scale, self.field_offset[1] + y
+
+    @property
+    def online(self) -> bool:
+        return self.net is not None and self.game_mode == "pvp"
+
+    @property
+    def local_player(self) -> int:
+        """Pistoleiro controlado neste aparelho (no PvP local, o 1 é a referência)"""
+        return self.net.player if self.online else 1
+
+    # Estado do duelo lido do motor
+    @property
+    def player1_state(self) -> str:
+        return POSES[self.engine.player1_state[0]]
+
+    @property
+    def player2_state(self) -> str:
+        return POSES[self.engine.player2_state[0]]
+
+    @property
+    def winner(self):
+        return int(self.engine.winner[0]) or None
+
+    @property
+    def shots_fired(self) -> int:
+        return int(self.engine.shots_fired[0])
+
+    @property
+    def shots_hit(self) -> int:
+        return int(self.engine.shots_hit[0])
+
+    @property
+    def duel_start_time(self) -> float:
+        return float(self.engine.duel_start[0])
 
     def setup_controls(self):
-        """Configura controles touch para celular"""
-        btn_width = SCREEN_WIDTH // 2.5
-        btn_height = SCREEN_HEIGHT // 8
+        """Layout dos controles touch: os mesmos retângulos servem para desenho e toque"""
+        btn_width = self.width // 2.5
+        btn_height = self.height // 8
         spacing = 20
 
         # Posiciona os botões verticalmente centralizados
-        start_y = SCREEN_HEIGHT // 3
+        start_y = self.height // 3
 
         self.controls = {
             # Menu - botões organizados com espaçamento
-            "arcade": pygame.Rect(SCREEN_WIDTH//2 - btn_width//2, start_y, btn_width, btn_height),
-            "pvp": pygame.Rect(SCREEN_WIDTH//2 - btn_width//2, start_y + btn_height + spacing, btn_width, btn_height),
-            "achievements": pygame.Rect(SCREEN_WIDTH//2 - btn_width//2, start_y + 2*(btn_height + spacing), btn_width, btn_height),
+            "arcade": pygame.Rect(self.width//2 - btn_width//2, start_y, btn_width, btn_height),
+            "pvp": pygame.Rect(self.width//2 - btn_width//2, start_y + btn_height + spacing, btn_width, btn_height),
+            "achievements": pygame.Rect(self.width//2 - btn_width//2, start_y + 2*(btn_height + spacing), btn_width, btn_height),
+            "stats": pygame.Rect(self.width//2 - btn_width//2, start_y + 3*(btn_height + spacing), btn_width, btn_height),
 
             # Duelo
-            "shoot_left": pygame.Rect(0, SCREEN_HEIGHT-btn_height, btn_width, btn_height),
-            "shoot_right": pygame.Rect(SCREEN_WIDTH-btn_width, SCREEN_HEIGHT-btn_height, btn_width, btn_height)
+            "shoot_left": pygame.Rect(0, self.height-btn_height, btn_width, btn_height),
+            "shoot_right": pygame.Rect(self.width-btn_width, self.height-btn_height, btn_width, btn_height)
         }
 
-    def check_daily_reset(self):
-        """Verifica se precisa resetar as conquistas diárias"""
-        today = datetime.now().date()
-        last_play = self.daily_achievements.get("last_play_date")
-
-        if last_play:
-            try:
-                last_play_date = datetime.strptime(last_play, "%Y-%m-%d").date()
-                if last_play_date < today:
-                    self.reset_daily_achievements()
-            except:
-                self.reset_daily_achievements()
+    def bake_ui(self):
+        """Pré-renderiza overlays e botões uma única vez"""
+        # Fundo escurecido (resultado e conquistas); no modo econômico, 8 bits com alpha
+        # da superfície inteira (1 byte por pixel em vez de 4, mesmo resultado no blit)
+        if self.assets.low_memory:
+            self.overlay = pygame.Surface((self.width, self.height), 0, 8)
+            self.overlay.set_palette([BLACK_ALPHA[:3]] * 256)
+            self.overlay.set_alpha(BLACK_ALPHA[3])
         else:
-            self.reset_daily_achievements()
-
-        self.daily_achievements["last_play_date"] = today.strftime("%Y-%m-%d")
+            self.overlay = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+            self.overlay.fill(BLACK_ALPHA)
+
+        # Menu: título e botões coloridos (widgets retidos, re-renderizados só ao mudar de estado)
+        controls = self.controls
+        self.menu_ui = UILayer()
+        self.menu_ui.add(Label("title", pygame.Rect(0, 100, self.width, self.font_large.get_height()),
+                               "DUELO NO OESTE", self.font_large, GOLD))
+        for name, label, color, action in (("arcade", "Arcade (IMPOSSÍVEL)", GREEN, self.start_arcade_mode),
+                                           ("pvp", "PvP (2 jogadores)", BLUE, self.start_pvp_mode),
+                                           ("achievements", "Conquistas", GOLD, self.show_achievements),
+                                           ("stats", "Estatísticas", BROWN, self.show_stats)):
+            self.menu_ui.add(Button(name, controls[name], label, self.font_medium, color, action))
+
+        # Duelo: botões de tiro semi-transparentes (recebem o instante do toque)
+        self.duel_ui = UILayer()
+        self.duel_ui.add(Button("shoot_left", controls["shoot_left"], "ATIRAR", self.font_small, (0, 0, 0, 150),
+                                lambda stamp: self.fire_shot(1, stamp), style="overlay"))
+        self.duel_ui.add(Button("shoot_right", controls["shoot_right"], "ATIRAR", self.font_small, (0, 0, 0, 150),
+                                lambda stamp: self.fire_shot(2, stamp), style="overlay"))
+
+        # Ícones das conquistas (desbloqueada / bloqueada)
+        self.achievement_icons = {}
+        for color in (GREEN, RED):
+            icon = pygame.Surface((30, 30), pygame.SRCALPHA)
+            pygame.draw.circle(icon, color, (15, 15), 15)
+            self.achievement_icons[color] = icon
 
-    def reset_daily_achievements(self):
-        """Reseta as conquistas diárias"""
-        self.daily_achievements["daily_wins"] = 0
-        self.daily_achievements["daily_shots"] = 0
-        self.achievements["daily_win"] = False
-        self.achievements["daily_5wins"] = False
-        self.achievements["daily_10shots"] = False
-        self.save_achievements()
+    def check_daily_reset(self):
+        """Virada do dia: zera contadores e conquistas diárias (evento DAY_ROLLOVER)"""
+        today = datetime.now().strftime("%Y-%m-%d")
+        if self.tracker.last_play_date != today:
+            for key in self.tracker.roll_day(today):
+                self.unlock_achievement(key)
+            self.save_achievements()
 
     # --- Sistema de Áudio ---
     def play_music(self, track: str):
-        """Toca uma música específica"""
-        if track in self.assets["music"] and self.assets["music"][track]:
-            if self.current_music != track:
-                pygame.mixer.music.stop()
-                pygame.mixer.music.load(self.assets["music"][track])
-                pygame.mixer.music.set_volume(self.music_volume)
-                pygame.mixer.music.play(-1)
-                self.current_music = track
+        """Toca uma música específica (crossfade, sem travar o loop)"""
+        self.audio.play_music(track)
 
     def stop_music(self):
         """Para a música atual"""
-        pygame.mixer.music.stop()
-        self.current_music = ""
+        self.audio.stop_music()
 
     def play_sound(self, sound: str):
-        """Toca um efeito sonoro"""
-        if sound in self.assets["sounds"]:
-            self.assets["sounds"][sound].play()
+        """Toca um efeito sonoro no grupo de canais dele"""
+        self.audio.play(sound)
 
     # --- Lógica do Jogo ---
     def start_arcade_mode(self):
@@ -248,67 +284,251 @@ class Game:
         """Inicia o modo Player vs Player"""
         self.reset_game_state()
         self.game_mode = "pvp"
+        if self.net is None:
+            self.net = NetSession.from_env()
+        if self.net is not None:
+            # Em rede, o host marca o início de cada duelo quando os dois estão prontos
+            self.net.poll()  # Descarta o que chegou depois de uma espera cancelada
+            self.net_duel = 0
+            self.net.ready(self.net_duel)
+            self.game_state = "waiting"
+            return
         self.start_duel()
 
+    def cancel_waiting(self):
+        """Sai da espera pelo host: cancela o READY e deixa o modo online (START atrasado é ignorado)"""
+        self.net.cancel()
+        self.game_mode = None
+        self.game_state = "menu"
+
     def start_duel(self):
         """Inicia um novo duelo"""
+        self.assets.wait("duel")
+        self.check_daily_reset()  # Jogo aberto de um dia para o outro
         self.reset_duel_state()
+        self.enable_shoot_buttons()
         self.game_state = "countdown"
         self.countdown = 3
-        self.countdown_start = pygame.time.get_ticks()
+        self.countdown_start = self.sim_time
         self.play_music("duel")
         self.play_sound("click")
 
-    def calculate_difficulty(self) -> float:
-        """Retorna multiplicador de dificuldade (1.0 a 10.0) - extremamente difícil"""
-        if self.game_mode == "arcade":
-            # Aumenta a dificuldade exponencialmente
-            return min(10.0, 1.0 + (self.arcade_round * 0.9))
-        return 1.0
-
-    def calculate_ai_reaction_time(self) -> int:
-        """Tempo de reação da IA em ms (extremamente rápido conforme as rodadas)"""
-        if self.game_mode == "arcade":
-            # No round 1: 400ms, round 5: 200ms, round 10: 100ms (quase impossível)
-            return max(100, 500 - (self.arcade_round * 40))
-        return 1000
-
-    def fire_shot(self, player: int):
-        """Dispara um tiro com cooldown"""
-        now = pygame.time.get_ticks()
-        if now - self.last_shot < 300:  # Cooldown de 300ms
+    def enable_shoot_buttons(self):
+        """Só o pistoleiro controlado neste aparelho tem botão ativo (não a IA nem o oponente da rede)"""
+        for player, name in ((1, "shoot_left"), (2, "shoot_right")):
+            self.duel_ui[name].set_enabled(self.game_mode == "pvp" and not self.online or
+                                           player == self.local_player)
+
+    # --- Suspender e retomar ---
+    @property
+    def resumable(self) -> bool:
+        """Duelo local em andamento (o PvP em rede não tem como ser retomado)"""
+        return self.game_state in snapshot.STATES and not self.online
+
+    def suspend(self):
+        """App indo para segundo plano: congela o duelo e grava o snapshot (ou apaga o antigo)"""
+        if not self.resumable:
+            snapshot.clear(SNAPSHOT_PATH)
             return
+        if not self.paused:
+            self.paused = True
+            self.shot_queue = []
+            self.stop_music()
+        self.save_snapshot()
 
-        self.last_shot = now
-        self.shots_fired += 1
-        self.daily_achievements["daily_shots"] += 1
-        self.check_daily_achievements()
+    def save_snapshot(self):
+        """Grava o estado do duelo (binário compacto, poucos ms)"""
+        fields = {name: getattr(self, name) for name in ("game_mode", "game_state", "arcade_score", "arcade_round",
+                                                         "arcade_wins", "pvp_score", "countdown", "sim_time",
+                                                         "countdown_start")}
+        try:
+            snapshot.write(SNAPSHOT_PATH, snapshot.pack(fields, self.engine))
+        except OSError:
+            pass  # Sem snapshot o jogo só não é retomado
+
+    def restore_snapshot(self) -> bool:
+        """Na abertura: volta para o duelo salvo, pausado até o próximo toque
+
+        Os relógios do duelo (motor, contagem) são todos do relógio da simulação, que
+        volta junto: nada depende de pygame.time.get_ticks do processo anterior.
+        """
+        data = snapshot.take(SNAPSHOT_PATH)
+        fields = snapshot.unpack(data, self.engine) if data else None
+        if fields is None:
+            return False
+        for name, value in fields.items():
+            setattr(self, name, value)
+        self.accumulator = 0.0
+        self.rollback.reset()
+        self.shot_queue = []
+        self.player1_prev_pos[:] = self.player1_pos
+        self.player2_prev_pos[:] = self.player2_pos
+        self.enable_shoot_buttons()
+        self.paused = True
+        self.assets.request("duel")
+        return True
 
-        speed = BASE_BULLET_SPEED * self.calculate_difficulty()
+    def resume(self):
+        """Toque depois da pausa: o duelo continua de onde parou"""
+        self.paused = False
+        self.pacer.note_input()
+        snapshot.clear(SNAPSHOT_PATH)  # Retomado: o snapshot ficaria velho ao primeiro passo
+        if self.game_state != "result":
+            self.play_music("duel")
 
+    def calculate_difficulty(self) -> float:
+        """Multiplicador de dificuldade da rodada (consulta na tabela do tuner)"""
+        return self.difficulty.lookup(self.arcade_round, self.game_mode == "arcade")[0]
+
+    def calculate_ai_reaction_time(self) -> float:
+        """Tempo de reação da IA em ms (consulta na tabela do tuner)"""
+        return self.difficulty.lookup(self.arcade_round, self.game_mode == "arcade")[1]
+
+    def fire_shot(self, player: int, stamp: float = None):
+        """Agenda um tiro no instante de chegada da entrada (stamp, ms de inputs.now_ms)
+
+        O instante vira tempo da simulação e o tiro entra no passo que o contém
+        (apply_shots), com a posição exata dentro do passo. Sem stamp, vale agora.
+        """
+        age = max(0.0, self.frame_wall - stamp) if stamp is not None else 0.0
+        self.shot_queue.append((self.sim_time + self.accumulator - age, player, stamp))
+
+    def apply_shots(self, step_start: float):
+        """Dispara os tiros agendados até o fim deste passo (antes do motor avançar)"""
+        due = [shot for shot in self.shot_queue if shot[0] <= self.sim_time]
+        if not due:
+            return
+        self.shot_queue = [shot for shot in self.shot_queue if shot[0] > self.sim_time]
+        if self.game_state != "duel":
+            return  # Antes do ATIRE! (ou depois do fim) o tiro não conta
+
+        for t, player, stamp in due:
+            offset = t - step_start  # Posição dentro do passo (negativa: chegou atrasado)
+            if self.online:
+                # Cada aparelho controla só o seu pistoleiro; o tiro vai com o instante do duelo
+                at = max(0.0, self.rollback.now() + offset)
+                fired = self.rollback.fire(self.net.player, at)
+                if fired:
+                    self.net.send_shot(self.net_duel, at)
+            else:
+                engine = self.engine
+                at = max(engine.time[0] + offset, engine.duel_start[0])
+                fired = engine.fire(player, at=np.full(engine.n, at))[0]
+            if fired:
+                self.input.shot_applied(stamp)
+                self.on_shot_fired(self.net.player if self.online else player)
+
+    def on_shot_fired(self, player: int):
+        """Efeitos de um tiro disparado (contadores diários, som e clarão no cano)"""
+        self.achievement_event(SHOT)
+        self.play_sound("shot")
+        engine = self.engine
         if player == 1:
-            self.bullets.append({
-                "x": self.player1_pos[0] + SPRITE_SIZE[0],
-                "y": self.player1_pos[1] + SPRITE_SIZE[1]//2,
-                "speed": speed,
-                "player": 1
-            })
-            self.player1_state = "shoot"
-            self.last_shot_time = now
+            self.effects.muzzle(*self.to_screen(engine.player1_x + SPRITE_SIZE[0], engine.bullet_y), 1)
         else:
-            self.bullets.append({
-                "x": self.player2_pos[0],
-                "y": self.player2_pos[1] + SPRITE_SIZE[1]//2,
-                "speed": -speed,
-                "player": 2
-            })
-            self.player2_state = "shoot"
+            self.effects.muzzle(*self.to_screen(engine.player2_x, engine.bullet_y), -1)
+
+    def on_hit(self, winner: int):
+        """Sangue, faíscas e poeira no pistoleiro atingido"""
+        engine = self.engine
+        ground = self.runtime.ground_y
+        if winner == 1:
+            self.effects.impact(*self.to_screen(engine.player2_x, engine.bullet_y), ground, 1)
+        elif winner == 2:
+            self.effects.impact(*self.to_screen(engine.player1_x + SPRITE_SIZE[0], engine.bullet_y), ground, -1)
+
+    def step_frame(self, frame_ms: float) -> bool:
+        """Processa um frame: eventos, quantos passos fixos couberem e renderização"""
+        frame_ms = min(frame_ms, MAX_FRAME_MS)
+        self.accumulator += frame_ms
+        self.frame_wall = now_ms()  # Instante real equivalente a sim_time + accumulator
+        self.audio.update()
+        (self.menu_ui if self.game_state == "menu" else self.duel_ui).update(self.frame_wall)
+        if self.assets.screen != self.asset_screen:
+            self.enter_screen()
+
+        prof = self.profiler
+        running = prof.call("handle_events", self.handle_events)
+        prof.call("update", self.run_ticks)
+        resumable = self.resumable
+        if self.was_resumable and not resumable:
+            snapshot.clear(SNAPSHOT_PATH)  # Saiu da contagem/duelo/resultado: nada a retomar
+        self.was_resumable = resumable
+        self.effects.ambient = self.game_state in ("countdown", "duel", "result")
+        if not self.paused:
+            self.effects.update(frame_ms)  # Partículas congelam junto com o duelo
+        prof.call("draw", self.compose_frame, self.accumulator / self.tick_ms)
+        prof.call("present", self.renderer.present)
+        self.input.frame_presented()
+        work = now_ms() - self.frame_wall  # Trabalho do frame, sem a espera
+        self.effects.note_frame(work)
+        self.renderer.note_frame(work)
+        return running
+
+    @property
+    def asset_screen(self) -> str:
+        """Tela do AssetManager usada pelo estado atual"""
+        if self.game_state == "menu":
+            return "menu"
+        if self.game_state in ("achievements", "stats"):
+            return "achievements"
+        return "duel"
+
+    def enter_screen(self):
+        """Mudou de tela: o AssetManager descarrega o que sobrou e aplica o orçamento"""
+        game = self.memory_report()["game"]
+        self.assets.reserved_bytes = sum(game.values())
+        self.assets.enter(self.asset_screen)
+
+    def memory_report(self) -> Dict[str, Dict[str, int]]:
+        """Bytes mantidos por asset ("assets") e pelas superfícies do próprio jogo ("game")"""
+        game = {
+            "screen": surface_bytes(self.runtime.screen),
+            "overlay": surface_bytes(self.overlay),
+            "ui": self.menu_ui.memory() + self.duel_ui.memory() +
+                  sum(surface_bytes(icon) for icon in self.achievement_icons.values()),
+            "text": self.text.memory(),
+            "particles": self.effects.memory(),
+            "profiler": surface_bytes(self.profiler.graph),
+            "render": self.renderer.memory()
+        }
+        return {"assets": self.assets.memory(), "game": game}
 
-        self.play_sound("shot")
+    def frame_mode(self) -> str:
+        """Modo de ritmo do próximo frame (ver pacing.FramePacer)"""
+        if self.paused:
+            return IDLE
+        if self.game_state == "duel":
+            return DUEL
+        if self.game_state in ("countdown", "waiting") or self.profiler.enabled:
+            return ACTIVE
+        if self.game_state == "result" and (len(self.engine.bullets) or len(self.effects)):
+            return ACTIVE  # Balas ainda saindo da tela ou partículas vivas
+        return IDLE
+
+    def run_ticks(self):
+        """Roda quantos passos fixos couberem no tempo acumulado"""
+        if self.paused:
+            self.accumulator = 0.0  # Tempo em pausa não entra na simulação
+            return
+        while self.accumulator >= self.tick_ms:
+            self.update()
+            self.accumulator -= self.tick_ms
 
     def update(self):
-        """Atualiza a lógica do jogo"""
-        now = pygame.time.get_ticks()
+        """Avança a lógica do jogo em um passo fixo (tick_ms)"""
+        self.sim_time += self.tick_ms
+        now = self.sim_time
+        if self.online:
+            self.handle_net_events()
+
+        # Guarda posições do passo anterior para interpolar na renderização
+        self.player1_prev_pos[:] = self.player1_pos
+        self.player2_prev_pos[:] = self.player2_pos
+
+        # Tiros da entrada que caem neste passo (antes do motor avançar)
+        if self.shot_queue:
+            self.apply_shots(now - self.tick_ms)
 
         # Contagem regressiva
         if self.game_state == "countdown":
@@ -317,74 +537,103 @@ class Game:
 
             if elapsed >= 3000:
                 self.game_state = "duel"
-                self.duel_start_time = now
                 self.play_sound("click")
 
-        # Durante o duelo
+        # Durante o duelo: balas, colisões, IA e poses ficam no motor
+        elif self.game_state == "duel" and self.online:
+            # Fim previsto fica na tela; placar só com o resultado do host (end_net_duel)
+            self.rollback.step()
+
         elif self.game_state == "duel":
-            # Atualiza balas
-            for bullet in self.bullets[:]:
-                bullet["x"] += bullet["speed"]
-
-                # Verifica colisões
-                if bullet["player"] == 1 and bullet["x"] > self.player2_pos[0]:
-                    self.player2_state = "dead"
-                    self.winner = 1
-                    self.shots_hit += 1
-                    self.end_duel()
-                elif bullet["player"] == 2 and bullet["x"] < self.player1_pos[0] + SPRITE_SIZE[0]:
-                    self.player1_state = "dead"
-                    self.winner = 2
-                    self.end_duel()
-
-                # Remove balas fora da tela
-                if bullet["x"] < 0 or bullet["x"] > SCREEN_WIDTH:
-                    self.bullets.remove(bullet)
-
-            # IA no modo arcade - extremamente rápida
-            if self.game_mode == "arcade":
-                reaction_time = self.calculate_ai_reaction_time()
-                if (now - self.duel_start_time > 100 and  # Espera mínimo de 300ms
-                    now - self.last_shot_time > reaction_time and  # Tempo de reação ultra rápido
-                    random.random() < 0.03 * self.calculate_difficulty()):  # Alta chance de atirar
-                    self.fire_shot(2)
-
-            # Reseta animação de tiro
-            if now - self.last_shot > 200:
-                if self.player1_state != "dead":
-                    self.player1_state = "idle"
-                if self.player2_state != "dead":
-                    self.player2_state = "idle"
+            self.engine.step()
+            if self.engine.ai_fired[0]:
+                self.on_shot_fired(2)
+            if self.engine.ended[0]:
+                self.end_duel()
 
         # Durante o resultado
         elif self.game_state == "result":
             # Atualiza balas para continuar animação
-            for bullet in self.bullets[:]:
-                bullet["x"] += bullet["speed"]
-                if bullet["x"] < 0 or bullet["x"] > SCREEN_WIDTH:
-                    self.bullets.remove(bullet)
+            self.engine.step()
 
     def end_duel(self):
         """Finaliza o duelo atual"""
         self.game_state = "result"
+        self.record_duel()
+        self.on_hit(self.winner)
 
         if self.winner == 1:
             self.play_sound("win")
-            self.daily_achievements["daily_wins"] += 1
-            self.check_daily_achievements()
+            self.on_duel_won()
 
             if self.game_mode == "arcade":
                 self.arcade_wins += 1
-                self.check_achievements()
+                self.achievement_event(ROUND_REACHED, round=self.arcade_round, wins=self.arcade_wins)
             elif self.game_mode == "pvp":
                 self.pvp_score[0] += 1
                 if self.pvp_score[0] >= 5:  # Melhor de 5
-                    self.unlock_achievement("pvp_winner")
+                    self.achievement_event(PVP_MATCH_WON)
         else:
             self.play_sound("lose")
             if self.game_mode == "pvp":
                 self.pvp_score[1] += 1
 
+    def handle_net_events(self):
+        """Aplica o que chegou do host: início sincronizado, tiros do oponente e resultado"""
+        for event in self.net.poll():
+            kind = event[0]
+            if kind == "welcome":
+                self.enable_shoot_buttons()  # Agora se sabe qual pistoleiro é o local
+            elif kind == "start" and self.game_state == "waiting":
+                _, self.net_duel, local_start = event
+                self.net_pending = []
+                self.start_duel()
+                # A contagem termina no mesmo instante nos dois aparelhos
+                self.countdown_start = self.sim_time + (local_start - self.net.local_clock()) - 3000
+            elif kind == "shot" and event[1] == self.net_duel:
+                self.net_pending.append((event[2], event[3]))
+            elif kind == "result":
+                self.end_net_duel(*event[1:])
+
+        # Tiros do oponente esperam o ATIRE! local; no passado, o duelo é refeito
+        if self.net_pending and self.game_state == "duel":
+            for player, at in self.net_pending:
+                if self.rollback.fire(player, at):
+                    self.on_shot_fired(player)
+            self.net_pending = []
+
+    def end_net_duel(self, duel_no: int, winner: int, impact_ms: float, score1: int, score2: int):
+        """Resultado oficial do host (corrige a previsão local se ela errou)"""
+        if duel_no != self.net_duel or self.game_state not in ("countdown", "duel"):
+            return
+        engine = self.engine
+        if engine.winner[0] != winner:
+            engine.winner[0] = winner
+            engine.impact_time[0] = engine.duel_start[0] + impact_ms
+            engine.player1_state[0] = DEAD if winner == 2 else POSE_IDLE
+            engine.player2_state[0] = DEAD if winner == 1 else POSE_IDLE
+
+        self.game_state = "result"
+        self.pvp_score = [score1, score2]
+        self.record_duel()
+        self.on_hit(winner)
+        local = self.local_player
+        if winner == local:
+            self.play_sound("win")
+            self.on_duel_won()
+            if self.pvp_score[local - 1] >= 5:  # Melhor de 5
+                self.achievement_event(PVP_MATCH_WON)
+        else:
+            self.play_sound("lose")
+
+    def record_duel(self):
+        """Envia o duelo para as estatísticas (gravação em lote fora do frame)"""
+        engine, local = self.engine, self.local_player
+        reaction = float((engine.first_shot1 if local == 1 else engine.first_shot2)[0])
+        self.stats.record("online" if self.online else self.game_mode, self.arcade_round, self.winner or 0,
+                          self.winner == local, None if math.isnan(reaction) else reaction,
+                          float(engine.impact_time[0] - engine.duel_start[0]), self.shots_fired, self.shots_hit)
+
     def handle_round_transition(self):
         """Gerencia transição entre rodadas"""
         if self.game_mode == "arcade":
@@ -398,133 +647,171 @@ class Game:
             else:
                 self.start_duel()
         elif self.game_mode == "pvp":
-            if max(self.pvp_score) < 5:  # Melhor de 5
+            if max(self.pvp_score) < 5 and self.online:
+                self.net_duel += 1
+                self.net.ready(self.net_duel)
+                self.game_state = "waiting"
+            elif max(self.pvp_score) < 5:  # Melhor de 5
                 self.start_duel()
             else:
                 self.stop_music()
                 self.game_state = "menu"
 
     # --- Sistema de Conquistas ---
-    def check_achievements(self):
-        """Verifica conquistas ao vencer"""
-        # Conquistas de progresso
-        if self.arcade_round >= 5 and not self.achievements["round_5"]:
-            self.unlock_achievement("round_5")
-
-        if self.arcade_round >= 10 and not self.achievements["round_10"]:
-            self.unlock_achievement("round_10")
-
-        if self.arcade_wins >= 10 and not self.achievements["perfect_10"]:
-            self.unlock_achievement("perfect_10")
-
-        # Conquistas de habilidade
-        duel_time = pygame.time.get_ticks() - self.duel_start_time
-        if duel_time < 1000 and self.winner == 1 and not self.achievements["fast_winner"]:
-            self.unlock_achievement("fast_winner")
-
-        if self.shots_hit == self.shots_fired and self.shots_fired > 0 and self.winner == 1 and not self.achievements["no_miss"]:
-            self.unlock_achievement("no_miss")
-
-        if self.arcade_wins == 1 and not self.achievements["first_blood"]:
-            self.unlock_achievement("first_blood")
-
-    def check_daily_achievements(self):
-        """Verifica conquistas diárias"""
-        if self.daily_achievements["daily_wins"] >= 1 and not self.achievements["daily_win"]:
-            self.unlock_achievement("daily_win")
-
-        if self.daily_achievements["daily_wins"] >= 5 and not self.achievements["daily_5wins"]:
-            self.unlock_achievement("daily_5wins")
-
-        if self.daily_achievements["daily_shots"] >= 10 and not self.achievements["daily_10shots"]:
-            self.unlock_achievement("daily_10shots")
+    def on_duel_won(self):
+        """Vitória do jogador local: avalia só as conquistas que assinam DUEL_WON"""
+        self.achievement_event(DUEL_WON, mode=self.game_mode,
+                               duel_ms=float(self.engine.impact_time[0] - self.duel_start_time),
+                               shots_fired=self.shots_fired, shots_hit=self.shots_hit)
+
+    def achievement_event(self, event: str, **ctx):
+        """Envia um evento ao rastreador de conquistas e agenda a gravação"""
+        for key in self.tracker.emit(event, **ctx):
+            self.unlock_achievement(key)
+        self.save_achievements()
 
     def unlock_achievement(self, name: str):
-        """Desbloqueia uma conquista com efeitos"""
-        if name in self.achievements and not self.achievements[name]:
-            self.achievements[name] = True
-            self.save_achievements()
-            self.play_sound("achievement")
+        """Efeitos de um desbloqueio (o rastreador já marcou a conquista)"""
+        self.store.append("achievements", name, True)  # Diário: nenhum desbloqueio se perde
+        self.play_sound("achievement")
 
     def load_achievements(self):
         """Carrega conquistas salvas"""
-        try:
-            with open("achievements.json", "r") as f:
-                data = json.load(f)
-                self.achievements = data.get("achievements", self.achievements)
-                self.daily_achievements = data.get("daily_achievements", self.daily_achievements)
-        except:
+        data = self.store.load()
+        self.tracker.load(data)
+        if not data:
             self.save_achievements()
 
     def save_achievements(self):
-        """Salva conquistas em arquivo"""
-        with open("achievements.json", "w") as f:
-            json.dump({
-                "achievements": self.achievements,
-                "daily_achievements": self.daily_achievements
-            }, f)
+        """Agenda gravação das conquistas (feita pela thread do AchievementStore)"""
+        self.store.save(self.tracker.state())
+
+    def shutdown(self):
+        """Grava o que estiver pendente antes de sair"""
+        self.store.close()
+        self.stats.close()
+        self.assets.shutdown()
+        self.profiler.shutdown()
+        if self.net is not None:
+            self.net.close()
+        if not self.paused:
+            snapshot.clear(SNAPSHOT_PATH)  # Só o duelo suspenso volta na próxima abertura
 
     def show_achievements(self):
         """Mostra tela de conquistas"""
+        self.assets.wait("achievements")
         self.game_state = "achievements"
         self.play_music("achievements")
 
+    def show_stats(self):
+        """Mostra tela de estatísticas"""
+        self.assets.wait("achievements")
+        self.game_state = "stats"
+
     # --- Renderização ---
-    def draw(self):
-        """Renderiza todos os elementos"""
+    def draw(self, alpha: float = 1.0):
+        """Renderiza todos os elementos e apresenta o frame"""
+        self.compose_frame(alpha)
+        self.renderer.present()
+
+    def compose_frame(self, alpha: float = 1.0):
+        """Monta a lista de blits do frame (alpha = fração do passo atual para interpolar)"""
+        self.render_alpha = alpha
+
         # Fundo
         if self.game_state == "menu":
-            screen.blit(self.assets["bg_menu"], (0, 0))
+            self.renderer.begin(self.assets["bg_menu"])
+            self.renderer.begin_hud()
             self.draw_menu()
         elif self.game_state == "achievements":
-            screen.blit(self.assets["bg_game"], (0, 0))
+            self.renderer.begin(self.assets["bg_game"])
             self.draw_achievements()
+        elif self.game_state == "stats":
+            self.renderer.begin(self.assets["bg_game"])
+            self.draw_stats()
         else:
-            screen.blit(self.assets["bg_game"], (0, 0))
+            self.renderer.begin(self.assets["bg_game"])
             self.draw_game_elements()
 
-        pygame.display.flip()
-
+        if self.profiler.enabled:
+            self.draw_profiler()
+
+    def lerp_pos(self, prev, pos):
+        """Posição interpolada entre o passo anterior e o atual"""
+        a = self.render_alpha
+        return (prev[0] + (pos[0] - prev[0]) * a, prev[1] + (pos[1] - prev[1]) * a)
+
+    def draw_text(self, font: pygame.font.Font, text: str, color, pos) -> pygame.Surface:
+        """Desenha texto usando o cache (sem rasterizar de novo)"""
+        surf = self.text.render(font, text, color)
+        self.renderer.blit(surf, pos)
+        return surf
+
+    def draw_text_centered(self, font: pygame.font.Font, text: str, color, y: int, center_x: int = None):
+        """Desenha texto centralizado horizontalmente"""
+        surf = self.text.render(font, text, color)
+        if center_x is None:
+            center_x = self.width//2
+        self.renderer.blit(surf, (center_x - surf.get_width()//2, y))
+
+    def draw_number(self, font: pygame.font.Font, label: str, value: str, color, pos):
+        """Desenha rótulo fixo (cache) seguido de valor numérico (atlas de glifos)"""
+        x, y = pos
+        if label:
+            x += self.draw_text(font, label, color, (x, y)).get_width()
+        atlas = self.text.atlas(font, color)
+        if atlas.supports(value):
+            self.renderer.blits(atlas.ops(value, (x, y)))
+        else:
+            self.draw_text(font, value, color, (x, y))
+
+    def draw_number_centered(self, font: pygame.font.Font, label: str, value: str, color, y: int, center_x: int = None):
+        """Desenha rótulo + valor numérico centralizados horizontalmente"""
+        atlas = self.text.atlas(font, color)
+        width = atlas.width(value) if atlas.supports(value) else font.size(value)[0]
+        if label:
+            width += self.text.render(font, label, color).get_width()
+        if center_x is None:
+            center_x = self.width//2
+        self.draw_number(font, label, value, color, (center_x - width//2, y))
+
+    @profiled
     def draw_menu(self):
-        """Renderiza o menu principal com botões melhor organizados"""
-        title = self.font_large.render("DUELO NO OESTE", True, GOLD)
-        screen.blit(title, (SCREEN_WIDTH//2 - title.get_width()//2, 100))
-
-        # Botões coloridos com texto centralizado
-        for btn_name, btn_rect in [(k, v) for k, v in self.controls.items() if k in ["arcade", "pvp", "achievements"]]:
-            color = {
-                "arcade": GREEN,
-                "pvp": BLUE,
-                "achievements": GOLD
-            }[btn_name]
-
-            pygame.draw.rect(screen, color, btn_rect, 0, 10)
-            pygame.draw.rect(screen, WHITE, btn_rect, 2, 10)  # Borda
-
-            text = self.font_medium.render(
-                {"arcade": "Arcade (IMPOSSÍVEL)", 
-                 "pvp": "PvP (2 jogadores)", 
-                 "achievements": "Conquistas"}[btn_name], 
-                True, WHITE
-            )
-            screen.blit(text, (btn_rect.centerx - text.get_width()//2, 
-                             btn_rect.centery - text.get_height()//2))
+        """Renderiza o menu principal (widgets prontos do menu_ui)"""
+        self.menu_ui.draw(self.renderer)
 
+    @profiled
     def draw_game_elements(self):
         """Renderiza elementos do jogo"""
         # Personagens
-        screen.blit(self.assets["player1"][self.player1_state], self.player1_pos)
-        screen.blit(self.assets["player2"][self.player2_state], self.player2_pos)
-
-        # Balas
-        for bullet in self.bullets:
-            screen.blit(self.assets["bullet"], (bullet["x"], bullet["y"]))
-
-        # Interface
+        self.renderer.blit(self.assets["player1"][self.player1_state],
+                           self.lerp_pos(self.player1_prev_pos, self.player1_pos))
+        self.renderer.blit(self.assets["player2"][self.player2_state],
+                           self.lerp_pos(self.player2_prev_pos, self.player2_pos))
+
+        # Balas e partículas (todas entram no mesmo Surface.blits do frame)
+        self.renderer.blit_many(self.assets["bullet"], [self.to_screen(x, y) for x, y in
+                                                        self.engine.bullet_positions(0, self.render_alpha)])
+        self.effects.draw(self.renderer)
+        if self.game_state == "result":
+            self.renderer.blit(self.overlay, (0, 0))  # Fundo escurecido entra na cena (resolução interna)
+
+        # Interface em resolução nativa
+        self.renderer.begin_hud()
+        if self.paused:
+            self.draw_text_centered(self.font_large, "PAUSADO", GOLD, self.height//3)
+            self.draw_text_centered(self.font_small, "Toque para continuar", WHITE, self.height//2)
+            return
         if self.game_state == "countdown":
             self.draw_countdown()
         elif self.game_state == "result":
             self.draw_result()
+        elif self.game_state == "waiting":
+            self.draw_text_centered(self.font_medium, "Aguardando oponente...", WHITE, self.height//3)
+
+        # Latência da rede
+        if self.online and self.net.rtt_ms is not None:
+            self.draw_number(self.font_small, "Ping (ms): ", f"{self.net.rtt_ms:.0f}", WHITE, (20, 20))
 
         # Controles mobile
         if self.game_state == "duel":
@@ -532,142 +819,178 @@ class Game:
 
         # Placar no modo PvP
         if self.game_mode == "pvp" and self.game_state == "duel":
-            score_text = self.font_medium.render(f"{self.pvp_score[0]} - {self.pvp_score[1]}", True, WHITE)
-            screen.blit(score_text, (SCREEN_WIDTH//2 - score_text.get_width()//2, 50))
+            self.draw_number_centered(self.font_medium, "", f"{self.pvp_score[0]} - {self.pvp_score[1]}", WHITE, 50)
 
         # Rodada no modo arcade
         if self.game_mode == "arcade" and self.game_state == "duel":
-            round_text = self.font_medium.render(f"Rodada: {self.arcade_round}/{MAX_ROUNDS}", True, WHITE)
-            screen.blit(round_text, (SCREEN_WIDTH//2 - round_text.get_width()//2, 50))
+            self.draw_text_centered(self.font_medium, f"Rodada: {self.arcade_round}/{MAX_ROUNDS}", WHITE, 50)
 
             # Mostra dificuldade
-            diff_text = self.font_small.render(f"Dificuldade: {self.calculate_difficulty():.1f}/10.0", True, RED)
-            screen.blit(diff_text, (SCREEN_WIDTH//2 - diff_text.get_width()//2, 100))
+            self.draw_text_centered(self.font_small, f"Dificuldade: {self.calculate_difficulty():.1f}/10.0", RED, 100)
 
+    @profiled
     def draw_countdown(self):
         """Renderiza contagem regressiva"""
         if self.countdown > 0:
-            text = self.font_large.render(str(self.countdown), True, WHITE)
-            screen.blit(text, (SCREEN_WIDTH//2 - text.get_width()//2, SCREEN_HEIGHT//3))
+            self.draw_number_centered(self.font_large, "", str(self.countdown), WHITE, self.height//3)
         else:
-            text = self.font_large.render("ATIRE!", True, RED)
-            screen.blit(text, (SCREEN_WIDTH//2 - text.get_width()//2, SCREEN_HEIGHT//3))
+            self.draw_text_centered(self.font_large, "ATIRE!", RED, self.height//3)
 
+    @profiled
     def draw_result(self):
-        """Renderiza tela de resultado"""
-        # Fundo escurecido
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        overlay.fill(BLACK_ALPHA)
-        screen.blit(overlay, (0, 0))
-
-        # Textos
-        if self.winner == 1:
-            title = self.font_large.render("VITÓRIA!", True, GOLD)
+        """Renderiza tela de resultado (o fundo escurecido já está na cena)"""
+        if self.winner == self.local_player:
+            self.draw_text_centered(self.font_large, "VITÓRIA!", GOLD, self.height//3)
         else:
-            title = self.font_large.render("DERROTA!", True, RED)
-        screen.blit(title, (SCREEN_WIDTH//2 - title.get_width()//2, SCREEN_HEIGHT//3))
+            self.draw_text_centered(self.font_large, "DERROTA!", RED, self.height//3)
 
         if self.game_mode == "arcade":
-            round_text = self.font_medium.render(f"Rodada: {self.arcade_round}/{MAX_ROUNDS}", True, WHITE)
-            screen.blit(round_text, (SCREEN_WIDTH//2 - round_text.get_width()//2, SCREEN_HEIGHT//2))
+            self.draw_text_centered(self.font_medium, f"Rodada: {self.arcade_round}/{MAX_ROUNDS}", WHITE, self.height//2)
 
             # Mostra precisão
             accuracy = (self.shots_hit / self.shots_fired * 100) if self.shots_fired > 0 else 0
-            acc_text = self.font_small.render(f"Precisão: {accuracy:.1f}%", True, WHITE)
-            screen.blit(acc_text, (SCREEN_WIDTH//2 - acc_text.get_width()//2, SCREEN_HEIGHT//2 + 50))
+            self.draw_number_centered(self.font_small, "Precisão: ", f"{accuracy:.1f}%", WHITE, self.height//2 + 50)
         elif self.game_mode == "pvp":
-            score_text = self.font_medium.render(f"Placar: {self.pvp_score[0]} - {self.pvp_score[1]}", True, WHITE)
-            screen.blit(score_text, (SCREEN_WIDTH//2 - score_text.get_width()//2, SCREEN_HEIGHT//2))
+            self.draw_number_centered(self.font_medium, "Placar: ", f"{self.pvp_score[0]} - {self.pvp_score[1]}", WHITE, self.height//2)
 
-        hint = self.font_small.render("Toque para continuar", True, WHITE)
-        screen.blit(hint, (SCREEN_WIDTH//2 - hint.get_width()//2, SCREEN_HEIGHT - 150))
+        self.draw_text_centered(self.font_small, "Toque para continuar", WHITE, self.height - 150)
 
+    @profiled
     def draw_touch_controls(self):
-        """Renderiza controles touch"""
-        btn_width = SCREEN_WIDTH // 3
-        btn_height = SCREEN_HEIGHT // 6
-
-        # Botões de tiro semi-transparentes
-        s = pygame.Surface((btn_width, btn_height), pygame.SRCALPHA)
-        s.fill((0, 0, 0, 150))
-        screen.blit(s, (0, SCREEN_HEIGHT-btn_height))
-        screen.blit(s, (SCREEN_WIDTH-btn_width, SCREEN_HEIGHT-btn_height))
-
-        shoot_text = self.font_small.render("ATIRAR", True, WHITE)
-        screen.blit(shoot_text, (btn_width//2 - shoot_text.get_width()//2, SCREEN_HEIGHT-btn_height//2))
-        screen.blit(shoot_text, (SCREEN_WIDTH-btn_width//2 - shoot_text.get_width()//2, SCREEN_HEIGHT-btn_height//2))
+        """Renderiza controles touch (mesmos retângulos do toque)"""
+        self.duel_ui.draw(self.renderer)
 
+    @profiled
     def draw_achievements(self):
         """Renderiza tela de conquistas"""
-        # Fundo escurecido
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        overlay.fill(BLACK_ALPHA)
-        screen.blit(overlay, (0, 0))
+        # Fundo escurecido (cena), textos e ícones (HUD)
+        self.renderer.blit(self.overlay, (0, 0))
+        self.renderer.begin_hud()
 
-        title = self.font_large.render("CONQUISTAS", True, GOLD)
-        screen.blit(title, (SCREEN_WIDTH//2 - title.get_width()//2, 50))
+        self.draw_text_centered(self.font_large, "CONQUISTAS", GOLD, 50)
 
         # Data atual
         today = datetime.now().strftime("%d/%m/%Y")
-        date_text = self.font_small.render(f"Hoje: {today}", True, WHITE)
-        screen.blit(date_text, (SCREEN_WIDTH - date_text.get_width() - 20, 20))
-
-        achievements = [
-            ("Primeiro Sangue", "first_blood", "Primeira vitória"),
-            ("Rodada 5", "round_5", "Chegue à 5ª rodada"),
-            ("Rodada 10", "round_10", "Complete todas as rodadas"),
-            ("Gatilho Rápido", "fast_winner", "Vença em <1 segundo"),
-            ("Precisão", "no_miss", "Vença sem errar tiros"),
-            ("Perfeição", "perfect_10", "Vença todas as rodadas"),
-            ("Campeão PvP", "pvp_winner", "Vença uma partida PvP"),
-            ("Vitória Diária", "daily_win", "Vença 1 duelo hoje"),
-            ("5 Vitórias Diárias", "daily_5wins", "Vença 5 duelos hoje"),
-            ("10 Tiros Diários", "daily_10shots", "Dispare 10 tiros hoje")
-        ]
-
-        for i, (name, key, desc) in enumerate(achievements):
+        date_text = self.text.render(self.font_small, f"Hoje: {today}", WHITE)
+        self.renderer.blit(date_text, (self.width - date_text.get_width() - 20, 20))
+
+        unlocked = self.tracker.unlocked
+        for i, rule in enumerate(ACHIEVEMENTS):
             y_pos = 120 + i * 60
-            color = GREEN if self.achievements[key] else RED
+            color = GREEN if unlocked[rule.key] else RED
 
             # Ícone
-            pygame.draw.circle(screen, color, (80, y_pos + 25), 15)
+            self.renderer.blit(self.achievement_icons[color], (65, y_pos + 10))
 
             # Textos
-            name_text = self.font_medium.render(name, True, color)
-            desc_text = self.font_small.render(desc, True, WHITE)
-
-            screen.blit(name_text, (110, y_pos))
-            screen.blit(desc_text, (110, y_pos + 30))
+            self.draw_text(self.font_medium, rule.name, color, (110, y_pos))
+            self.draw_text(self.font_small, rule.desc, WHITE, (110, y_pos + 30))
 
-            # Progresso para conquistas diárias
-            if key == "daily_5wins" and not self.achievements[key]:
-                progress = min(5, self.daily_achievements["daily_wins"])
-                progress_text = self.font_small.render(f"{progress}/5", True, WHITE)
-                screen.blit(progress_text, (SCREEN_WIDTH - 100, y_pos + 15))
+            # Progresso dos contadores (conquistas diárias)
+            progress = self.tracker.progress(rule)
+            if progress is not None:
+                self.draw_number(self.font_small, "", progress, WHITE, (self.width - 100, y_pos + 15))
 
-            if key == "daily_10shots" and not self.achievements[key]:
-                progress = min(10, self.daily_achievements["daily_shots"])
-                progress_text = self.font_small.render(f"{progress}/10", True, WHITE)
-                screen.blit(progress_text, (SCREEN_WIDTH - 100, y_pos + 15))
+        # Totais (agregados já calculados pelo StatsStore)
+        total = self.stats.summary["total"]
+        self.draw_number(self.font_small, "Duelos: ", str(total["duels"]), WHITE, (20, 20))
+        self.draw_number(self.font_small, "Vitórias: ", str(total["wins"]), WHITE, (220, 20))
 
         # Instrução para voltar
-        back_text = self.font_small.render("Toque para voltar", True, WHITE)
-        screen.blit(back_text, (SCREEN_WIDTH//2 - back_text.get_width()//2, SCREEN_HEIGHT - 50))
+        self.draw_text_centered(self.font_small, "Toque para voltar", WHITE, self.height - 50)
+
+    @profiled
+    def draw_stats(self):
+        """Renderiza tela de estatísticas (só lê o resumo do StatsStore, sem consultar o banco)"""
+        self.renderer.blit(self.overlay, (0, 0))
+        self.renderer.begin_hud()
+        self.draw_text_centered(self.font_large, "ESTATÍSTICAS", GOLD, 50)
+
+        summary = self.stats.summary
+        total, today = summary["total"], summary["today"]
+        win_rate = total["wins"] / total["duels"] * 100 if total["duels"] else 0
+        accuracy = total["shots_hit"] / total["shots_fired"] * 100 if total["shots_fired"] else 0
+        best = summary["best_reaction_ms"]
+
+        x, y = 60, 140
+        self.draw_number(self.font_medium, "Duelos: ", str(total["duels"]), WHITE, (x, y))
+        self.draw_number(self.font_medium, "Vitórias: ", f"{total['wins']} - {win_rate:.1f}%", WHITE, (x, y + 60))
+        self.draw_number(self.font_medium, "Precisão: ", f"{accuracy:.1f}%", WHITE, (x, y + 120))
+        self.draw_number(self.font_medium, "Melhor reação (ms): ", f"{best:.0f}" if best is not None else "-",
+                         GOLD, (x, y + 180))
+        self.draw_number(self.font_medium, "Hoje: ", f"{today['wins']}/{today['duels']}", WHITE, (x, y + 240))
+
+        # Taxa de vitória por rodada do arcade
+        x = self.width // 2
+        self.draw_text(self.font_medium, "Arcade por rodada", GOLD, (x, y))
+        for arcade_round in range(1, MAX_ROUNDS + 1):
+            row = summary["rounds"].get(("arcade", arcade_round))
+            value = f"{row['wins'] / row['duels'] * 100:.0f}% - {row['duels']}" if row else "-"
+            self.draw_number(self.font_small, f"Rodada {arcade_round}: ", value, WHITE,
+                             (x, y + 20 + arcade_round * 36))
+
+        self.draw_text_centered(self.font_small, "Toque para voltar", WHITE, self.height - 50)
+
+    def draw_profiler(self):
+        """Gráfico das fases do frame e contadores por frame (F3)"""
+        prof = self.profiler
+        x, y = 10, 10
+        if self.renderer.hud_start is None:
+            self.renderer.begin_hud()
+        self.renderer.blit(prof.graph, (x, y))
+        self.renderer.mark_dirty(pygame.Rect((x, y), prof.graph.get_size()))  # Muda a cada frame
+
+        y += prof.graph.get_height() + 4
+        counters = prof.last_counters
+        self.draw_number(self.font_small, "frame ms: ", f"{prof.last_frame_ms:.1f}", WHITE, (x, y))
+        self.draw_number(self.font_small, "superfícies: ",
+                         f"{counters.get('surfaces', 0)} - {counters.get('surface_bytes', 0) // 1024} KB",
+                         WHITE, (x, y + 28))
+        self.draw_number(self.font_small, "fontes: ", str(counters.get("font_renders", 0)), WHITE, (x, y + 56))
+        avg, worst = self.input.latency_stats()
+        self.draw_number(self.font_small, "entrada ms: ", f"{avg:.1f} / {worst:.1f}", WHITE, (x, y + 84))
+        self.draw_number(self.font_small, f"partículas ({self.effects.tier_name}): ", str(len(self.effects)),
+                         WHITE, (x, y + 112))
+        memory = self.memory_report()
+        mb = [sum(section.values()) / (1024 * 1024) for section in memory.values()]
+        self.draw_number(self.font_small, "memória MB: ", f"{mb[0]:.1f} + {mb[1]:.1f}", WHITE, (x, y + 140))
+        self.draw_number(self.font_small, "escala: ", f"{self.renderer.scale:.3f}", WHITE, (x, y + 168))
 
     # --- Controles ---
     def handle_events(self):
         """Processa todos os eventos"""
-        for event in pygame.event.get():
+        for stamp, event in self.input.poll():
             if event.type == pygame.QUIT:
                 return False
-
-            # Controles touch
-            if event.type == pygame.FINGERDOWN or event.type == pygame.MOUSEBUTTONDOWN:
-                pos = (event.x * SCREEN_WIDTH, event.y * SCREEN_HEIGHT) if hasattr(event, 'x') else pygame.mouse.get_pos()
-                self.handle_touch(pos)
+            if event.type in (pygame.KEYDOWN, pygame.FINGERDOWN, pygame.MOUSEBUTTONDOWN):
+                self.pacer.note_input()
+            elif event.type == pygame.WINDOWEXPOSED:
+                self.renderer.invalidate()  # Janela voltou a aparecer: quadro parado precisa ser refeito
+            elif event.type in SUSPEND_EVENTS:
+                self.suspend()
+                continue
+
+            # Pausado: o primeiro toque ou tecla só retoma o duelo
+            if self.paused and event.type in (pygame.KEYDOWN, pygame.FINGERDOWN, pygame.MOUSEBUTTONDOWN):
+                if event.type != pygame.KEYDOWN or event.key not in (pygame.K_F2, pygame.K_F3):
+                    self.resume()
+                    continue
+
+            # Controles touch (o mouse sintético de cada toque já foi descartado pela InputQueue);
+            # as coordenadas são sempre as da tela, qualquer que seja a escala interna da cena
+            if event.type == pygame.FINGERDOWN:
+                self.handle_touch((event.x * self.width, event.y * self.height), stamp)
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                self.handle_touch(event.pos, stamp)
 
             # Teclado
             if event.type == pygame.KEYDOWN:
+                # Alterna redesenho completo / retângulos sujos (comparação A/B)
+                if event.key == pygame.K_F2:
+                    self.renderer.set_mode(not self.renderer.dirty_mode)
+                elif event.key == pygame.K_F3:
+                    self.profiler.toggle()
+
                 if self.game_state == "menu":
                     if event.key == pygame.K_1:
                         self.start_arcade_mode()
@@ -675,39 +998,40 @@ class Game:
                         self.start_pvp_mode()
                     elif event.key == pygame.K_3:
                         self.show_achievements()
+                    elif event.key == pygame.K_4:
+                        self.show_stats()
                     elif event.key == pygame.K_ESCAPE:
                         return False
 
-                elif self.game_state == "duel":
+                elif self.game_state in ("countdown", "duel"):
+                    # Pode cair logo depois do ATIRE! no meio deste frame (apply_shots decide)
                     if event.key == pygame.K_f:
-                        self.fire_shot(1)
+                        self.fire_shot(1, stamp)
                     elif event.key == pygame.K_j:
-                        self.fire_shot(2)
+                        self.fire_shot(2, stamp)
 
                 elif self.game_state == "result" and event.key == pygame.K_RETURN:
                     self.handle_round_transition()
 
+                elif self.game_state == "waiting" and event.key == pygame.K_ESCAPE:
+                    self.cancel_waiting()
+
                 elif self.game_state == "achievements" and event.key == pygame.K_ESCAPE:
                     self.game_state = "menu"
                     self.stop_music()
 
+                elif self.game_state == "stats" and event.key == pygame.K_ESCAPE:
+                    self.game_state = "menu"
+
         return True
 
-    def handle_touch(self, pos):
-        """Processa toques na tela"""
+    def handle_touch(self, pos, stamp: float = None):
+        """Processa toques na tela (stamp: chegada do evento, para o instante do tiro)"""
         if self.game_state == "menu":
-            if self.controls["arcade"].collidepoint(pos):
-                self.start_arcade_mode()
-            elif self.controls["pvp"].collidepoint(pos):
-                self.start_pvp_mode()
-            elif self.controls["achievements"].collidepoint(pos):
-                self.show_achievements()
+            self.menu_ui.press(pos, now_ms())
 
-        elif self.game_state == "duel":
-            if self.controls["shoot_left"].collidepoint(pos):
-                self.fire_shot(1)
-            elif self.controls["shoot_right"].collidepoint(pos):
-                self.fire_shot(2)
+        elif self.game_state in ("countdown", "duel"):
+            self.duel_ui.press(pos, now_ms(), stamp)
 
         elif self.game_state == "result":
             self.handle_round_transition()  # Toque em qualquer lugar para continuar
@@ -716,18 +1040,36 @@ class Game:
             self.game_state = "menu"  # Toque em qualquer lugar para voltar
             self.stop_music()
 
+        elif self.game_state == "stats":
+            self.game_state = "menu"
+
 def main():
     """Ponto de entrada principal"""
-    game = Game()
+    runtime = Runtime.from_env()
+    seed = os.environ.get("DUELO_SEED")  # Reproduz a mesma sequência de duelos da IA
+    game = Game(runtime, seed=int(seed) if seed else None)
+    game.restore_snapshot()  # Duelo interrompido quando o sistema fechou o app
+    pacer = game.pacer
+    prof = game.profiler
     running = True
+    runtime.clock.tick()
 
     while running:
-        running = game.handle_events()
-        game.update()
-        game.draw()
-        clock.tick(FPS)
-
-    pygame.quit()
+        # O tempo real do frame vira passos fixos de lógica dentro do Game
+        prof.begin_frame()
+        running = game.step_frame(prof.call("tick", pacer.wait, game.frame_mode()))
+        prof.end_frame()
+
+        # Tempo até o menu aparecer (frio/quente), medido no primeiro frame
+        if "first_frame" not in game.assets.timings:
+            game.assets.timings["first_frame"] = (time.perf_counter() - game.assets.started) * 1000
+            if os.environ.get("DUELO_ASSET_REPORT") == "1":
+                game.assets.wait("duel")
+                print("[assets]", game.assets.report())
+                print("[memória]", game.memory_report())
+
+    game.shutdown()
+    runtime.shutdown()
     sys.exit()
 
 if __name__ == "__main__":
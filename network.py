@@ -0,0 +1,528 @@
+import os
+import time
+import queue
+import socket
+import struct
+import asyncio
+import threading
+from collections import deque
+from typing import Dict, Optional
+import numpy as np
+from duel_engine import DuelEngine, TICK_MS, sample_human_reaction
+
+# PvP em rede: um host autoritativo resolve os duelos; cada aparelho prevê o próprio
+# duelo localmente e volta no tempo (rollback) quando chega um tiro atrasado.
+#
+# Os tiros viajam como "ms desde o ATIRE!" do duelo, então não dependem do relógio
+# de cada aparelho; o relógio do host só é usado para marcar o início do duelo.
+
+DEFAULT_PORT = 47200
+PING_INTERVAL = 0.25  # s entre sincronizações de relógio
+RESEND_MS = 80  # Reenvio de mensagens confiáveis sem ACK
+START_LEAD_MS = 3300  # Contagem (3 s) + folga para o START chegar ao outro lado
+SETTLE_MS = 150  # Espera por tiros atrasados antes do host confirmar o resultado
+MAX_REWIND_MS = 250  # Quanto um tiro pode "voltar no tempo" no host
+BEST_OF = 5
+REFERENCE_WIDTH = 1920  # Largura lógica comum dos duelos em rede (cada aparelho só escala ao desenhar)
+
+# Tipos de mensagem (1 byte) e formatos; todas começam com tipo + número de sequência
+HELLO, WELCOME, PING, PONG, READY, START, SHOT, RESULT, ACK, CANCEL = range(1, 11)
+FORMATS = {
+    HELLO: struct.Struct("!BH"),
+    WELCOME: struct.Struct("!BHBH"),  # jogador (1/2), largura de referência da tela
+    PING: struct.Struct("!BHd"),  # relógio do cliente (ms)
+    PONG: struct.Struct("!BHdd"),  # relógio do cliente ecoado, relógio do host (ms)
+    READY: struct.Struct("!BHH"),  # duelo (0 abre uma partida nova)
+    CANCEL: struct.Struct("!BH"),  # desiste de esperar o próximo duelo
+    START: struct.Struct("!BHHd"),  # duelo, instante do ATIRE! no relógio do host (ms)
+    SHOT: struct.Struct("!BHHBf"),  # duelo, jogador, ms desde o ATIRE!
+    RESULT: struct.Struct("!BHHBfBB"),  # duelo, vencedor, ms do impacto, placar 1, placar 2
+    ACK: struct.Struct("!BH")  # sequência confirmada
+}
+RELIABLE = (WELCOME, READY, CANCEL, START, SHOT, RESULT)
+
+
+def clock_ms() -> float:
+    return time.monotonic() * 1000
+
+
+def encode(kind: int, seq: int, *fields) -> bytes:
+    return FORMATS[kind].pack(kind, seq, *fields)
+
+
+def decode(data: bytes) -> Optional[tuple]:
+    """(tipo, seq, campos...) ou None para pacote desconhecido/cortado"""
+    if not data or data[0] not in FORMATS or len(data) != FORMATS[data[0]].size:
+        return None
+    return FORMATS[data[0]].unpack(data)
+
+
+class LinkSimulator:
+    """Atraso, variação (jitter) e perda de pacotes na saída de um transporte UDP"""
+
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0, loss: float = 0.0, seed=None):
+        self.latency_ms = latency_ms  # Atraso de ida (metade do RTT)
+        self.jitter_ms = jitter_ms
+        self.loss = loss
+        self.rng = np.random.default_rng(seed)
+        self.sent = 0
+        self.dropped = 0
+
+    @classmethod
+    def from_env(cls) -> Optional["LinkSimulator"]:
+        """DUELO_NET_SIM=latência,jitter,perda (ex.: 40,10,0.05)"""
+        spec = os.environ.get("DUELO_NET_SIM")
+        if not spec:
+            return None
+        latency, jitter, loss = (float(v) for v in spec.split(","))
+        return cls(latency, jitter, loss)
+
+    def send(self, transport, data: bytes, addr):
+        self.sent += 1
+        if self.rng.random() < self.loss:
+            self.dropped += 1
+            return
+        delay = max(0.0, self.latency_ms + self.jitter_ms * self.rng.standard_normal()) / 1000
+        asyncio.get_running_loop().call_later(delay, transport.sendto, data, addr)
+
+
+class Endpoint(asyncio.DatagramProtocol):
+    """Base do host e do cliente: envio confiável (ACK + reenvio) sobre UDP"""
+
+    def __init__(self, link: LinkSimulator = None):
+        self.link = link
+        self.transport = None
+        self.connected = False  # Transporte com remote_addr: sendto sem endereço
+        self._seq = 0
+        self._unacked: Dict[tuple, tuple] = {}  # (endereço, seq) -> (pacote, último envio)
+        self._seen = deque(maxlen=256)  # Mensagens confiáveis já tratadas (duplicatas)
+        self._resend_task = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.connected = transport.get_extra_info("peername") is not None
+        self._resend_task = asyncio.get_running_loop().create_task(self._resend())
+
+    def connection_lost(self, exc):
+        if self._resend_task is not None:
+            self._resend_task.cancel()
+
+    def send(self, kind: int, addr, *fields):
+        """Envia uma mensagem; as de RELIABLE são reenviadas até o ACK"""
+        seq = 0
+        if kind in RELIABLE:
+            self._seq = self._seq % 0xFFFF + 1
+            seq = self._seq
+        data = encode(kind, seq, *fields)
+        if seq:
+            self._unacked[(addr, seq)] = (data, clock_ms())
+        self._send_raw(data, addr)
+
+    def _send_raw(self, data: bytes, addr):
+        if self.transport is None:
+            return
+        if self.connected:
+            addr = None
+        if self.link is not None:
+            self.link.send(self.transport, data, addr)
+        else:
+            self.transport.sendto(data, addr)
+
+    async def _resend(self):
+        while True:
+            await asyncio.sleep(RESEND_MS / 2000)
+            now = clock_ms()
+            for key, (data, sent) in list(self._unacked.items()):
+                if now - sent >= RESEND_MS:
+                    self._unacked[key] = (data, now)
+                    self._send_raw(data, key[0])
+
+    def datagram_received(self, data: bytes, addr):
+        msg = decode(data)
+        if msg is None:
+            return
+        kind, seq = msg[0], msg[1]
+        if kind == ACK:
+            self._unacked.pop((addr, seq), None)
+            return
+        if seq:
+            self._send_raw(encode(ACK, seq), addr)
+            if (addr, seq) in self._seen:
+                return
+            self._seen.append((addr, seq))
+        self.on_message(kind, msg[2:], addr)
+
+    def on_message(self, kind: int, fields: tuple, addr):
+        pass
+
+
+class RollbackDuel:
+    """Duelo 1x1 com histórico curto: tiro que chega atrasado volta no tempo e refaz a simulação"""
+
+    def __init__(self, engine: DuelEngine, window_ms: float = 1000):
+        self.engine = engine
+        self.history = deque(maxlen=int(window_ms / engine.tick_ms) + 1)  # (ms do duelo, estado) antes de cada passo
+        self.shots = []  # (ms desde o ATIRE!, jogador) de todos os tiros do duelo
+        self.rollbacks = 0
+
+    def reset(self):
+        self.history.clear()
+        self.shots = []
+
+    def now(self) -> float:
+        """ms desde o ATIRE! (relógio do motor)"""
+        return float(self.engine.time[0] - self.engine.duel_start[0])
+
+    def fire(self, player: int, at: float) -> bool:
+        """Registra um tiro no instante at do duelo; retorna se o tiro saiu"""
+        at = min(at, self.now() + self.engine.tick_ms)  # Tiro "do futuro" (relógio adiantado)
+        if at >= self.now() or not self.history:
+            fired = self._fire(player, max(at, self.now()))
+            if fired:
+                self.shots.append((max(at, self.now()), player))
+            return fired
+        shot = (max(at, self.history[0][0]), player)  # Mais antigo que o histórico: passo mais antigo
+        self.shots.append(shot)
+        fired = self._rollback(shot)
+        if not fired:
+            self.shots.remove(shot)  # Bloqueado na re-simulação (recarga, duelo já decidido)
+        return fired
+
+    def _fire(self, player: int, at: float) -> bool:
+        engine = self.engine
+        return bool(engine.fire(player, 0, engine.duel_start + at)[0])
+
+    def _rollback(self, shot: tuple) -> bool:
+        """Volta ao passo que contém o tiro e re-simula até o presente; retorna se ele saiu"""
+        target = self.now()
+        self.rollbacks += 1
+        while len(self.history) > 1 and self.history[-1][0] > shot[0]:
+            self.history.pop()
+        start, state = self.history.pop()
+        self.engine.set_state(state)
+        fired = False
+        while self.now() < target - 1e-6:
+            fired |= shot in self.step(replay=True)
+        return fired
+
+    def step(self, replay: bool = False) -> list:
+        """Um passo do motor; na re-simulação, reaplica os tiros que caem neste passo (retorna os que saíram)"""
+        now, tick = self.now(), self.engine.tick_ms
+        self.history.append((now, self.engine.get_state()))
+        fired = []
+        if replay:
+            for at, player in sorted(self.shots):
+                if now - 1e-6 <= at < now + tick - 1e-6 and self._fire(player, at):
+                    fired.append((at, player))
+        self.engine.step()
+        return fired
+
+
+class DuelHost(Endpoint):
+    """Host autoritativo: sincroniza o início dos duelos e decide quem acertou primeiro"""
+
+    def __init__(self, link: LinkSimulator = None, settle_ms: float = SETTLE_MS):
+        super().__init__(link)
+        self.settle_ms = settle_ms
+        self.peers: Dict[tuple, int] = {}  # endereço -> jogador
+        self.ready: Dict[int, int] = {}  # jogador -> duelo pedido
+        self.engine = DuelEngine(1, screen_width=REFERENCE_WIDTH)
+        self.duel = RollbackDuel(self.engine)
+        self.duel_no = -1
+        self.start_ms = None
+        self.finished = True
+        self.score = [0, 0]
+        self._tick_task = None
+
+    def connection_made(self, transport):
+        super().connection_made(transport)
+        self._tick_task = asyncio.get_running_loop().create_task(self._tick())
+
+    def connection_lost(self, exc):
+        super().connection_lost(exc)
+        if self._tick_task is not None:
+            self._tick_task.cancel()
+
+    def on_message(self, kind, fields, addr):
+        if kind == HELLO:
+            if addr not in self.peers and len(self.peers) < 2:
+                self.peers[addr] = len(self.peers) + 1
+            if addr in self.peers:
+                self.send(WELCOME, addr, self.peers[addr], REFERENCE_WIDTH)
+        elif kind == PING:
+            self.send(PONG, addr, fields[0], clock_ms())
+        elif addr not in self.peers:
+            return
+        elif kind == READY:
+            self._on_ready(fields[0], self.peers[addr])
+        elif kind == CANCEL:
+            self.ready.pop(self.peers[addr], None)
+        elif kind == SHOT:
+            self._on_shot(fields[0], self.peers[addr], fields[2])
+
+    def _on_ready(self, duel_no: int, player: int):
+        # Duelo 0 é sempre uma partida nova (mesmo depois de outra na mesma sessão)
+        if duel_no <= self.duel_no and duel_no != 0:
+            return
+        self.ready[player] = duel_no
+        self._try_start()
+
+    def _try_start(self):
+        """Começa o próximo duelo quando os dois estão prontos e o anterior terminou"""
+        if not self.finished or len(self.ready) < 2:
+            return
+        duel_no = min(self.ready.values())  # Um pede partida nova: a outra acabou para os dois
+        self.ready.clear()
+        if duel_no == 0:
+            self.score = [0, 0]
+
+        self.duel_no = duel_no
+        self.start_ms = clock_ms() + START_LEAD_MS
+        self.engine.reset()
+        self.duel.reset()
+        self.finished = False
+        for addr in self.peers:
+            self.send(START, addr, duel_no, self.start_ms)
+
+    def _on_shot(self, duel_no: int, player: int, at: float):
+        if duel_no != self.duel_no or self.finished:
+            return
+        # Autoridade: o tiro não pode ser mais antigo que o atraso máximo aceito
+        at = max(at, clock_ms() - self.start_ms - MAX_REWIND_MS, 0.0)
+        self._advance()
+        if self.duel.fire(player, at):
+            for addr, peer in self.peers.items():
+                if peer != player:
+                    self.send(SHOT, addr, duel_no, player, at)
+
+    def _advance(self):
+        """Simula o duelo até o relógio atual"""
+        if self.start_ms is None or self.finished:
+            return
+        elapsed = clock_ms() - self.start_ms
+        while self.duel.now() + self.engine.tick_ms <= elapsed and not self.engine.winner[0]:
+            self.duel.step()
+
+    async def _tick(self):
+        while True:
+            await asyncio.sleep(TICK_MS / 1000)
+            self._advance()
+            winner = int(self.engine.winner[0])
+            if self.finished or not winner:
+                continue
+            impact = float(self.engine.impact_time[0] - self.engine.duel_start[0])
+            if clock_ms() - self.start_ms < impact + self.settle_ms:
+                continue  # Ainda pode chegar um tiro anterior ao impacto
+
+            self.finished = True
+            self.score[winner - 1] += 1
+            for addr in self.peers:
+                self.send(RESULT, addr, self.duel_no, winner, impact, *self.score)
+            self._try_start()  # Prontos que chegaram durante o duelo
+
+
+class DuelClient(Endpoint):
+    """Lado de cada aparelho: relógio sincronizado com o host e fila de eventos para o Game"""
+
+    def __init__(self, host_addr, events: queue.SimpleQueue, link: LinkSimulator = None):
+        super().__init__(link)
+        self.host_addr = host_addr
+        self.events = events
+        self.player = 0
+        self.host_width = 0
+        self._pending_ready = None  # READY pedido antes do WELCOME (vai junto com ele)
+        self.offset_ms = 0.0  # relógio do host - relógio local
+        self.rtt_ms = None
+        self._samples = deque(maxlen=8)  # (rtt, offset) das últimas sincronizações
+        self._ping_task = None
+
+    def connection_made(self, transport):
+        super().connection_made(transport)
+        self._ping_task = asyncio.get_running_loop().create_task(self._ping())
+
+    def connection_lost(self, exc):
+        super().connection_lost(exc)
+        if self._ping_task is not None:
+            self._ping_task.cancel()
+
+    async def _ping(self):
+        while True:
+            if not self.player:
+                self.send(HELLO, self.host_addr)
+            self.send(PING, self.host_addr, clock_ms())
+            await asyncio.sleep(PING_INTERVAL)
+
+    def ready(self, duel_no: int):
+        """Pronto para o duelo; antes do WELCOME fica guardado (o host só conhece quem já entrou)"""
+        self._pending_ready = None if self.player else duel_no
+        if self.player:
+            self.send(READY, self.host_addr, duel_no)
+
+    def cancel(self):
+        if self.player:
+            self.send(CANCEL, self.host_addr)
+        self._pending_ready = None
+
+    def on_message(self, kind, fields, addr):
+        if kind == WELCOME:
+            if not self.player:
+                self.player, self.host_width = fields
+                self.events.put(("welcome", self.player))
+                if self._pending_ready is not None:
+                    self.ready(self._pending_ready)
+        elif kind == PONG:
+            # NTP simplificado: a amostra de menor RTT dá o offset mais confiável
+            sent, host_ms = fields
+            now = clock_ms()
+            self._samples.append((now - sent, host_ms - (sent + now) / 2))
+            self.rtt_ms, self.offset_ms = min(self._samples)
+        elif kind == START:
+            duel_no, host_start = fields
+            self.events.put(("start", duel_no, host_start - self.offset_ms))
+        elif kind == SHOT:
+            self.events.put(("shot",) + tuple(fields))
+        elif kind == RESULT:
+            self.events.put(("result",) + tuple(fields))
+
+
+class BotClient(DuelClient):
+    """Oponente automático para testar sozinho: reação humana sorteada (log-normal)"""
+
+    def __init__(self, host_addr, link: LinkSimulator = None, median_ms: float = 300, seed=None):
+        super().__init__(host_addr, queue.SimpleQueue(), link)
+        self.median_ms = median_ms
+        self.rng = np.random.default_rng(seed)
+        self.ready(0)  # Sai junto com o WELCOME
+
+    def on_message(self, kind, fields, addr):
+        super().on_message(kind, fields, addr)
+        if kind == START:
+            duel_no, host_start = fields
+            reaction = float(sample_human_reaction(self.rng, 1, self.median_ms)[0])
+            delay = (host_start - self.offset_ms - clock_ms() + reaction) / 1000
+            asyncio.get_running_loop().call_later(max(0.0, delay), self.send, SHOT, self.host_addr,
+                                                  duel_no, self.player, reaction)
+        elif kind == RESULT:
+            # Fim da partida: fica pronto para a próxima (duelo 0)
+            self.ready(fields[0] + 1 if max(fields[3:]) < BEST_OF else 0)
+
+
+class NetSession:
+    """Rede numa thread própria (asyncio); o Game só chama métodos não bloqueantes e poll()
+
+    Modos (DUELO_NET):
+      host[:porta]        este aparelho hospeda e joga como jogador 1
+      join:endereço[:porta]  entra no host de outro aparelho
+      loopback            host + oponente automático neste processo (teste numa máquina)
+    DUELO_NET_SIM=latência,jitter,perda simula a rede nos dois sentidos.
+    """
+
+    def __init__(self, mode: str, host: str = "127.0.0.1", port: int = DEFAULT_PORT,
+                 link: LinkSimulator = None):
+        self.mode = mode
+        self.addr = (host, port)
+        self.link = link
+        self.events = queue.SimpleQueue()
+        self.client: Optional[DuelClient] = None
+        self.host: Optional[DuelHost] = None
+        self.bot: Optional[BotClient] = None
+
+        self.loop = asyncio.new_event_loop()
+        self._started = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="net", daemon=True)
+        self._thread.start()
+        self._started.wait()
+
+    @classmethod
+    def from_env(cls) -> Optional["NetSession"]:
+        spec = os.environ.get("DUELO_NET")
+        if not spec:
+            return None
+        parts = spec.split(":")
+        mode = parts[0]
+        link = LinkSimulator.from_env()
+        if mode == "join":
+            port = int(parts[2]) if len(parts) > 2 else DEFAULT_PORT
+            try:
+                # Resolvido uma vez: ACKs e dedup usam o endereço numérico que chega nos pacotes
+                addr = socket.getaddrinfo(parts[1], port, socket.AF_INET, socket.SOCK_DGRAM)[0][4]
+            except OSError:
+                return None
+            return cls("join", addr[0], addr[1], link)
+        port = int(parts[1]) if len(parts) > 1 else (0 if mode == "loopback" else DEFAULT_PORT)
+        return cls(mode, "127.0.0.1", port, link)
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_until_complete(self._open())
+        self._started.set()
+        self.loop.run_forever()
+
+    async def _open(self):
+        loop = self.loop
+        if self.mode in ("host", "loopback"):
+            bind = "127.0.0.1" if self.mode == "loopback" else "0.0.0.0"
+            transport, self.host = await loop.create_datagram_endpoint(
+                lambda: DuelHost(self.link), local_addr=(bind, self.addr[1]))
+            self.addr = ("127.0.0.1", transport.get_extra_info("sockname")[1])
+
+        # No host, o próprio jogador entra pela interface local sem atraso simulado
+        link = None if self.mode == "host" else self.link
+        _, self.client = await loop.create_datagram_endpoint(
+            lambda: DuelClient(self.addr, self.events, link), remote_addr=self.addr)
+
+        if self.mode == "loopback":
+            _, self.bot = await loop.create_datagram_endpoint(
+                lambda: BotClient(self.addr, self.link), remote_addr=self.addr)
+
+    # --- Chamadas da thread do jogo ---
+    @property
+    def player(self) -> int:
+        return self.client.player
+
+    @property
+    def rtt_ms(self) -> Optional[float]:
+        return self.client.rtt_ms
+
+    @property
+    def host_width(self) -> int:
+        """Largura de referência do duelo (WELCOME); antes dele, a padrão"""
+        return self.client.host_width or REFERENCE_WIDTH
+
+    def local_clock(self) -> float:
+        return clock_ms()
+
+    def ready(self, duel_no: int):
+        self.loop.call_soon_threadsafe(self.client.ready, duel_no)
+
+    def cancel(self):
+        """Desiste do próximo duelo (o host esquece o READY)"""
+        self.loop.call_soon_threadsafe(self.client.cancel)
+
+    def send_shot(self, duel_no: int, at: float):
+        self.loop.call_soon_threadsafe(self.client.send, SHOT, self.addr, duel_no, self.player, at)
+
+    def poll(self) -> list:
+        """Eventos recebidos desde a última chamada"""
+        events = []
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                return events
+
+    async def _close(self):
+        for endpoint in (self.bot, self.client, self.host):
+            if endpoint is not None and endpoint.transport is not None:
+                endpoint.transport.close()
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def close(self):
+        try:
+            asyncio.run_coroutine_threadsafe(self._close(), self.loop).result(timeout=1.0)
+        finally:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(timeout=1.0)
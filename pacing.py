@@ -0,0 +1,83 @@
+import os
+import pygame
+
+DEFAULT_IDLE_FPS = 4  # Telas paradas: poucos frames por segundo (0 = só acorda com evento)
+ACTIVE_GRACE_MS = 500  # Taxa cheia por um tempo depois de cada entrada (transições, toques)
+POLL_SLICE_MS = 2  # No duelo, a espera do frame é picada para carimbar a entrada assim que chega
+
+# Modos de frame pedidos pelo Game
+IDLE, ACTIVE, DUEL = "idle", "active", "duel"
+
+
+class FramePacer:
+    """Ritmo do loop principal: taxa cheia quando algo se move, quase parado em telas estáticas
+
+    Em telas paradas (menu, conquistas, resultado sem balas) o loop dorme em
+    pygame.event.wait até chegar uma entrada ou vencer o intervalo de idle_fps, o
+    que economiza bateria e evita aquecimento. No duelo, busy_wait troca clock.tick
+    por clock.tick_busy_loop para um ritmo de frame mais preciso (gasta mais CPU).
+    Com uma InputQueue, a espera do duelo puxa os eventos a cada POLL_SLICE_MS para
+    que o instante de cada toque seja o da chegada, não o do próximo frame.
+    """
+
+    def __init__(self, clock: pygame.time.Clock, fps: int = 60, idle_fps: int = DEFAULT_IDLE_FPS,
+                 busy_wait: bool = False, grace_ms: int = ACTIVE_GRACE_MS, input=None):
+        self.clock = clock
+        self.input = input
+        self.fps = fps
+        self.idle_fps = idle_fps
+        self.busy_wait = busy_wait
+        self.grace_ms = grace_ms
+        self.last_input = pygame.time.get_ticks()
+        self.mode = ACTIVE
+        self._frame_start = pygame.time.get_ticks()
+
+    @classmethod
+    def from_env(cls, runtime, input=None) -> "FramePacer":
+        """DUELO_IDLE_FPS e DUELO_BUSY_WAIT=1 ajustam o ritmo"""
+        return cls(runtime.clock, fps=runtime.fps,
+                   idle_fps=int(os.environ.get("DUELO_IDLE_FPS", DEFAULT_IDLE_FPS)),
+                   busy_wait=os.environ.get("DUELO_BUSY_WAIT") == "1", input=input)
+
+    def note_input(self):
+        """Entrada do jogador: volta à taxa cheia imediatamente"""
+        self.last_input = pygame.time.get_ticks()
+
+    def wait(self, mode: str) -> float:
+        """Espera o próximo frame conforme o modo e retorna os ms desde o anterior"""
+        if mode == IDLE and pygame.time.get_ticks() - self.last_input < self.grace_ms:
+            mode = ACTIVE
+        self.mode = mode
+
+        if mode == IDLE:
+            if not pygame.event.peek():
+                # Dorme até uma entrada; o evento volta para a fila do handle_events
+                event = (pygame.event.wait(int(1000 / self.idle_fps)) if self.idle_fps > 0
+                         else pygame.event.wait())
+                if event.type != pygame.NOEVENT:
+                    if self.input is not None:
+                        self.input.push(event)
+                    else:
+                        pygame.event.post(event)
+                    self.note_input()
+            frame_ms = self.clock.tick()
+            self._frame_start = pygame.time.get_ticks()
+            return frame_ms
+
+        if mode == DUEL and self.input is not None and self.fps > 0:
+            self._poll_until_due()
+        if mode == DUEL and self.busy_wait:
+            frame_ms = self.clock.tick_busy_loop(self.fps)
+        else:
+            frame_ms = self.clock.tick(self.fps)
+        self._frame_start = pygame.time.get_ticks()
+        return frame_ms
+
+    def _poll_until_due(self):
+        """Espera em fatias curtas puxando a entrada; o clock.tick cobre só o resto"""
+        deadline = self._frame_start + 1000 / self.fps - POLL_SLICE_MS
+        while pygame.time.get_ticks() < deadline:
+            self.input.pump()
+            if not self.busy_wait:
+                pygame.time.wait(POLL_SLICE_MS)
+        self.input.pump()
@@ -0,0 +1,137 @@
+import os
+import json
+import time
+import threading
+from typing import Dict
+
+
+class AchievementStore:
+    """Persistência write-behind: mudanças ficam em memória e uma thread grava no disco
+
+    O arquivo principal é sempre substituído de forma atômica (arquivo temporário +
+    os.replace). Desbloqueios também vão para um diário append-only, gravado logo em
+    seguida, para que nada se perca se o processo morrer antes do próximo snapshot.
+    """
+
+    def __init__(self, path: str = "achievements.json", flush_interval: float = 2.0):
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.flush_interval = flush_interval  # Debounce entre snapshots (segundos)
+
+        self._cond = threading.Condition()
+        self._snapshot = None
+        self._snapshot_seq = 0
+        self._dirty_since = None
+        self._journal = []
+        self._journal_seq = 0  # Número da última entrada enviada ao diário
+        self._written_seq = 0  # Número da última entrada gravada no disco
+        self._closed = False
+        self._thread = None
+
+    def load(self) -> Dict:
+        """Lê o último snapshot e reaplica o diário por cima; inicia a thread de gravação"""
+        data = {}
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+
+        try:
+            with open(self.journal_path, "r") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break  # Linha cortada no fim do diário
+                    data.setdefault(entry["s"], {})[entry["k"]] = entry["v"]
+        except OSError:
+            pass
+
+        self.start()
+        return data
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="achievement-store", daemon=True)
+            self._thread.start()
+
+    def save(self, data: Dict):
+        """Agenda um snapshot (cópia rasa de cada seção); não faz I/O nesta thread"""
+        snapshot = {section: dict(values) for section, values in data.items()}
+        with self._cond:
+            self._snapshot = snapshot
+            self._snapshot_seq = self._journal_seq
+            if self._dirty_since is None:
+                self._dirty_since = time.monotonic()
+            self._cond.notify()
+
+    def append(self, section: str, key: str, value):
+        """Registra uma mudança importante no diário (gravado sem esperar o debounce)"""
+        with self._cond:
+            self._journal.append({"s": section, "k": key, "v": value})
+            self._journal_seq += 1
+            self._cond.notify()
+
+    def flush(self):
+        """Pede gravação imediata do snapshot pendente"""
+        with self._cond:
+            if self._snapshot is not None:
+                self._dirty_since = 0.0
+            self._cond.notify()
+
+    def close(self):
+        """Grava tudo que estiver pendente e encerra a thread"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        else:
+            self._write_pending(force=True)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._closed and not self._journal and not self._snapshot_due():
+                    timeout = None
+                    if self._dirty_since is not None:
+                        timeout = max(0.0, self._dirty_since + self.flush_interval - time.monotonic())
+                    self._cond.wait(timeout)
+                closed = self._closed
+            self._write_pending(force=closed)
+            if closed:
+                return
+
+    def _snapshot_due(self) -> bool:
+        return (self._dirty_since is not None and
+                time.monotonic() - self._dirty_since >= self.flush_interval)
+
+    def _write_pending(self, force: bool = False):
+        """Grava o diário e, se já passou o debounce, o snapshot completo"""
+        with self._cond:
+            journal, self._journal = self._journal, []
+            journal_seq = self._journal_seq
+            snapshot, snapshot_seq = None, self._snapshot_seq
+            if self._snapshot is not None and (force or self._snapshot_due()):
+                snapshot, self._snapshot, self._dirty_since = self._snapshot, None, None
+
+        if journal:
+            with open(self.journal_path, "a") as f:
+                f.writelines(json.dumps(entry) + "\n" for entry in journal)
+                f.flush()
+                os.fsync(f.fileno())
+            self._written_seq = journal_seq
+
+        if snapshot is not None:
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(snapshot, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+
+            # Se o snapshot já contém tudo que foi para o diário, o diário pode ser zerado
+            if snapshot_seq >= self._written_seq:
+                open(self.journal_path, "w").close()
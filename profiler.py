@@ -0,0 +1,210 @@
+import os
+import json
+import time
+import functools
+import threading
+import pygame
+from collections import deque
+from typing import Callable, Dict, Optional
+
+# Fases do loop principal (cores do gráfico na tela)
+PHASE_COLORS = {
+    "tick": (90, 90, 90),
+    "handle_events": (50, 200, 50),
+    "update": (50, 120, 220),
+    "draw": (255, 215, 0),
+    "present": (200, 50, 50)
+}
+GRAPH_SIZE = (240, 90)
+GRAPH_MS = 33.4  # Altura do gráfico = 2 frames de 60 FPS
+TRACE_FLUSH_FRAMES = 600  # Grava o trace a cada ~10 s ligado (um crash não perde tudo)
+
+
+class Allocations:
+    """Superfícies criadas pelo jogo, contadas onde são criadas (Renderer, AssetManager, TextCache, UI)"""
+    count = 0
+    bytes = 0
+
+
+def allocated(surf: pygame.Surface) -> pygame.Surface:
+    """Conta uma superfície nova e a devolve (custa duas somas com o profiler desligado)"""
+    Allocations.count += 1
+    Allocations.bytes += surf.get_pitch() * surf.get_height()
+    return surf
+
+
+def profiled(method):
+    """Mede o tempo de um método do Game quando o profiler está ligado"""
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        prof = self.profiler
+        if not prof.enabled:
+            return method(self, *args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            prof.record(name, start, time.perf_counter())
+    return wrapper
+
+
+class FrameProfiler:
+    """Tempo de cada fase do frame, contadores de alocação e trace no formato do Chrome
+
+    Desligado, cada ponto de medição custa só um teste de self.enabled.
+    Ligue com DUELO_PROFILE=1 ou F3; o trace (chrome://tracing ou Perfetto) é
+    gravado em DUELO_TRACE a cada TRACE_FLUSH_FRAMES frames (numa thread), ao desligar e ao sair.
+    """
+
+    def __init__(self, enabled: bool = False, trace_path: str = "duelo_trace.json",
+                 trace_events: int = 20000, history: int = 120):
+        self.enabled = False
+        self.trace_path = trace_path
+        self.trace = deque(maxlen=trace_events)  # Buffer circular de eventos
+        self.history = deque(maxlen=history)  # Tempos totais dos últimos frames
+        self.sources: Dict[str, Callable[[], int]] = {  # Contadores lidos no início/fim do frame
+            "surfaces": lambda: Allocations.count,
+            "surface_bytes": lambda: Allocations.bytes
+        }
+
+        self.frame = 0
+        self.phases: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {}
+        self.last_frame_ms = 0.0
+        self.last_phases: Dict[str, float] = {}
+        self.last_counters: Dict[str, int] = {}
+
+        self._origin = time.perf_counter()
+        self._frame_start = None
+        self._source_start: Dict[str, int] = {}
+        self._writer: Optional[threading.Thread] = None
+        self.graph = None
+
+        if enabled:
+            self.set_enabled(True)
+
+    @classmethod
+    def from_env(cls) -> "FrameProfiler":
+        return cls(enabled=os.environ.get("DUELO_PROFILE") == "1",
+                   trace_path=os.environ.get("DUELO_TRACE", "duelo_trace.json"))
+
+    def set_enabled(self, enabled: bool):
+        if enabled == self.enabled:
+            return
+        self.enabled = enabled
+        if enabled:
+            self.graph = pygame.Surface(GRAPH_SIZE, pygame.SRCALPHA)
+            self.graph.fill((0, 0, 0, 160))
+        else:
+            self._frame_start = None
+            self.write_trace()
+
+    def toggle(self):
+        self.set_enabled(not self.enabled)
+
+    def watch(self, name: str, source: Callable[[], int]):
+        """Registra um contador externo (ex.: renderizações de fonte do TextCache)"""
+        self.sources[name] = source
+
+    # --- Medição ---
+    def now_us(self) -> float:
+        return (time.perf_counter() - self._origin) * 1e6
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self._frame_start = time.perf_counter()
+        self.phases = {}
+        self.counters = {}
+        self._source_start = {name: source() for name, source in self.sources.items()}
+
+    def end_frame(self):
+        if not self.enabled or self._frame_start is None:
+            return
+        end = time.perf_counter()
+        for name, source in self.sources.items():
+            self.counters[name] = source() - self._source_start.get(name, 0)
+
+        self.last_frame_ms = (end - self._frame_start) * 1000
+        self.last_phases = self.phases
+        self.last_counters = self.counters
+        self.history.append(self.last_frame_ms)
+
+        ts = (self._frame_start - self._origin) * 1e6
+        self.trace.append({"name": "frame", "ph": "X", "ts": round(ts, 1),
+                           "dur": round(self.last_frame_ms * 1000, 1), "pid": 1, "tid": 1,
+                           "args": {"frame": self.frame}})
+        self.trace.append({"name": "counters", "ph": "C", "ts": round(ts, 1), "pid": 1,
+                           "args": dict(self.counters)})
+        self._update_graph()
+        self.frame += 1
+        if self.frame % TRACE_FLUSH_FRAMES == 0:
+            self.write_trace(background=True)
+
+    def call(self, name: str, fn, *args):
+        """Chama fn(*args) medindo o tempo como uma fase do frame"""
+        if not self.enabled:
+            return fn(*args)
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            self.record(name, start, time.perf_counter())
+
+    def record(self, name: str, start: float, end: float):
+        ms = (end - start) * 1000
+        self.phases[name] = self.phases.get(name, 0.0) + ms
+        self.trace.append({"name": name, "ph": "X", "ts": round((start - self._origin) * 1e6, 1),
+                           "dur": round(ms * 1000, 1), "pid": 1, "tid": 1})
+
+    def count(self, name: str, n: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    # --- Gráfico na tela ---
+    def _update_graph(self):
+        """Rola o gráfico 2px e desenha a coluna do frame atual (fases empilhadas)"""
+        graph = self.graph
+        w, h = GRAPH_SIZE
+        graph.scroll(-2, 0)
+        graph.fill((0, 0, 0, 160), (w - 2, 0, 2, h))
+
+        y = h
+        for phase, color in PHASE_COLORS.items():
+            ms = self.last_phases.get(phase, 0.0)
+            bar = int(ms / GRAPH_MS * h)
+            if bar:
+                graph.fill(color, (w - 2, max(0, y - bar), 2, min(bar, y)))
+                y -= bar
+            if y <= 0:
+                break
+
+        # Linha de 16,7 ms (orçamento de 60 FPS)
+        graph.fill((255, 255, 255, 200), (w - 2, h - int(16.7 / GRAPH_MS * h), 2, 1))
+
+    # --- Trace ---
+    def write_trace(self, path: str = None, background: bool = False):
+        """Grava o buffer circular como JSON do Chrome trace (troca atômica do arquivo)"""
+        if not self.trace:
+            return
+        if self._writer is not None:
+            self._writer.join()  # Uma gravação por vez
+        events, path = list(self.trace), path or self.trace_path
+        if not background:
+            self._writer = None
+            _dump_trace(events, path)
+            return
+        self._writer = threading.Thread(target=_dump_trace, args=(events, path), name="trace", daemon=True)
+        self._writer.start()
+
+    def shutdown(self):
+        if self.enabled:
+            self.set_enabled(False)
+
+
+def _dump_trace(events: list, path: str):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, separators=(",", ":"))
+    os.replace(tmp_path, path)
@@ -0,0 +1,258 @@
+import os
+import pygame
+from typing import Dict, List, Optional
+from budget import FrameBudget
+from profiler import allocated
+
+# Escalas internas da cena (fração da resolução da tela), da maior para a menor
+SCALE_STEPS = (1.0, 0.875, 0.75, 0.625, 0.5)
+DOWNGRADE_FRAMES = 60  # Frames acima do orçamento (média) antes de baixar a escala (depois das partículas)
+UPGRADE_FRAMES = 300  # Frames bem abaixo do orçamento antes de subir de novo
+
+
+def scale_surface(surface: pygame.Surface, size) -> pygame.Surface:
+    """Cópia redimensionada com filtro (superfícies de 8/16 bits não aceitam smoothscale)"""
+    if surface.get_bitsize() >= 24:
+        return allocated(pygame.transform.smoothscale(surface, size))
+    return allocated(pygame.transform.scale(surface, size))
+
+
+class ResolutionScaler:
+    """Escala interna da cena ajustada pelo tempo de trabalho do frame
+
+    Usa o mesmo FrameBudget das partículas, só que mais lento para baixar: as partículas cedem primeiro.
+    """
+
+    def __init__(self, budget_ms: float = 1000 / 60, steps=SCALE_STEPS, scale: float = None):
+        self.steps = steps
+        self.auto = scale is None  # Escala fixa (DUELO_RENDER_SCALE) desliga o ajuste automático
+        self.budget = FrameBudget(budget_ms, len(steps), DOWNGRADE_FRAMES, UPGRADE_FRAMES,
+                                  0 if scale is None else min(range(len(steps)), key=lambda i: abs(steps[i] - scale)))
+
+    @classmethod
+    def from_env(cls, **kwargs) -> "ResolutionScaler":
+        """DUELO_RENDER_SCALE=0.5..1 fixa a escala (padrão: automática)"""
+        scale = os.environ.get("DUELO_RENDER_SCALE", "auto")
+        return cls(scale=None if scale == "auto" else float(scale), **kwargs)
+
+    @property
+    def level(self) -> int:
+        return self.budget.level
+
+    @property
+    def scale(self) -> float:
+        return self.steps[self.level]
+
+    def note_frame(self, work_ms: float):
+        """Média do tempo de trabalho do frame contra o orçamento"""
+        if self.auto:
+            self.budget.note(work_ms)
+
+
+class Renderer:
+    """Apresenta a lista de blits do frame: redesenho completo ou só retângulos sujos
+
+    A cena (fundo, personagens, balas, partículas, overlays) pode ser desenhada numa
+    superfície menor, na escala do ResolutionScaler, e ampliada uma vez para a tela;
+    os blits agendados depois de begin_hud() (textos, botões) vão direto para a tela
+    na resolução nativa. As coordenadas do jogo são sempre as da tela: a escala só
+    muda onde a cena é desenhada, então toques e layout não mudam.
+    """
+
+    def __init__(self, screen: pygame.Surface, dirty_mode: bool = False, max_dirty_ratio: float = 0.5,
+                 skip_unchanged: bool = True, scaler: ResolutionScaler = None):
+        self.screen = screen
+        self.dirty_mode = dirty_mode
+        self.skip_unchanged = skip_unchanged  # Quadro idêntico ao anterior não é redesenhado
+        self.max_dirty_ratio = max_dirty_ratio  # Acima disso compensa redesenhar tudo
+        self.scaler = scaler
+        self.background: Optional[pygame.Surface] = None
+        self.ops: List[tuple] = []
+        self.hud_start: Optional[int] = None  # Índice do primeiro blit da HUD (None = tudo é cena)
+
+        # Cena em resolução interna e cópias redimensionadas (por superfície, na escala atual)
+        self.scene: Optional[pygame.Surface] = None
+        self._scale = 1.0
+        self._scaled: Dict[int, tuple] = {}  # id(original) -> (original, cópia)
+
+        self._prev_ops = {}
+        self._extra_dirty: List[pygame.Rect] = []
+        self._prev_background = None
+        self._full_redraw = True
+        self.last_dirty_rects: List[pygame.Rect] = []
+
+    def set_mode(self, dirty_mode: bool):
+        """Alterna entre redesenho completo e retângulos sujos"""
+        self.dirty_mode = dirty_mode
+        self.invalidate()
+
+    def invalidate(self):
+        """Força redesenho completo no próximo frame"""
+        self._full_redraw = True
+
+    def begin(self, background: pygame.Surface):
+        """Inicia um frame novo com o fundo indicado"""
+        self.background = background
+        self.ops = []
+        self.hud_start = None
+        self._extra_dirty = []
+
+    def begin_hud(self):
+        """Os próximos blits são da HUD: desenhados na tela em resolução nativa"""
+        self.hud_start = len(self.ops)
+
+    @property
+    def scale(self) -> float:
+        """Escala em que a cena é desenhada agora"""
+        return self._scale
+
+    def mark_dirty(self, rect: pygame.Rect):
+        """Marca uma área como suja (superfície alterada no lugar, sem trocar de objeto)"""
+        self._extra_dirty.append(pygame.Rect(rect))
+
+    def blit(self, surface: pygame.Surface, pos, area: pygame.Rect = None):
+        """Agenda um blit para o frame atual"""
+        self.ops.append((surface, (int(pos[0]), int(pos[1])), area))
+
+    def blit_many(self, surface: pygame.Surface, positions):
+        """Agenda a mesma superfície em várias posições"""
+        self.ops.extend((surface, (int(x), int(y)), None) for x, y in positions)
+
+    def blits(self, ops):
+        """Agenda vários blits (superfície, destino, área)"""
+        for op in ops:
+            self.blit(*op)
+
+    @staticmethod
+    def _op_key(op) -> tuple:
+        surface, dest, area = op
+        return (surface, dest, tuple(area) if area is not None else None)
+
+    @staticmethod
+    def _op_rect(op) -> pygame.Rect:
+        surface, dest, area = op
+        if area is not None:
+            return pygame.Rect(dest[0], dest[1], area[2], area[3])
+        return pygame.Rect(dest, surface.get_size())
+
+    def _dirty_rects(self, current: dict) -> List[pygame.Rect]:
+        """Retângulos de tudo que apareceu, sumiu ou mudou desde o último frame"""
+        rects = [self._op_rect(op) for key, op in current.items() if key not in self._prev_ops]
+        rects += [self._op_rect(op) for key, op in self._prev_ops.items() if key not in current]
+        rects += self._extra_dirty
+
+        # Junta retângulos sobrepostos para não redesenhar a mesma área duas vezes
+        merged: List[pygame.Rect] = []
+        for rect in rects:
+            rect = rect.clip(self.screen.get_rect())
+            if not rect.w or not rect.h:
+                continue
+            i = rect.collidelist(merged)
+            while i != -1:
+                rect.union_ip(merged.pop(i))
+                i = rect.collidelist(merged)
+            merged.append(rect)
+        return merged
+
+    # --- Cena em resolução interna ---
+    def _set_scale(self, scale: float):
+        if scale == self._scale:
+            return
+        self._scale = scale
+        self._scaled = {}
+        self.scene = None
+        self._full_redraw = True
+
+    def _scaled_surface(self, surface: pygame.Surface) -> pygame.Surface:
+        """Cópia da superfície na escala atual (feita uma vez, guardada até a escala ou o fundo mudar)"""
+        entry = self._scaled.get(id(surface))
+        if entry is None:
+            s = self._scale
+            w, h = surface.get_size()
+            entry = self._scaled[id(surface)] = (surface, scale_surface(surface, (max(1, round(w * s)),
+                                                                                  max(1, round(h * s)))))
+        return entry[1]
+
+    def _scene_op(self, op) -> tuple:
+        surface, (x, y), area = op
+        s = self._scale
+        if area is not None:
+            area = pygame.Rect(round(area[0] * s), round(area[1] * s), round(area[2] * s), round(area[3] * s))
+        return self._scaled_surface(surface), (round(x * s), round(y * s)), area
+
+    def _present_scaled(self):
+        """Cena na superfície interna, ampliada para a tela, e a HUD por cima em resolução nativa"""
+        screen = self.screen
+        if self.background is not self._prev_background:
+            self._scaled = {}  # Troca de tela: as cópias da tela anterior saem da memória
+        if self.scene is None:
+            size = (round(screen.get_width() * self._scale), round(screen.get_height() * self._scale))
+            self.scene = allocated(pygame.Surface(size).convert(screen))
+        split = len(self.ops) if self.hud_start is None else self.hud_start
+        self.scene.blit(self._scaled_surface(self.background), (0, 0))
+        self.scene.blits([self._scene_op(op) for op in self.ops[:split]], doreturn=False)
+        pygame.transform.scale(self.scene, screen.get_size(), screen)  # Escreve na tela: nada novo
+        screen.blits(self.ops[split:], doreturn=False)
+        pygame.display.flip()
+        self.last_dirty_rects = [screen.get_rect()]
+
+    def memory(self) -> int:
+        """Bytes da cena interna e das cópias redimensionadas"""
+        surfaces = [copy for _, copy in self._scaled.values()]
+        if self.scene is not None:
+            surfaces.append(self.scene)
+        return sum(surf.get_pitch() * surf.get_height() for surf in surfaces)
+
+    def note_frame(self, work_ms: float):
+        """Tempo de trabalho do frame para o ajuste automático da escala"""
+        if self.scaler is not None:
+            self.scaler.note_frame(work_ms)
+
+    def present(self):
+        """Desenha o frame e envia para a tela"""
+        screen = self.screen
+        if self.scaler is not None:
+            self._set_scale(self.scaler.scale)
+        current = {self._op_key(op): op for op in self.ops}
+
+        # Tela parada (mesmo fundo e mesmos blits): nada a desenhar nem a enviar
+        if (self.skip_unchanged and not self._full_redraw and not self._extra_dirty and
+                self.background is self._prev_background and current.keys() == self._prev_ops.keys()):
+            self.last_dirty_rects = []
+            return
+
+        if self._scale < 1.0:
+            # Cena reduzida: sempre quadro inteiro (retângulos sujos só na escala 1)
+            self._present_scaled()
+            self._prev_ops = current
+            self._prev_background = self.background
+            self._full_redraw = False
+            return
+
+        full = (not self.dirty_mode or self._full_redraw or
+                self.background is not self._prev_background)
+        dirty = []
+        if not full:
+            dirty = self._dirty_rects(current)
+            area = sum(r.w * r.h for r in dirty)
+            full = area > self.max_dirty_ratio * screen.get_width() * screen.get_height()
+
+        if full:
+            screen.blit(self.background, (0, 0))
+            screen.blits(self.ops, doreturn=False)
+            pygame.display.flip()
+            self.last_dirty_rects = [screen.get_rect()]
+        else:
+            # Restaura só as áreas sujas a partir do fundo e redesenha recortado
+            for rect in dirty:
+                screen.set_clip(rect)
+                screen.blit(self.background, rect, rect)
+                screen.blits(self.ops, doreturn=False)
+            screen.set_clip(None)
+            if dirty:
+                pygame.display.update(dirty)
+            self.last_dirty_rects = dirty
+
+        self._prev_ops = current
+        self._prev_background = self.background
+        self._full_redraw = False
@@ -0,0 +1,103 @@
+import os
+import threading
+import pygame
+
+DEFAULT_FPS = 60
+DEFAULT_TICK_RATE = 60  # Passos de lógica por segundo (duel_engine.TICK_RATE)
+AUDIO_RATE = 44100
+AUDIO_BUFFER = 512  # Amostras por buffer do mixer: menor = tiro soa mais rápido (~12 ms a 44,1 kHz)
+HEADLESS_SIZE = (1280, 720)  # Tamanho da tela no modo sem janela
+
+
+class Runtime:
+    """Inicialização explícita do pygame: tela, relógio e só os subsistemas necessários
+
+    Nada disso acontece ao importar os módulos do jogo; quem cria o Runtime (main(),
+    testes, benchmarks) decide se quer janela, áudio ou o driver "dummy" do SDL.
+    """
+
+    def __init__(self, size=None, fullscreen: bool = True, headless: bool = False,
+                 audio: bool = True, fps: int = DEFAULT_FPS, tick_rate: int = DEFAULT_TICK_RATE,
+                 audio_rate: int = AUDIO_RATE, audio_buffer: int = AUDIO_BUFFER):
+        self.headless = headless
+        self.audio_rate = audio_rate
+        self.audio_buffer = audio_buffer
+        self.fps = fps
+        self.tick_rate = tick_rate
+
+        if headless:
+            os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+            os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+        # Só vídeo e fonte; o resto do pygame.init() (joystick, etc.) não é usado
+        pygame.display.init()
+        pygame.font.init()
+
+        if size is None:
+            if headless:
+                size = HEADLESS_SIZE
+            else:
+                info = pygame.display.Info()
+                size = (info.current_w, info.current_h)
+        self.width, self.height = size
+        self.ground_y = self.height * 0.90  # Chão a 90% da tela
+
+        flags = pygame.FULLSCREEN | pygame.SCALED if fullscreen and not headless else 0
+        self.screen = pygame.display.set_mode((self.width, self.height), flags)
+        pygame.display.set_caption("Duelo no Oeste: Showdown Extremo")
+        self.clock = pygame.time.Clock()
+        if not self.fps:  # fps=0: usa a taxa de atualização nativa da tela
+            self.fps = self.native_refresh_rate()
+
+        # O mixer costuma ser o que trava a inicialização: abre em segundo plano
+        self.audio = False
+        self._audio_thread = None
+        if audio:
+            self._audio_thread = threading.Thread(target=self._init_audio, name="mixer-init", daemon=True)
+            self._audio_thread.start()
+
+    @classmethod
+    def from_env(cls) -> "Runtime":
+        """Cria o Runtime a partir das variáveis DUELO_* do ambiente"""
+        size = None
+        if os.environ.get("DUELO_WINDOW"):
+            size = tuple(int(v) for v in os.environ["DUELO_WINDOW"].lower().split("x"))
+        fps = os.environ.get("DUELO_FPS", str(DEFAULT_FPS))  # "native" = taxa da tela
+        return cls(size=size,
+                   fullscreen=size is None,
+                   headless=os.environ.get("DUELO_HEADLESS") == "1",
+                   audio=os.environ.get("DUELO_NO_AUDIO") != "1",
+                   fps=0 if fps == "native" else int(fps),
+                   tick_rate=int(os.environ.get("DUELO_TICK_RATE", DEFAULT_TICK_RATE)),
+                   audio_rate=int(os.environ.get("DUELO_AUDIO_RATE", AUDIO_RATE)),
+                   audio_buffer=int(os.environ.get("DUELO_AUDIO_BUFFER", AUDIO_BUFFER)))
+
+    @staticmethod
+    def native_refresh_rate() -> int:
+        """Taxa de atualização da tela (quando o pygame sabe informar), senão DEFAULT_FPS"""
+        rates = getattr(pygame.display, "get_desktop_refresh_rates", None)
+        try:
+            rate = rates()[0] if rates else 0
+        except (pygame.error, IndexError):
+            rate = 0
+        return rate or DEFAULT_FPS
+
+    @property
+    def size(self):
+        return (self.width, self.height)
+
+    def _init_audio(self):
+        try:
+            pygame.mixer.init(frequency=self.audio_rate, size=-16, channels=2, buffer=self.audio_buffer)
+            self.audio = True
+        except pygame.error:
+            self.audio = False
+
+    def wait_audio(self) -> bool:
+        """Espera o mixer abrir; retorna se há áudio disponível"""
+        if self._audio_thread is not None:
+            self._audio_thread.join()
+        return self.audio
+
+    def shutdown(self):
+        pygame.quit()
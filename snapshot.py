@@ -0,0 +1,107 @@
+import os
+import struct
+import zlib
+import numpy as np
+from typing import Dict, Optional
+from duel_engine import DuelEngine, BulletPool
+
+# Snapshot binário do duelo em andamento (suspender/retomar no celular):
+# cabeçalho fixo + campos do Game num struct + bytes crus dos arrays do motor e das balas.
+# Sem pickle nem JSON: gravar e ler são poucas cópias de memória.
+
+MAGIC = b"DSNP"
+VERSION = 1  # Mude quando os campos do Game mudarem
+HEADER = struct.Struct("<4sHII")  # Magia, versão, layout dos arrays, crc32 do corpo
+GAME = struct.Struct("<BBiHHHHbdd")  # Modo, estado, pontos, rodada, vitórias, placar PvP (2), contagem, relógios
+POOL = struct.Struct("<qq")  # Topo da pilha livre e próximo número de sequência das balas
+
+MODES = (None, "arcade", "pvp")
+STATES = ("countdown", "duel", "result")  # Estados que podem ser retomados
+
+
+def _arrays(engine: DuelEngine):
+    """Arrays do estado em ordem fixa: os do motor e depois os do pool de balas"""
+    for name in DuelEngine.STATE:
+        yield getattr(engine, name)
+    for name in BulletPool.STATE:
+        yield getattr(engine.bullets, name)
+
+
+def layout(engine: DuelEngine) -> int:
+    """Assinatura dos arrays (nome, tipo e tamanho), do passo e da geometria do motor
+
+    Outro formato, outro DUELO_TICK_RATE ou outra tela invalida o snapshot: as posições
+    e os relógios salvos só valem no passo e nas posições em que foram gravados.
+    """
+    names = DuelEngine.STATE + BulletPool.STATE
+    spec = ",".join(f"{name}:{a.dtype.str}:{a.size}" for name, a in zip(names, _arrays(engine)))
+    spec += f";{engine.tick_ms!r}:{engine.screen_width!r}:{engine.ground_y!r}"
+    return zlib.crc32(spec.encode())
+
+
+def pack(game: Dict, engine: DuelEngine) -> bytes:
+    """Serializa os campos do Game e o estado do motor (duelo 0)"""
+    bullets = engine.bullets
+    body = [GAME.pack(MODES.index(game["game_mode"]), STATES.index(game["game_state"]),
+                      game["arcade_score"], game["arcade_round"], game["arcade_wins"],
+                      game["pvp_score"][0], game["pvp_score"][1], game["countdown"],
+                      game["sim_time"], game["countdown_start"]),
+            POOL.pack(bullets._free_top, bullets._next_seq)]
+    body.extend(a.tobytes() for a in _arrays(engine))
+    body = b"".join(body)
+    return HEADER.pack(MAGIC, VERSION, layout(engine), zlib.crc32(body)) + body
+
+
+def unpack(data: bytes, engine: DuelEngine) -> Optional[Dict]:
+    """Aplica o snapshot no motor e retorna os campos do Game (None se inválido ou de outra versão)"""
+    if len(data) < HEADER.size:
+        return None
+    magic, version, signature, crc = HEADER.unpack_from(data)
+    body = memoryview(data)[HEADER.size:]
+    if magic != MAGIC or version != VERSION or signature != layout(engine) or zlib.crc32(body) != crc:
+        return None
+
+    mode, state, score, arcade_round, wins, pvp1, pvp2, countdown, sim_time, countdown_start = GAME.unpack_from(body)
+    free_top, next_seq = POOL.unpack_from(body, GAME.size)
+    offset = GAME.size + POOL.size
+
+    arrays = {}
+    for name, current in zip(DuelEngine.STATE + BulletPool.STATE, _arrays(engine)):
+        arrays[name] = np.frombuffer(body, dtype=current.dtype, count=current.size, offset=offset)
+        offset += current.nbytes
+    engine_state = {name: arrays[name] for name in DuelEngine.STATE}
+    engine_state["bullets"] = dict({name: arrays[name] for name in BulletPool.STATE},
+                                   _free_top=free_top, _next_seq=next_seq)
+    engine.set_state(engine_state)
+
+    return {"game_mode": MODES[mode], "game_state": STATES[state], "arcade_score": score,
+            "arcade_round": arcade_round, "arcade_wins": wins, "pvp_score": [pvp1, pvp2],
+            "countdown": countdown, "sim_time": sim_time, "countdown_start": countdown_start}
+
+
+def write(path: str, data: bytes):
+    """Grava de forma atômica (arquivo temporário + os.replace), já no disco ao retornar"""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def take(path: str) -> Optional[bytes]:
+    """Lê e apaga o snapshot (cada um é retomado uma vez só)"""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    clear(path)
+    return data
+
+
+def clear(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -0,0 +1,178 @@
+import time
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, List
+
+# Uma linha por duelo; os agregados (por rodada e por dia) são mantidos por gatilhos no
+# mesmo INSERT, então as telas só leem tabelas pequenas e nunca varrem o histórico.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS duels (
+    id INTEGER PRIMARY KEY,
+    played_at REAL NOT NULL,
+    day TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    round INTEGER NOT NULL,
+    winner INTEGER NOT NULL,
+    won INTEGER NOT NULL,
+    reaction_ms REAL,
+    duel_ms REAL,
+    shots_fired INTEGER NOT NULL,
+    shots_hit INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS duels_reaction ON duels (won, reaction_ms);
+CREATE INDEX IF NOT EXISTS duels_mode_round ON duels (mode, round);
+CREATE INDEX IF NOT EXISTS duels_day ON duels (day);
+
+CREATE TABLE IF NOT EXISTS round_totals (
+    mode TEXT NOT NULL,
+    round INTEGER NOT NULL,
+    duels INTEGER NOT NULL,
+    wins INTEGER NOT NULL,
+    shots_fired INTEGER NOT NULL,
+    shots_hit INTEGER NOT NULL,
+    best_reaction_ms REAL,
+    PRIMARY KEY (mode, round)
+);
+CREATE TABLE IF NOT EXISTS daily_totals (
+    day TEXT PRIMARY KEY,
+    duels INTEGER NOT NULL,
+    wins INTEGER NOT NULL,
+    shots_fired INTEGER NOT NULL,
+    shots_hit INTEGER NOT NULL
+);
+
+CREATE TRIGGER IF NOT EXISTS duels_totals AFTER INSERT ON duels BEGIN
+    INSERT INTO round_totals VALUES (NEW.mode, NEW.round, 1, NEW.won, NEW.shots_fired, NEW.shots_hit,
+                                     CASE WHEN NEW.won THEN NEW.reaction_ms END)
+    ON CONFLICT (mode, round) DO UPDATE SET
+        duels = duels + 1,
+        wins = wins + excluded.wins,
+        shots_fired = shots_fired + excluded.shots_fired,
+        shots_hit = shots_hit + excluded.shots_hit,
+        best_reaction_ms = coalesce(min(best_reaction_ms, excluded.best_reaction_ms),
+                                    best_reaction_ms, excluded.best_reaction_ms);
+    INSERT INTO daily_totals VALUES (NEW.day, 1, NEW.won, NEW.shots_fired, NEW.shots_hit)
+    ON CONFLICT (day) DO UPDATE SET
+        duels = duels + 1,
+        wins = wins + excluded.wins,
+        shots_fired = shots_fired + excluded.shots_fired,
+        shots_hit = shots_hit + excluded.shots_hit;
+END;
+"""
+
+COLUMNS = ("played_at", "day", "mode", "round", "winner", "won", "reaction_ms", "duel_ms",
+           "shots_fired", "shots_hit")
+
+
+class StatsStore:
+    """Estatísticas por duelo em SQLite, gravadas em lote por uma thread própria
+
+    record() só enfileira a linha. A thread grava os lotes numa transação e, depois
+    de cada commit, recalcula o resumo (lido das tabelas de agregados) que as telas
+    usam sem tocar no banco.
+    """
+
+    def __init__(self, path: str = "stats.db", flush_interval: float = 1.0, batch_size: int = 64):
+        self.path = path
+        self.flush_interval = flush_interval  # Espera máxima antes de gravar um lote (segundos)
+        self.batch_size = batch_size
+
+        self._cond = threading.Condition()
+        self._pending: List[tuple] = []
+        self._pending_since = None
+        self._closed = False
+        self._thread = None
+        self.summary: Dict = self.empty_summary()
+
+    @staticmethod
+    def empty_summary() -> Dict:
+        return {"total": {"duels": 0, "wins": 0, "shots_fired": 0, "shots_hit": 0},
+                "rounds": {}, "today": {"duels": 0, "wins": 0, "shots_fired": 0, "shots_hit": 0},
+                "best_reaction_ms": None}
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="stats-store", daemon=True)
+            self._thread.start()
+
+    def record(self, mode: str, arcade_round: int, winner: int, won: bool, reaction_ms, duel_ms,
+               shots_fired: int, shots_hit: int):
+        """Enfileira o resultado de um duelo (sem I/O nesta thread)"""
+        now = time.time()
+        row = (now, datetime.fromtimestamp(now).strftime("%Y-%m-%d"), mode, arcade_round, winner,
+               int(won), reaction_ms, duel_ms, shots_fired, shots_hit)
+        with self._cond:
+            self._pending.append(row)
+            if self._pending_since is None:
+                self._pending_since = time.monotonic()
+            self._cond.notify()
+
+    def flush(self):
+        """Pede gravação imediata do lote pendente"""
+        with self._cond:
+            if self._pending:
+                self._pending_since = 0.0
+            self._cond.notify()
+
+    def close(self):
+        """Grava o que estiver pendente e encerra a thread"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _batch_due(self) -> bool:
+        return bool(self._pending) and (len(self._pending) >= self.batch_size or
+                                        time.monotonic() - self._pending_since >= self.flush_interval)
+
+    def _run(self):
+        db = sqlite3.connect(self.path)
+        try:
+            db.executescript(SCHEMA)
+            self.summary = self._summarize(db)
+            while True:
+                with self._cond:
+                    while not self._closed and not self._batch_due():
+                        timeout = None
+                        if self._pending_since is not None:
+                            timeout = max(0.0, self._pending_since + self.flush_interval - time.monotonic())
+                        self._cond.wait(timeout)
+                    batch, self._pending, self._pending_since = self._pending, [], None
+                    closed = self._closed
+
+                if batch:
+                    with db:  # Uma transação por lote
+                        db.executemany(f"INSERT INTO duels ({', '.join(COLUMNS)}) "
+                                       f"VALUES ({', '.join('?' * len(COLUMNS))})", batch)
+                    self.summary = self._summarize(db)
+                if closed:
+                    return
+        finally:
+            db.close()
+
+    @staticmethod
+    def _summarize(db: sqlite3.Connection) -> Dict:
+        """Resumo a partir dos agregados (tabelas pequenas) e do índice de reação"""
+        summary = StatsStore.empty_summary()
+        total = summary["total"]
+        for mode, arcade_round, duels, wins, fired, hit, best in db.execute(
+                "SELECT mode, round, duels, wins, shots_fired, shots_hit, best_reaction_ms FROM round_totals"):
+            summary["rounds"][(mode, arcade_round)] = {"duels": duels, "wins": wins, "shots_fired": fired,
+                                                       "shots_hit": hit, "best_reaction_ms": best}
+            total["duels"] += duels
+            total["wins"] += wins
+            total["shots_fired"] += fired
+            total["shots_hit"] += hit
+
+        today = db.execute("SELECT duels, wins, shots_fired, shots_hit FROM daily_totals WHERE day = ?",
+                           (datetime.now().strftime("%Y-%m-%d"),)).fetchone()
+        if today:
+            summary["today"] = dict(zip(("duels", "wins", "shots_fired", "shots_hit"), today))
+
+        # MIN sobre o índice (won, reaction_ms): busca direta, sem varrer a tabela
+        summary["best_reaction_ms"] = db.execute(
+            "SELECT min(reaction_ms) FROM duels WHERE won = 1").fetchone()[0]
+        return summary
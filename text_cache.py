@@ -0,0 +1,101 @@
+import pygame
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+from profiler import allocated
+
+# Caracteres que ficam no atlas de números (placar, contagem, precisão...)
+GLYPH_CHARS = "0123456789/-.:%+ "
+
+
+class GlyphAtlas:
+    """Atlas com os glifos numéricos de uma fonte/cor, renderizados uma única vez"""
+
+    def __init__(self, font: pygame.font.Font, color, chars: str = GLYPH_CHARS):
+        self.height = font.get_height()
+        self.areas: Dict[str, pygame.Rect] = {}
+
+        glyphs = [(ch, font.render(ch, True, color)) for ch in chars]
+        width = sum(g.get_width() for _, g in glyphs)
+        self.surface = allocated(pygame.Surface((max(1, width), self.height), pygame.SRCALPHA))
+
+        x = 0
+        for ch, glyph in glyphs:
+            self.surface.blit(glyph, (x, 0))
+            self.areas[ch] = pygame.Rect(x, 0, glyph.get_width(), self.height)
+            x += glyph.get_width()
+
+    def supports(self, text: str) -> bool:
+        """Verifica se todos os caracteres estão no atlas"""
+        return all(ch in self.areas for ch in text)
+
+    def width(self, text: str) -> int:
+        """Largura do texto montado com os glifos do atlas"""
+        return sum(self.areas[ch].width for ch in text)
+
+    def ops(self, text: str, pos) -> List[Tuple[pygame.Surface, Tuple[int, int], pygame.Rect]]:
+        """Lista de blits (atlas, destino, área) para usar com Surface.blits"""
+        x, y = int(pos[0]), int(pos[1])
+        result = []
+        for ch in text:
+            area = self.areas[ch]
+            result.append((self.surface, (x, y), area))
+            x += area.width
+        return result
+
+
+class TextCache:
+    """Cache LRU de textos renderizados, chaveado por (fonte, texto, cor)"""
+
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self._surfaces: "OrderedDict[tuple, pygame.Surface]" = OrderedDict()
+        self._atlases: Dict[tuple, GlyphAtlas] = {}
+
+        # Contadores para confirmar que frames estáveis não rasterizam fonte
+        self.hits = 0
+        self.misses = 0
+        self.glyph_hits = 0
+        self.glyph_misses = 0
+
+    def render(self, font: pygame.font.Font, text: str, color) -> pygame.Surface:
+        """Retorna o texto renderizado, rasterizando só na primeira vez"""
+        key = (font, text, tuple(color))
+        surf = self._surfaces.get(key)
+        if surf is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surf
+
+        self.misses += 1
+        surf = allocated(font.render(text, True, color))
+        self._surfaces[key] = surf
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+        return surf
+
+    def atlas(self, font: pygame.font.Font, color) -> GlyphAtlas:
+        """Retorna (ou cria) o atlas de glifos numéricos para fonte/cor"""
+        key = (font, tuple(color))
+        atlas = self._atlases.get(key)
+        if atlas is None:
+            self.glyph_misses += 1
+            atlas = self._atlases[key] = GlyphAtlas(font, color)
+        else:
+            self.glyph_hits += 1
+        return atlas
+
+    def memory(self) -> int:
+        """Bytes de pixels dos textos e atlas guardados"""
+        surfaces = list(self._surfaces.values()) + [atlas.surface for atlas in self._atlases.values()]
+        return sum(surf.get_pitch() * surf.get_height() for surf in surfaces)
+
+    def stats(self) -> Dict[str, int]:
+        """Contadores de acerto/falha do cache"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "glyph_hits": self.glyph_hits,
+            "glyph_misses": self.glyph_misses,
+            "entries": len(self._surfaces),
+            "atlases": len(self._atlases)
+        }
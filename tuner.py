@@ -0,0 +1,161 @@
+import os
+import sys
+import time
+import argparse
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+
+from duel_engine import (DuelEngine, DifficultyTable, MAX_ROUNDS, sample_human_reaction,
+                         calculate_difficulty, calculate_ai_reaction_time)
+
+# Ajuste offline da curva do arcade: varre (dificuldade, reação da IA) em paralelo,
+# simula muitos duelos por candidato contra jogadores modelados e escolhe, para cada
+# rodada, o candidato que chega na taxa de vitória alvo. Gera difficulty.json.
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Jogadores modelados: mediana da reação (ms), sigma da log-normal e peso na população
+HUMAN_MODELS = {
+    "casual": (330, 0.30, 0.4),
+    "average": (260, 0.25, 0.4),
+    "skilled": (210, 0.20, 0.2)
+}
+
+DIFFICULTY_RANGE = (0.5, 10.0)
+REACTION_RANGE = (100.0, 600.0)
+SMOOTH = 0.01  # Peso da distância até a curva original (desempate entre candidatos no alvo)
+
+
+def target_curve(first: float, last: float, rounds: int = MAX_ROUNDS) -> np.ndarray:
+    """Taxa de vitória alvo por rodada (linear da primeira à última)"""
+    return np.linspace(first, last, rounds)
+
+
+def evaluate(candidates: np.ndarray, duels: int, seed: int) -> np.ndarray:
+    """Taxa de vitória de cada candidato (linhas: dificuldade, reação) por modelo de jogador
+
+    Todos os candidatos usam os mesmos tempos humanos e os mesmos fluxos da IA
+    (números aleatórios comuns), então a diferença entre eles é só o parâmetro.
+    """
+    k = len(candidates)
+    table = DifficultyTable(np.concatenate(([1.0], candidates[:, 0])),
+                            np.concatenate(([1000.0], candidates[:, 1])))
+    engine = DuelEngine(k * duels, max_bullets=4, table=table)
+    rows = np.repeat(np.arange(1, k + 1), duels)
+    streams = np.tile(np.arange(duels, dtype=np.uint64), k) + np.uint64(seed)
+
+    rng = np.random.default_rng(seed)
+    rates = np.zeros((k, len(HUMAN_MODELS)))
+    for j, (median_ms, sigma, _) in enumerate(HUMAN_MODELS.values()):
+        human = np.tile(sample_human_reaction(rng, duels, median_ms, sigma), k)
+        engine.reset(arcade_round=rows, arcade=True, seed=streams + np.uint64(j << 32))
+        winners = engine.run(human)
+        rates[:, j] = (winners == 1).reshape(k, duels).mean(axis=1)
+    return rates
+
+
+def sweep(pool: ProcessPoolExecutor, candidates: np.ndarray, duels: int, seed: int,
+          chunk: int = 16) -> np.ndarray:
+    """Avalia os candidatos em blocos no pool; retorna a taxa da população (média ponderada)"""
+    chunks = [candidates[i:i + chunk] for i in range(0, len(candidates), chunk)]
+    results = pool.map(evaluate, chunks, [duels] * len(chunks), [seed] * len(chunks))
+    weights = np.array([weight for _, _, weight in HUMAN_MODELS.values()])
+    return np.concatenate(list(results)) @ (weights / weights.sum())
+
+
+def grid(difficulty: np.ndarray, reaction_ms: np.ndarray) -> np.ndarray:
+    d, r = np.meshgrid(difficulty, reaction_ms, indexing="ij")
+    return np.column_stack((d.ravel(), r.ravel()))
+
+
+def choose(candidates: np.ndarray, rates: np.ndarray, target: float, reference: tuple, floor: tuple) -> int:
+    """Candidato mais perto do alvo, sem ficar mais fácil que a rodada anterior (floor)
+
+    Entre candidatos igualmente bons, prefere o mais próximo da curva original.
+    """
+    d, r = candidates[:, 0], candidates[:, 1]
+    span_d = DIFFICULTY_RANGE[1] - DIFFICULTY_RANGE[0]
+    span_r = REACTION_RANGE[1] - REACTION_RANGE[0]
+    cost = np.abs(rates - target) + SMOOTH * (np.abs(d - reference[0]) / span_d +
+                                              np.abs(r - reference[1]) / span_r)
+    harder = (d >= floor[0]) & (r <= floor[1])
+    if harder.any():
+        cost[~harder] = np.inf
+    return int(np.argmin(cost))
+
+
+def pick_rounds(candidates: np.ndarray, rates: np.ndarray, targets: np.ndarray, groups=None) -> List[int]:
+    """Escolhe um candidato por rodada, em ordem (groups: índices permitidos por rodada)"""
+    picks = []
+    floor = (DIFFICULTY_RANGE[0], REACTION_RANGE[1])
+    for arcade_round, target in enumerate(targets, start=1):
+        allowed = np.arange(len(candidates)) if groups is None else groups[arcade_round - 1]
+        reference = (calculate_difficulty(arcade_round), calculate_ai_reaction_time(arcade_round))
+        best = allowed[choose(candidates[allowed], rates[allowed], target, reference, floor)]
+        picks.append(int(best))
+        floor = tuple(candidates[best])
+    return picks
+
+
+def tune(targets: np.ndarray, duels: int = 2000, refine_duels: int = 4000, workers: int = None,
+         seed: int = 0, log=print) -> Dict:
+    """Busca em dois estágios: grade grossa para todas as rodadas, depois grade fina em volta de cada escolha"""
+    coarse = grid(np.arange(DIFFICULTY_RANGE[0], DIFFICULTY_RANGE[1] + 1e-9, 0.5),
+                  np.arange(REACTION_RANGE[0], REACTION_RANGE[1] + 1e-9, 50.0))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        start = time.perf_counter()
+        coarse_rates = sweep(pool, coarse, duels, seed)
+        log(f"Grade grossa: {len(coarse)} candidatos em {time.perf_counter() - start:.1f}s")
+        picks = pick_rounds(coarse, coarse_rates, targets)
+
+        # Grade fina em volta de cada escolha (todas as rodadas num único lote do pool)
+        fine, groups = [], []
+        for best in picks:
+            d, r = coarse[best]
+            local = grid(np.clip(np.arange(d - 0.5, d + 0.5 + 1e-9, 0.1), *DIFFICULTY_RANGE),
+                         np.clip(np.arange(r - 50.0, r + 50.0 + 1e-9, 25.0), *REACTION_RANGE))
+            groups.append(np.arange(len(local)) + sum(len(g) for g in fine))
+            fine.append(local)
+        fine = np.concatenate(fine)
+        start = time.perf_counter()
+        fine_rates = sweep(pool, fine, refine_duels, seed + 1)
+        log(f"Grade fina: {len(fine)} candidatos em {time.perf_counter() - start:.1f}s")
+        picks = pick_rounds(fine, fine_rates, targets, groups)
+
+    chosen = fine[picks]
+    table = DifficultyTable(np.concatenate(([calculate_difficulty(0, False)], chosen[:, 0])),
+                            np.concatenate(([calculate_ai_reaction_time(0, False)], chosen[:, 1])))
+    return {"table": table, "target": targets.tolist(), "win_rate": fine_rates[picks].tolist()}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Ajusta a curva de dificuldade do arcade")
+    parser.add_argument("--first", type=float, default=0.80, help="Taxa de vitória alvo na rodada 1")
+    parser.add_argument("--last", type=float, default=0.30, help="Taxa de vitória alvo na última rodada")
+    parser.add_argument("--duels", type=int, default=2000, help="Duelos por candidato e modelo (grade grossa)")
+    parser.add_argument("--refine-duels", type=int, default=4000, help="Duelos por candidato e modelo (grade fina)")
+    parser.add_argument("--workers", type=int, help="Processos do pool (padrão: núcleos da máquina)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default=os.path.join(REPO_DIR, "difficulty.json"))
+    args = parser.parse_args(argv)
+
+    targets = target_curve(args.first, args.last)
+    result = tune(targets, args.duels, args.refine_duels, args.workers, args.seed)
+    table = result["table"]
+    for arcade_round in range(1, table.rounds + 1):
+        print(f"Rodada {arcade_round:2d}: dificuldade {table.difficulty[arcade_round]:4.1f}  "
+              f"reação {table.reaction_ms[arcade_round]:5.0f} ms  "
+              f"vitórias {result['win_rate'][arcade_round - 1] * 100:5.1f}% "
+              f"(alvo {targets[arcade_round - 1] * 100:.0f}%)")
+
+    table.save(args.out, target=[round(t, 3) for t in result["target"]],
+               win_rate=[round(w, 3) for w in result["win_rate"]],
+               models={name: list(model) for name, model in HUMAN_MODELS.items()},
+               duels=args.refine_duels, seed=args.seed)
+    print(f"Tabela gravada em {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
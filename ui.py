@@ -0,0 +1,196 @@
+import pygame
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional, Tuple
+from profiler import allocated
+
+# Estados de um widget (mudar de estado é o único motivo para redesenhar a superfície)
+NORMAL, PRESSED, DISABLED = "normal", "pressed", "disabled"
+PRESS_MS = 120  # Tempo que o botão fica "apertado" depois do toque
+GRID_CELL = 128  # Lado da célula do índice espacial (px)
+
+
+class Widget(ABC):
+    """Elemento retido: guarda retângulo e estado e só re-renderiza a superfície quando mudam"""
+
+    def __init__(self, name: str, rect: pygame.Rect, visible: bool = True):
+        self.name = name
+        self.rect = pygame.Rect(rect)
+        self.visible = visible
+        self.state = NORMAL
+        self._surface: Optional[pygame.Surface] = None
+
+    def invalidate(self):
+        self._surface = None
+
+    def set_state(self, state: str):
+        if state != self.state:
+            self.state = state
+            self.invalidate()
+
+    @property
+    def enabled(self) -> bool:
+        return self.state != DISABLED
+
+    def set_enabled(self, enabled: bool):
+        if enabled != self.enabled:
+            self.set_state(NORMAL if enabled else DISABLED)
+
+    @property
+    def surface(self) -> pygame.Surface:
+        if self._surface is None:
+            self._surface = allocated(self.render())
+        return self._surface
+
+    @abstractmethod
+    def render(self) -> pygame.Surface:
+        """Superfície do widget no estado atual (chamada só quando algo mudou)"""
+
+
+class Label(Widget):
+    """Texto fixo (re-renderizado só quando o texto ou a cor mudam)"""
+
+    def __init__(self, name: str, rect: pygame.Rect, text: str, font: pygame.font.Font, color,
+                 align: str = "center"):
+        super().__init__(name, rect)
+        self.text = text
+        self.font = font
+        self.color = color
+        self.align = align
+
+    def set_text(self, text: str, color=None):
+        if text != self.text or (color is not None and color != self.color):
+            self.text = text
+            self.color = color or self.color
+            self.invalidate()
+
+    def render(self) -> pygame.Surface:
+        return self.font.render(self.text, True, self.color).convert_alpha()
+
+    @property
+    def position(self) -> Tuple[int, int]:
+        """Canto superior esquerdo do texto (no topo do retângulo, alinhado na horizontal)"""
+        if self.align == "left":
+            return self.rect.topleft
+        return self.rect.centerx - self.surface.get_width() // 2, self.rect.y
+
+
+class Button(Widget):
+    """Botão com fundo, borda e texto pré-renderizados por estado
+
+    style "solid": fundo colorido com cantos arredondados e borda (menu);
+    style "overlay": retângulo translúcido (botões de tiro sobre o duelo).
+    """
+
+    def __init__(self, name: str, rect: pygame.Rect, label: str, font: pygame.font.Font, color,
+                 action: Callable[..., None] = None, style: str = "solid", text_color=(255, 255, 255),
+                 radius: int = 10):
+        super().__init__(name, rect)
+        self.label = label
+        self.font = font
+        self.color = color
+        self.text_color = text_color
+        self.action = action
+        self.style = style
+        self.radius = radius
+        self.pressed_until = 0
+
+    def render(self) -> pygame.Surface:
+        surf = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        local = surf.get_rect()
+        color, text_color = self.color, self.text_color
+        if self.state == PRESSED:
+            color = tuple(c * 3 // 5 for c in color[:3]) + tuple(color[3:])
+        elif self.state == DISABLED:
+            gray = sum(color[:3]) // 3
+            color = (gray, gray, gray) + tuple(color[3:])
+            text_color = (150, 150, 150)
+
+        if self.style == "overlay":
+            surf.fill(color)
+        else:
+            pygame.draw.rect(surf, color, local, 0, self.radius)
+            pygame.draw.rect(surf, (255, 255, 255) if self.state != DISABLED else text_color,
+                             local, 2, self.radius)  # Borda
+        text = self.font.render(self.label, True, text_color)
+        surf.blit(text, (local.centerx - text.get_width() // 2, local.centery - text.get_height() // 2))
+        return surf.convert_alpha()
+
+    def press(self, now: float, *args) -> bool:
+        """Toque no botão: efeito visual de apertado e a ação (recebe args do toque)"""
+        if not self.enabled:
+            return False
+        self.set_state(PRESSED)
+        self.pressed_until = now + PRESS_MS
+        if self.action is not None:
+            self.action(*args)
+        return True
+
+
+class SpatialGrid:
+    """Índice espacial em grade uniforme: cada célula lista os widgets que a tocam"""
+
+    def __init__(self, cell: int = GRID_CELL):
+        self.cell = cell
+        self.cells: Dict[Tuple[int, int], List[Widget]] = {}
+
+    def rebuild(self, widgets: List[Widget]):
+        self.cells = {}
+        c = self.cell
+        for widget in widgets:
+            r = widget.rect
+            for cx in range(r.left // c, (r.right - 1) // c + 1):
+                for cy in range(r.top // c, (r.bottom - 1) // c + 1):
+                    self.cells.setdefault((cx, cy), []).append(widget)
+
+    def query(self, pos) -> List[Widget]:
+        return self.cells.get((int(pos[0]) // self.cell, int(pos[1]) // self.cell), [])
+
+
+class UILayer:
+    """Conjunto de widgets de uma tela: uma fonte só de layout para desenho e toque"""
+
+    def __init__(self):
+        self.widgets: Dict[str, Widget] = {}
+        self.grid = SpatialGrid()
+        self._pressed: List[Button] = []
+
+    def add(self, widget: Widget) -> Widget:
+        self.widgets[widget.name] = widget
+        self.grid.rebuild(list(self.widgets.values()))
+        return widget
+
+    def __getitem__(self, name: str) -> Widget:
+        return self.widgets[name]
+
+    def hit(self, pos) -> Optional[Widget]:
+        """Widget visível sob o ponto (o último adicionado fica por cima)"""
+        for widget in reversed(self.grid.query(pos)):
+            if widget.visible and widget.rect.collidepoint(pos):
+                return widget
+        return None
+
+    def press(self, pos, now: float, *args) -> Optional[Button]:
+        """Toque: aciona o botão sob o ponto, se houver e estiver habilitado"""
+        widget = self.hit(pos)
+        if isinstance(widget, Button) and widget.press(now, *args):
+            self._pressed.append(widget)
+            return widget
+        return None
+
+    def update(self, now: float):
+        """Solta os botões apertados depois de PRESS_MS"""
+        if self._pressed:
+            for button in [b for b in self._pressed if now >= b.pressed_until]:
+                if button.state == PRESSED:
+                    button.set_state(NORMAL)
+                self._pressed.remove(button)
+
+    def draw(self, renderer):
+        for widget in self.widgets.values():
+            if widget.visible:
+                renderer.blit(widget.surface, widget.position if isinstance(widget, Label) else widget.rect.topleft)
+
+    def memory(self) -> int:
+        """Bytes das superfícies prontas dos widgets"""
+        return sum(w._surface.get_pitch() * w._surface.get_height()
+                   for w in self.widgets.values() if w._surface is not None)